@@ -1,15 +1,86 @@
-import text2emotion as te
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+# text2emotion and nltk are imported on first use (see __getattr__ below):
+# importing text2emotion probes, and may download, NLTK data
 import re
 from turkish_emotion_analyzer import TurkishEmotionAnalyzer, print_turkish_analysis
+from english_emotion_engine import EnglishEmotionEngine, word_tokenize_fast
+import language_detector
+import metrics
 import functools
+import hashlib
+import logging
+import os
+import threading
 import time
+from collections import OrderedDict
+
+# Bump whenever scoring output changes; part of every result cache key
+ANALYZER_VERSION = "1.2.0"
+
+# 'fast' uses the in-project EnglishEmotionEngine, 'text2emotion' calls
+# text2emotion.get_emotion for every text
+ENGLISH_ENGINE = os.environ.get('TEXT2EMOTION_ENGLISH_ENGINE', 'fast')
+
+# 'nltk' is word_tokenize with its punkt/Treebank state loaded once,
+# 'regex' is a lighter tokenizer that matches it on clean_text output
+TOKENIZER = os.environ.get('TEXT2EMOTION_TOKENIZER', 'nltk')
+
+# Snapshot built with `python warm_state.py build`; when set, the fast
+# engine and stopwords are loaded from it without touching NLTK
+WARM_STATE_PATH = os.environ.get('TEXT2EMOTION_WARM_STATE')
+
+# Compiled lexicon files (python lexicon_store.py ...) that every process
+# maps read-only instead of building its own copy
+TURKISH_LEXICON_PATH = os.environ.get('TEXT2EMOTION_TURKISH_LEXICON')
+ENGLISH_LEXICON_PATH = os.environ.get('TEXT2EMOTION_ENGLISH_LEXICON')
+
+# Seconds between checks of those files for a new version; 0 disables reloading
+LEXICON_RELOAD_INTERVAL = float(os.environ.get('TEXT2EMOTION_LEXICON_RELOAD_INTERVAL', '5'))
+
+# Texts with the same normalized form (what the analyzer actually scores)
+# are scored once per batch; '0' turns this off
+DEDUP = os.environ.get('TEXT2EMOTION_DEDUP', '1') != '0'
+
+# Results kept for normalized forms seen in earlier batches; 0 disables
+DEDUP_MEMO_SIZE = int(os.environ.get('TEXT2EMOTION_DEDUP_MEMO_SIZE', '10000'))
+
+# '0' turns missing NLTK data into a LookupError instead of a download
+NLTK_DOWNLOAD = os.environ.get('TEXT2EMOTION_NLTK_DOWNLOAD', '1') != '0'
+
+logger = logging.getLogger("Text2Emotion")
 
 # Global cache for NLTK data
 _nltk_data_downloaded = False
 _turkish_analyzer = None
+_english_stop_words = None
+_english_engine = None
+_english_tokenizer = None
+_warm_state = None
+
+# 'tr'/'en' -> (signature, version) of the lexicon file in use
+_lexicon_files = {}
+_lexicon_reload_lock = threading.Lock()
+_next_lexicon_check = 0.0
+
+# Cross-batch results by normalized-text hash, and the scorer they came from
+_dedup_memo = None
+_dedup_scorers = {}
+
+# Compiled once, shared by every call
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_REGEX_TOKEN_RE = re.compile(r'\w+|[^\w\s]')
+
+def __getattr__(name):
+    """Import the heavy dependencies this module used to expose on first access"""
+    if name == 'te':
+        import text2emotion as module
+    elif name == 'nltk':
+        import nltk as module
+    elif name == 'stopwords':
+        from nltk.corpus import stopwords as module
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = module
+    return module
 
 def download_nltk_data():
     """Download required NLTK data with caching"""
@@ -17,71 +88,364 @@ def download_nltk_data():
     if _nltk_data_downloaded:
         return
     
-    try:
-        nltk.data.find('tokenizers/punkt')
-    except LookupError:
-        nltk.download('punkt')
-    try:
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        nltk.download('stopwords')
-    try:
-        nltk.data.find('corpora/wordnet')
-    except LookupError:
-        nltk.download('wordnet')
+    import nltk
+    for resource, package in (('tokenizers/punkt', 'punkt'),
+                              ('corpora/stopwords', 'stopwords'),
+                              ('corpora/wordnet', 'wordnet')):
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            if not NLTK_DOWNLOAD:
+                raise LookupError(f"NLTK resource {resource!r} is missing and "
+                                  f"TEXT2EMOTION_NLTK_DOWNLOAD=0")
+            nltk.download(package)
     
     _nltk_data_downloaded = True
 
+def get_warm_state():
+    """Snapshot from TEXT2EMOTION_WARM_STATE, or None when it is not set"""
+    global _warm_state
+    if _warm_state is None and WARM_STATE_PATH:
+        import warm_state
+        _warm_state = warm_state.load(WARM_STATE_PATH)
+    return _warm_state
+
+def get_english_stopwords():
+    """English stopword set, loaded from the warm state or NLTK corpus once"""
+    global _english_stop_words
+    if _english_stop_words is None:
+        state = get_warm_state()
+        if state is not None:
+            _english_stop_words = frozenset(state['english_stopwords'])
+        else:
+            download_nltk_data()
+            from nltk.corpus import stopwords
+            _english_stop_words = frozenset(stopwords.words('english'))
+    return _english_stop_words
+
+def regex_tokenize(text):
+    """Lightweight tokenizer, identical to word_tokenize for clean_text output"""
+    if _PUNCTUATION_RE.search(text):
+        # Raw text: split words from punctuation, without Treebank's quote rules
+        return _REGEX_TOKEN_RE.findall(text)
+    return word_tokenize_fast(text)
+
+def get_english_tokenizer():
+    """English word tokenizer selected by TEXT2EMOTION_TOKENIZER, built once"""
+    global _english_tokenizer
+    if _english_tokenizer is None:
+        if TOKENIZER == 'regex':
+            _english_tokenizer = regex_tokenize
+        else:
+            # Same steps as nltk.word_tokenize, without resolving punkt per call
+            import nltk
+            from nltk.tokenize import NLTKWordTokenizer
+            
+            download_nltk_data()
+            sentence_tokenizer = nltk.data.load('tokenizers/punkt/english.pickle')
+            word_tokenizer = NLTKWordTokenizer()
+            
+            def tokenize(text):
+                return [token for sentence in sentence_tokenizer.tokenize(text)
+                        for token in word_tokenizer.tokenize(sentence)]
+            _english_tokenizer = tokenize
+    return _english_tokenizer
+
+def get_english_engine():
+    """Lazy loading for the fast English engine"""
+    global _english_engine
+    if _english_engine is None:
+        options = {'english_stopwords': get_english_stopwords()}
+        if ENGLISH_LEXICON_PATH:
+            from lexicon_store import MappedLexicon
+            options['lexicon'] = MappedLexicon(ENGLISH_LEXICON_PATH)
+            _record_lexicon('en', options['lexicon'])
+        state = get_warm_state()
+        if state is not None:
+            import warm_state
+            _english_engine = warm_state.create_engine(state, **options)
+        else:
+            _english_engine = EnglishEmotionEngine.from_nltk(**options)
+    return _english_engine
+
 def get_turkish_analyzer():
     """Lazy loading for Turkish analyzer"""
     global _turkish_analyzer
     if _turkish_analyzer is None:
-        _turkish_analyzer = TurkishEmotionAnalyzer()
+        _turkish_analyzer = TurkishEmotionAnalyzer(lexicon_path=TURKISH_LEXICON_PATH)
+        if _turkish_analyzer.lexicon_store is not None:
+            _record_lexicon('tr', _turkish_analyzer.lexicon_store)
     return _turkish_analyzer
 
+def _record_lexicon(language, lexicon):
+    """Remember which file version the analyzer for language was built from"""
+    _lexicon_files[language] = (lexicon.signature, lexicon.version)
+
+def _lexicon_paths():
+    return [(language, path) for language, path in (('tr', TURKISH_LEXICON_PATH), ('en', ENGLISH_LEXICON_PATH))
+            if path]
+
+def reload_lexicons(force=False):
+    """Swap in lexicon files that changed on disk; returns True if any did
+    
+    The new analyzer (or English engine, rebuilt with with_lexicon) is
+    built completely before the module global is replaced, and a global
+    assignment is atomic, so scoring never takes a lock: a batch that
+    already fetched the old analyzer finishes on it, later calls get the
+    new one. A missing or invalid file keeps the current lexicon.
+    """
+    global _turkish_analyzer, _english_engine
+    from lexicon_store import MappedLexicon, file_signature
+    
+    changed = False
+    for language, path in _lexicon_paths():
+        recorded = _lexicon_files.get(language)
+        try:
+            if not force and recorded is not None and recorded[0] == file_signature(os.stat(path)):
+                continue
+            if language == 'tr' and _turkish_analyzer is not None:
+                analyzer = TurkishEmotionAnalyzer(lexicon_path=path)
+                lexicon = analyzer.lexicon_store
+            else:
+                lexicon = MappedLexicon(path)
+                if language == 'en' and _english_engine is not None:
+                    engine = _english_engine.with_lexicon(lexicon)
+                else:
+                    # Not loaded yet: only the version changes, the file is read on first use
+                    lexicon.close()
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Lexicon {path} could not be loaded, keeping the current one: {e}")
+            continue
+        
+        previous = recorded[1] if recorded else None
+        if language == 'tr' and _turkish_analyzer is not None:
+            _turkish_analyzer = analyzer
+        elif language == 'en' and _english_engine is not None:
+            _english_engine = engine
+        _record_lexicon(language, lexicon)
+        changed = True
+        logger.info(f"Lexicon {language} reloaded: {previous} -> {lexicon.version}")
+    return changed
+
+def check_lexicons():
+    """reload_lexicons at most once per LEXICON_RELOAD_INTERVAL seconds
+    
+    Costs a clock read between checks and is skipped while another
+    thread is reloading.
+    """
+    global _next_lexicon_check
+    if LEXICON_RELOAD_INTERVAL <= 0 or time.monotonic() < _next_lexicon_check:
+        return False
+    if not _lexicon_reload_lock.acquire(blocking=False):
+        return False
+    try:
+        _next_lexicon_check = time.monotonic() + LEXICON_RELOAD_INTERVAL
+        return reload_lexicons()
+    finally:
+        _lexicon_reload_lock.release()
+
+def lexicon_version():
+    """Versions of the lexicons in use, e.g. 'tr:builtin,en:2024-w48'"""
+    check_lexicons()
+    parts = []
+    for language, path in (('tr', TURKISH_LEXICON_PATH), ('en', ENGLISH_LEXICON_PATH)):
+        if not path:
+            parts.append(f"{language}:builtin")
+            continue
+        if language not in _lexicon_files:
+            # Not loaded yet: the version it will be loaded with
+            from lexicon_store import MappedLexicon
+            with MappedLexicon(path) as lexicon:
+                _record_lexicon(language, lexicon)
+        parts.append(f"{language}:{_lexicon_files[language][1]}")
+    return ','.join(parts)
+
+def result_version():
+    """Version tag for cached results: analyzer and lexicon versions"""
+    return f"{ANALYZER_VERSION}/{lexicon_version()}"
+
+def normalized_hash(normalized):
+    """Dedup key of a normalized text"""
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+
+class _DedupMemo:
+    """Least recently used results by (language, normalized_hash), at most size entries
+    
+    Results are stored without 'original_text' and copied on the way out.
+    """
+    
+    def __init__(self, size):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_many(self, keys):
+        """{key: result} for the keys that are present"""
+        found = {}
+        with self._lock:
+            for key in keys:
+                analysis = self._entries.get(key)
+                if analysis is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = analysis
+        return found
+    
+    def set_many(self, items):
+        with self._lock:
+            for key, analysis in items:
+                self._entries[key] = analysis
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+def _get_dedup_memo(language, scorer):
+    """The cross-batch memo, emptied when the scorer for language is replaced
+    
+    A lexicon reload builds a new analyzer or engine, so results of the
+    old one are never reused.
+    """
+    global _dedup_memo
+    if DEDUP_MEMO_SIZE <= 0:
+        return None
+    if _dedup_memo is None:
+        _dedup_memo = _DedupMemo(DEDUP_MEMO_SIZE)
+    if _dedup_scorers.get(language) is not scorer:
+        _dedup_memo.clear()
+        _dedup_scorers[language] = scorer
+    return _dedup_memo
+
+class _Deduplicator:
+    """Shares results between texts of one language group with the same normalized form
+    
+    normalize maps the first stage's value to the text the later stages
+    actually score, so texts are keyed by its hash. Duplicates of a text
+    earlier in the group, and forms found in the cross-batch memo, skip
+    the later stages and get a copy of the result.
+    """
+    
+    def __init__(self, language, normalize, scorer):
+        self.language = language
+        self.normalize = normalize
+        self.memo = _get_dedup_memo(language, scorer)
+        self.keys = {}
+        self.same = {}
+        self.memoized = {}
+    
+    def group(self, texts, values, failed):
+        """Positions that need no scoring"""
+        first = {}
+        for k, text in enumerate(texts):
+            # Blank texts get fixed zero scores and are not worth a key
+            if k in failed or not text.strip():
+                continue
+            key = (self.language, normalized_hash(self.normalize(values[k])))
+            if key in first:
+                self.same[k] = first[key]
+            else:
+                first[key] = k
+        found = self.memo.get_many(first) if self.memo is not None else {}
+        for key, k in first.items():
+            if key in found:
+                self.memoized[k] = found[key]
+            else:
+                self.keys[k] = key
+        return self.same.keys() | self.memoized.keys()
+    
+    def fan_out(self, texts, values, failed):
+        """Fill in the skipped positions and memoize the newly scored forms"""
+        if self.memo is not None:
+            stored = []
+            for k, key in self.keys.items():
+                if k not in failed:
+                    analysis = dict(values[k], emotions=dict(values[k]['emotions']))
+                    del analysis['original_text']
+                    stored.append((key, analysis))
+            self.memo.set_many(stored)
+        for k, analysis in self.memoized.items():
+            values[k] = dict(analysis, emotions=dict(analysis['emotions']), original_text=texts[k])
+        for k, representative in self.same.items():
+            if representative in failed:
+                failed[k] = failed[representative]
+            else:
+                analysis = values[representative]
+                values[k] = dict(analysis, emotions=dict(analysis['emotions']), original_text=texts[k])
+        if self.same or self.memoized:
+            metrics.DEDUPLICATED.inc(self.language, 'batch', amount=len(self.same))
+            metrics.DEDUPLICATED.inc(self.language, 'memo', amount=len(self.memoized))
+
+def warmup():
+    """Load the analyzers, stopwords and tokenizer before the first request
+    
+    Raises LookupError when the English NLTK data is missing; the Turkish
+    analyzer is loaded first, so it is ready either way.
+    """
+    get_turkish_analyzer()
+    get_english_stopwords()
+    if ENGLISH_ENGINE == 'fast':
+        # The first score also loads WordNet (unless it comes from the warm state)
+        get_english_engine().score("warm up")
+    else:
+        get_english_tokenizer()
+
 @functools.lru_cache(maxsize=1000)
 def clean_text(text):
     """Clean and preprocess text with caching"""
     # Convert to lowercase
     text = text.lower()
     # Remove special characters but keep spaces
-    text = re.sub(r'[^\w\s]', '', text)
+    text = _PUNCTUATION_RE.sub('', text)
     return text
 
 @functools.lru_cache(maxsize=1000)
 def remove_stopwords(text):
     """Remove stopwords from text with caching"""
-    download_nltk_data()
-    stop_words = set(stopwords.words('english'))
-    tokens = word_tokenize(text)
+    stop_words = get_english_stopwords()
+    tokens = get_english_tokenizer()(text)
     tokens = [word for word in tokens if word not in stop_words]
     return ' '.join(tokens)
 
 def detect_emotion(text):
-    """Detect emotions in the given text with performance monitoring"""
-    start_time = time.time()
-    
-    # Download required NLTK data
-    download_nltk_data()
-    
-    # Clean the text
-    cleaned_text = clean_text(text)
-    
-    # Remove stopwords
-    processed_text = remove_stopwords(cleaned_text)
-    
-    # Get emotion predictions
-    emotions = te.get_emotion(processed_text)
+    """Detect emotions in the given text, recording stage timings in metrics"""
+    timer = metrics.StageTimer('en')
     
-    processing_time = time.time() - start_time
-    print(f"⏱️ İşlem süresi: {processing_time:.3f} saniye")
+    if ENGLISH_ENGINE == 'fast':
+        emotions = get_english_engine().score(text)
+        timer.lap('scoring')
+    else:
+        import text2emotion as te
+        
+        # Download required NLTK data
+        download_nltk_data()
+        timer.start()
+        
+        # Clean the text
+        cleaned_text = clean_text(text)
+        timer.lap('cleaning')
+        
+        # Remove stopwords
+        processed_text = remove_stopwords(cleaned_text)
+        timer.lap('stopwords')
+        
+        # Get emotion predictions
+        emotions = te.get_emotion(processed_text)
+        timer.lap('scoring')
     
+    timer.flush()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"detect_emotion: {sum(timer.totals.values()):.6f}s")
     return emotions
 
 def analyze_emotion_with_details(text):
     """Analyze emotion with detailed information"""
     emotions = detect_emotion(text)
-    
+    return _emotion_details(emotions, text)
+
+def _emotion_details(emotions, text):
+    """Build the detailed result dict for English emotion scores"""
     # Find the dominant emotion
     dominant_emotion = max(emotions, key=emotions.get)
     dominant_score = emotions[dominant_emotion]
@@ -93,6 +457,16 @@ def analyze_emotion_with_details(text):
         'original_text': text
     }
 
+def _english_details(engine, text, deadline=None):
+    """_emotion_details for the fast engine, scored until deadline when one is given"""
+    if deadline is None:
+        return _emotion_details(engine.score(text), text)
+    emotions, coverage = engine.score_until(text, deadline)
+    details = _emotion_details(emotions, text)
+    details['partial'] = coverage < 1.0
+    details['token_coverage'] = coverage
+    return details
+
 def print_emotion_analysis(analysis):
     """Print emotion analysis results in a formatted way"""
     print("\n" + "="*50)
@@ -112,16 +486,200 @@ def print_emotion_analysis(analysis):
     print("="*50)
 
 def detect_language(text):
-    """Basit dil tespiti - Türkçe karakterler varsa Türkçe kabul et"""
-    turkish_chars = set('çğıöşü')
-    text_lower = text.lower()
-    turkish_char_count = sum(1 for char in text_lower if char in turkish_chars)
+    """Dil tespiti - metin Türkçe ise True (karakter n-gram modeli, bkz. language_detector)"""
+    return language_detector.is_turkish(text)
+
+def analyze_batch(texts, language=None, return_exceptions=False, vectorized=False, deadline=None):
+    """Analyze many texts at once, returning results in input order.
+    
+    Each text is routed by detect_language, or by ``language`` which may be
+    'tr', 'en', 'auto'/None, or a sequence with one such value per text.
+    Texts are grouped per analyzer so NLTK data, stopwords and the Turkish
+    analyzer are set up once for the whole batch rather than per text.
+    
+    Every result is the analyzer's detailed dict plus 'detected_language'
+    and 'language_confidence' (the detector's posterior for auto-detected
+    texts, None when the language was given).
+    With return_exceptions=True a failing text yields its exception in
+    place of a result instead of aborting the whole batch.
+    
+    vectorized=True scores each language group with NumPy array operations
+    (see vectorized_scoring); results are identical, but an error then
+    fails the whole group rather than one text.
+    
+    Unless DEDUP is off, texts of a language group whose normalized form
+    (Turkish tokens, English clean_text) hashes the same are scored once
+    and the result is copied to the others; a bounded memo also serves
+    forms scored in earlier batches. Counts go to
+    text2emotion_deduplicated_texts_total. The vectorized path, which
+    already looks up every distinct token once, and texts with a
+    deadline are not deduplicated.
+    
+    ``deadline`` is a time.monotonic() instant, or a sequence with one per
+    text (None for no limit). Texts with a deadline are scored in chunks
+    and, when it passes, over the prefix processed so far; their results
+    add 'partial' and 'token_coverage' (see time_budget). Deadlines turn
+    off vectorized scoring and are ignored by the text2emotion engine.
+    """
+    texts = list(texts)
+    check_lexicons()
+    if language is None or isinstance(language, str):
+        languages = [language] * len(texts)
+    else:
+        languages = list(language)
+        if len(languages) != len(texts):
+            raise ValueError("language sequence must match the number of texts")
+    if deadline is None or isinstance(deadline, (int, float)):
+        deadlines = [deadline] * len(texts)
+    else:
+        deadlines = list(deadline)
+        if len(deadlines) != len(texts):
+            raise ValueError("deadline sequence must match the number of texts")
+    timed = any(d is not None for d in deadlines)
+    
+    # Route texts to analyzers; auto texts are detected in one batch
+    detected = list(languages)
+    confidences = [None] * len(texts)
+    auto = [i for i, lang in enumerate(languages) if lang is None or lang == 'auto']
+    if auto:
+        timer = metrics.StageTimer('auto')
+        detections = language_detector.detect_batch([texts[i] for i in auto])
+        for i, detection in zip(auto, detections):
+            detected[i], confidences[i] = detection
+        timer.lap('language_detection')
+        timer.flush()
+    turkish_indices = []
+    english_indices = []
+    for i, lang in enumerate(detected):
+        if lang == 'tr':
+            turkish_indices.append(i)
+        else:
+            english_indices.append(i)
+    
+    results = [None] * len(texts)
+    
+    # Each stage runs over the whole language group, so the clock is read
+    # once per stage rather than per text; one observation per call.
+    # The first stage receives the text's deadline as its value; with a
+    # _Deduplicator, only one text per normalized form goes past it.
+    def run(indices, language, stages, dedup=None):
+        timer = metrics.StageTimer(language)
+        group = [texts[i] for i in indices]
+        values = [deadlines[i] for i in indices]
+        failed = {}
+        skipped = {}
+        for n, (stage, step) in enumerate(stages):
+            for k, text in enumerate(group):
+                if k in failed or k in skipped:
+                    continue
+                try:
+                    values[k] = step(text, values[k])
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    failed[k] = e
+            timer.lap(stage)
+            if n == 0 and dedup is not None:
+                skipped = dedup.group(group, values, failed)
+                timer.lap('deduplication')
+        timer.flush()
+        if dedup is not None:
+            dedup.fan_out(group, values, failed)
+        metrics.TEXTS.inc(language, amount=len(indices))
+        if failed:
+            metrics.ANALYSIS_ERRORS.inc(language, amount=len(failed))
+        partial = 0
+        for k, (i, analysis) in enumerate(zip(indices, values)):
+            if k in failed:
+                results[i] = failed[k]
+                continue
+            partial += bool(analysis.get('partial'))
+            analysis['detected_language'] = detected[i]
+            analysis['language_confidence'] = confidences[i]
+            results[i] = analysis
+        if partial:
+            metrics.PARTIAL_RESULTS.inc(language, amount=partial)
     
-    # Türkçe kelimeler
-    turkish_words = ['ben', 'sen', 'o', 'biz', 'siz', 'onlar', 'bu', 'şu', 'bir', 'iki', 'üç']
-    turkish_word_count = sum(1 for word in text_lower.split() if word in turkish_words)
+    if vectorized and not timed:
+        import vectorized_scoring
+        
+        def run(indices, language, analyze_all):
+            timer = metrics.StageTimer(language)
+            try:
+                analyses = analyze_all([texts[i] for i in indices])
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                analyses = [e] * len(indices)
+                metrics.ANALYSIS_ERRORS.inc(language, amount=len(indices))
+            timer.lap('scoring')
+            timer.flush()
+            metrics.TEXTS.inc(language, amount=len(indices))
+            for i, analysis in zip(indices, analyses):
+                if not isinstance(analysis, Exception):
+                    analysis['detected_language'] = detected[i]
+                    analysis['language_confidence'] = confidences[i]
+                results[i] = analysis
+        
+        if turkish_indices:
+            analyzer = get_turkish_analyzer()
+            run(turkish_indices, 'tr', lambda group: vectorized_scoring.score_turkish(analyzer, group))
+        if english_indices:
+            run(english_indices, 'en', lambda group: vectorized_scoring.score_english(get_english_engine(), group))
+        return results
+    
+    if turkish_indices:
+        analyzer = get_turkish_analyzer()
+        if timed:
+            # Tokenized chunk by chunk, so cleaning and scoring are one stage
+            run(turkish_indices, 'tr', [
+                ('scoring', lambda text, deadline: analyzer.analyze_with_details(text, deadline=deadline)),
+            ])
+        else:
+            # Normalization and stopword removal are one pass (tokenize)
+            run(turkish_indices, 'tr', [
+                ('cleaning', lambda text, _: analyzer.tokenize(text)),
+                ('scoring', analyzer.analyze_with_details),
+            ], _Deduplicator('tr', ' '.join, analyzer) if DEDUP else None)
     
-    return turkish_char_count > 0 or turkish_word_count > 0
+    if english_indices:
+        try:
+            # One-time setup shared by every English text in the batch
+            dedup = None
+            if ENGLISH_ENGINE == 'fast':
+                engine = get_english_engine()
+                if DEDUP and not timed:
+                    # Scoring the clean form gives the same scores and keys duplicates
+                    stages = [
+                        ('cleaning', lambda text, _: engine.clean(text)),
+                        ('scoring', lambda text, cleaned: _emotion_details(engine.score(cleaned), text)),
+                    ]
+                    dedup = _Deduplicator('en', str, engine)
+                else:
+                    # The engine cleans, filters and scores in one pass
+                    stages = [('scoring', lambda text, deadline: _english_details(engine, text, deadline))]
+            else:
+                import text2emotion as te
+                
+                get_english_stopwords()
+                get_english_tokenizer()
+                stages = [
+                    ('cleaning', lambda text, _: clean_text(text)),
+                    ('stopwords', lambda text, cleaned: remove_stopwords(cleaned)),
+                    ('scoring', lambda text, processed: _emotion_details(te.get_emotion(processed), text)),
+                ]
+                if DEDUP:
+                    dedup = _Deduplicator('en', lambda cleaned: ' '.join(cleaned.split()), te)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            for i in english_indices:
+                results[i] = e
+            metrics.ANALYSIS_ERRORS.inc('en', amount=len(english_indices))
+        else:
+            run(english_indices, 'en', stages, dedup)
+    
+    return results
 
 def interactive_mode():
     """Run the program in interactive mode with performance improvements"""
@@ -129,9 +687,6 @@ def interactive_mode():
     print("Türkçe ve İngilizce destekli!")
     print("Çıkmak için 'quit' yazın\n")
     
-    # Lazy load Turkish analyzer
-    turkish_analyzer = get_turkish_analyzer()
-    
     while True:
         text = input("Analiz edilecek metni girin: ")
         
@@ -145,14 +700,15 @@ def interactive_mode():
         
         try:
             # Dil tespiti yap
-            is_turkish = detect_language(text)
+            language, confidence = language_detector.detect(text)
             
-            if is_turkish:
-                print("🌍 Türkçe metin tespit edildi - Türkçe analizör kullanılıyor...")
-                analysis = turkish_analyzer.analyze_with_details(text)
+            if language == 'tr':
+                print(f"🌍 Türkçe metin tespit edildi (%{confidence * 100:.0f}) - Türkçe analizör kullanılıyor...")
+                # Fetched per text: a lexicon reload swaps the analyzer
+                analysis = get_turkish_analyzer().analyze_with_details(text)
                 print_turkish_analysis(analysis)
             else:
-                print("🌍 İngilizce metin tespit edildi - İngilizce analizör kullanılıyor...")
+                print(f"🌍 İngilizce metin tespit edildi (%{confidence * 100:.0f}) - İngilizce analizör kullanılıyor...")
                 analysis = analyze_emotion_with_details(text)
                 print_emotion_analysis(analysis)
                 
@@ -161,6 +717,14 @@ def interactive_mode():
 
 # Example usage
 if __name__ == "__main__":
+    import sys
+    
+    # With arguments, score files non-interactively:
+    # python Text2Emotion.py messages.jsonl -o results.jsonl
+    if len(sys.argv) > 1:
+        from stream_scoring import main
+        sys.exit(main())
+    
     # Interactive mode
     interactive_mode()
     
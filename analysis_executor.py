@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Analiz işlerini olay döngüsü dışında çalıştıran yürütücü
+
+Kısa metinler bir thread havuzunda, uzun metinler ise bir process
+havuzunda çalıştırılır. Bekleyen iş sayısı sınırlıdır; sınır aşıldığında
+ExecutorSaturated fırlatılır ve API 503 döndürür.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+
+import metrics
+
+
+class ExecutorSaturated(Exception):
+    """Bekleyen iş kuyruğu dolu"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Analiz kuyruğu dolu")
+        self.retry_after = retry_after
+
+
+def analyze_texts(texts: Sequence[str], languages: Sequence[Optional[str]],
+                  deadlines: Optional[Sequence[Optional[float]]] = None) -> List[Any]:
+    """Havuz işçilerinin çalıştırdığı toplu analiz (modül seviyesinde, pickle edilebilir)
+
+    deadlines metin başına time.monotonic() anlarıdır (bkz. time_budget).
+    Her sonuca skorlandığı sürecin result_version() değeri 'result_version'
+    olarak eklenir: işçi sözlük dosyasını kendi aralığıyla kontrol ettiği
+    için API sürecinin sürümü ondan farklı olabilir. Sürüm analizörden önce
+    okunur; yeniden yükleme analizörü sürümden önce değiştirdiğinden sonuç
+    hiçbir zaman etiketinden eski bir sözlükle skorlanmış olmaz.
+    """
+    from Text2Emotion import analyze_batch, result_version
+    version = result_version()
+    results = analyze_batch(texts, language=list(languages), return_exceptions=True,
+                            deadline=list(deadlines) if deadlines is not None else None)
+    for result in results:
+        if not isinstance(result, Exception):
+            result['result_version'] = version
+    return results
+
+
+def with_metrics(fn: Callable, *args) -> Any:
+    """Process işçisinde fn'i çalıştır, bu süreçte biriken metrikleri sonuçla döndür"""
+    return fn(*args), metrics.drain()
+
+
+def process_context():
+    """Process havuzu için güvenli başlatma yöntemi"""
+    # fork, thread havuzu çalışırken kilit kopyalama riski taşır
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["Text2Emotion"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+class AnalysisExecutor:
+    """Metin uzunluğuna göre thread veya process havuzu seçen yürütücü"""
+
+    def __init__(self, thread_workers: int = 4, process_workers: int = 2,
+                 long_text_chars: int = 2000, max_pending: int = 64,
+                 retry_after: int = 1):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.long_text_chars = long_text_chars
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self.pending = 0
+
+        self._threads = ThreadPoolExecutor(max_workers=thread_workers,
+                                           thread_name_prefix="text2emotion")
+        self._processes: Optional[ProcessPoolExecutor] = None
+        # run_many thread havuzundan da çağrılır
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "AnalysisExecutor":
+        """Ayarları ortam değişkenlerinden oku"""
+        return cls(
+            thread_workers=int(os.environ.get("TEXT2EMOTION_THREAD_WORKERS", "4")),
+            process_workers=int(os.environ.get("TEXT2EMOTION_PROCESS_WORKERS", "2")),
+            long_text_chars=int(os.environ.get("TEXT2EMOTION_LONG_TEXT_CHARS", "2000")),
+            max_pending=int(os.environ.get("TEXT2EMOTION_MAX_PENDING", "64")),
+            retry_after=int(os.environ.get("TEXT2EMOTION_RETRY_AFTER", "1")),
+        )
+
+    def _pool_for(self, size: int):
+        """İşteki en uzun metnin boyuna (size) uygun havuzu seç
+
+        Process havuzu ilk ihtiyaçta kurulur.
+        """
+        if self.process_workers <= 0 or size < self.long_text_chars:
+            return self._threads
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=self.process_workers,
+                                                      mp_context=process_context())
+        return self._processes
+
+    async def run(self, fn: Callable, *args, size: int = 0):
+        """fn(*args) fonksiyonunu havuzda çalıştır ve sonucunu bekle
+
+        size işteki en uzun metnin boyudur; metin boylarının toplamı
+        verilirse çok sayıda kısa metin gereksiz yere process havuzuna gider.
+        """
+        if self.pending >= self.max_pending:
+            metrics.REJECTED.inc()
+            raise ExecutorSaturated(self.retry_after)
+
+        pool = self._pool_for(size)
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            if pool is self._threads:
+                return await loop.run_in_executor(pool, fn, *args)
+            # İşçinin aşama süreleri ana sürecin /metrics çıktısına eklenir
+            result, exported = await loop.run_in_executor(pool, with_metrics, fn, *args)
+            metrics.merge(exported)
+            return result
+        finally:
+            self.pending -= 1
+
+    def run_many(self, fn: Callable, jobs: Sequence[tuple]) -> List[Any]:
+        """Her iş için fn(*args) sonucunu, işleri process havuzunda paralel çalıştırarak döndür
+
+        Engelleyicidir: run() ile thread havuzunda çalışan ve işini
+        parçalara bölen fonksiyonlar içindir (bkz. long_document). Parçalar
+        onları başlatan işin parçası sayılır, pending'e eklenmez. Process
+        havuzu kapalıysa işler çağıran thread'de sırayla çalışır.
+        """
+        if self.process_workers <= 0:
+            return [fn(*args) for args in jobs]
+        pool = self._pool_for(self.long_text_chars)
+        futures = [pool.submit(with_metrics, fn, *args) for args in jobs]
+        results = []
+        for future in futures:
+            result, exported = future.result()
+            metrics.merge(exported)
+            results.append(result)
+        return results
+
+    def shutdown(self, wait: bool = True):
+        """Havuzları kapat"""
+        self._threads.shutdown(wait=wait)
+        if self._processes is not None:
+            self._processes.shutdown(wait=wait)
+            self._processes = None
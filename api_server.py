@@ -3,32 +3,166 @@
 Text2Emotion Web API Server
 """
 
-from fastapi import FastAPI, HTTPException
+from collections import deque
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response
 from pydantic import BaseModel
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+import asyncio
+import functools
+import json
+import os
+import time
 import uvicorn
-from Text2Emotion import detect_language, analyze_emotion_with_details
-from turkish_emotion_analyzer import TurkishEmotionAnalyzer
+from Text2Emotion import lexicon_version, result_version, warmup
+from analysis_executor import AnalysisExecutor, ExecutorSaturated, analyze_texts
+from logger import log_request, logger
+import long_document
+import metrics
+from micro_batcher import MicroBatcher
+from result_cache import ResultCache
+from time_budget import deadline_after
+
+# CPU yoğun analizler olay döngüsü dışında çalışır
+executor = AnalysisExecutor.from_env()
+
+# Sonuç önbelleği (TEXT2EMOTION_CACHE=none ile kapatılır)
+cache = ResultCache.from_env()
+
+# Okuma anında hesaplanan göstergeler (önbellek test/benchmark'ta değiştirilebilir)
+metrics.EXECUTOR_PENDING.set_function(lambda: executor.pending)
+metrics.CACHE_HIT_RATIO.set_function(lambda: cache.hit_rate if cache else None)
+
+# Önbellekte saklanan, yanıt için gereken analiz alanları
+CACHED_FIELDS = ("detected_language", "language_confidence", "emotions", "dominant_emotion", "dominant_score")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Stopwords, tokenizer ve modeller ilk istekten önce yüklenir
+    try:
+        warmup()
+    except LookupError as e:
+        logger.warning(f"İngilizce kaynaklar yüklenemedi: {e}")
+    yield
+    executor.shutdown(wait=False)
 
 app = FastAPI(
     title="Text2Emotion API",
     description="Türkçe ve İngilizce duygu analizi API'si",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Initialize Turkish analyzer
-turkish_analyzer = TurkishEmotionAnalyzer()
+# Toplu analiz sınırları
+MAX_BATCH_ITEMS = int(os.environ.get("TEXT2EMOTION_MAX_BATCH_ITEMS", "1000"))
+MAX_BATCH_BYTES = int(os.environ.get("TEXT2EMOTION_MAX_BATCH_BYTES", str(1024 * 1024)))
+# Ham istek gövdesi sınırı, gövde okunup doğrulanmadan önce uygulanır.
+# Varsayılan, sınır içindeki hiçbir isteği reddetmez: JSON kaçışı bir
+# baytı en fazla 6 bayta çıkarır, öğe başına alan adları için pay bırakılır
+MAX_BATCH_BODY_BYTES = int(os.environ.get(
+    "TEXT2EMOTION_MAX_BATCH_BODY_BYTES", str(6 * MAX_BATCH_BYTES + 256 * MAX_BATCH_ITEMS)))
+
+# /ws/stream: bağlantı başına okunmuş ama işlenmemiş mesaj sınırı ve
+# varsayılan hareketli pencere (mesaj sayısı)
+STREAM_QUEUE_SIZE = int(os.environ.get("TEXT2EMOTION_STREAM_QUEUE_SIZE", "64"))
+STREAM_WINDOW = int(os.environ.get("TEXT2EMOTION_STREAM_WINDOW", "50"))
+stream_connections = 0
+metrics.STREAM_CONNECTIONS.set_function(lambda: stream_connections)
+
+# İstek başına varsayılan analiz süresi (ms); 0 sınırsız. Süre dolunca
+# işlenen kısım üzerinden kısmi sonuç döner (bkz. time_budget)
+DEADLINE_MS = float(os.environ.get("TEXT2EMOTION_DEADLINE_MS", "0"))
+
+def instrumented(endpoint: str):
+    """Uç nokta için istek sayısı (durum koduna göre), süre metrikleri ve örneklenmiş istek logu"""
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            status = 500
+            try:
+                response = await handler(*args, **kwargs)
+                status = 200
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            finally:
+                duration = time.perf_counter() - start_time
+                metrics.REQUESTS.inc(endpoint, str(status))
+                metrics.REQUEST_SECONDS.observe(duration, endpoint)
+                # Örneklenmiş istek logu: kayıt kuyruğa yazılır, disk G/Ç arka planda
+                log_request("%s %s %.1fms", endpoint, status, duration * 1000,
+                            endpoint=endpoint, status=status, duration_ms=duration * 1000)
+        return wrapper
+    return decorator
+
+class BodyLimitMiddleware:
+    """/analyze/batch gövdesini pydantic okumadan önce sınırla
+
+    Content-Length sınırı aşıyorsa gövde hiç okunmaz; başlık yoksa
+    (chunked) okunan bayt sayısı sınırı geçtiği anda okuma kesilir.
+    Her iki durumda da yanıt 413'tür.
+    """
+
+    def __init__(self, app, paths=("/analyze/batch",)):
+        self.app = app
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+        limit = MAX_BATCH_BODY_BYTES
+        path = scope["path"]
+        content_length = dict(scope["headers"]).get(b"content-length")
+        received = 0
+
+        def too_large():
+            metrics.REQUESTS.inc(path, "413")
+            return HTTPException(status_code=413, detail=f"İstek gövdesi {limit} baytı aşamaz")
+
+        async def limited_receive():
+            nonlocal received
+            if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+                raise too_large()
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+app.add_middleware(BodyLimitMiddleware)
 
 class TextRequest(BaseModel):
     text: str
     language: Optional[str] = None  # 'tr', 'en', or 'auto'
+    deadline_ms: Optional[float] = None  # None: sunucu varsayılanı, 0: sınırsız
 
 class EmotionResponse(BaseModel):
     text: str
     detected_language: str
+    language_confidence: Optional[float] = None  # yalnızca otomatik tespitte
     emotions: Dict[str, float]
     dominant_emotion: str
     dominant_score: float
+    partial: bool = False  # süre doldu, skorlar metnin işlenen kısmına ait
+    token_coverage: float = 1.0  # işlenen kısmın oranı
+    processing_time: float
+
+class BatchTextRequest(BaseModel):
+    items: List[TextRequest]
+
+class BatchItemResponse(BaseModel):
+    index: int
+    result: Optional[EmotionResponse] = None
+    error: Optional[str] = None
+
+class BatchEmotionResponse(BaseModel):
+    results: List[BatchItemResponse]
     processing_time: float
 
 @app.get("/")
@@ -40,59 +174,412 @@ async def root():
         "supported_languages": ["tr", "en", "auto"],
         "endpoints": {
             "/analyze": "POST - Duygu analizi yap",
-            "/health": "GET - API durumu kontrol et"
+            "/analyze/batch": "POST - Toplu duygu analizi yap",
+            "/ws/stream": "WebSocket - Canlı mesaj akışı skorlama",
+            "/health": "GET - API durumu kontrol et",
+            "/metrics": "GET - Prometheus metrikleri",
+            "/cache/stats": "GET - Önbellek istatistikleri"
         }
     }
 
 @app.get("/health")
 async def health_check():
     """API sağlık kontrolü"""
-    return {"status": "healthy", "service": "Text2Emotion API"}
+    return {"status": "healthy", "service": "Text2Emotion API", "lexicon_version": lexicon_version()}
+
+async def execute_analysis(texts: List[str], languages: List[Optional[str]],
+                           deadlines: Optional[List[Optional[float]]] = None) -> List:
+    """Metinleri yürütücüde analiz et (dil tespiti dahil)
+    
+    Havuz metin başına seçilir: uzun metinler process havuzunda, kısalar
+    thread havuzunda ayrı birer işte çalışır. Birleştirilmiş kısa istek
+    grupları böylece process havuzunun serileştirme maliyetini ödemez.
+    """
+    long_texts = [i for i, text in enumerate(texts) if len(text) >= executor.long_text_chars]
+    if not long_texts or len(long_texts) == len(texts):
+        size = max(map(len, texts), default=0)
+        return await executor.run(analyze_texts, texts, languages, deadlines, size=size)
+    
+    long_set = set(long_texts)
+    groups = [[i for i in range(len(texts)) if i not in long_set], long_texts]
+    outcomes = await asyncio.gather(*(
+        executor.run(analyze_texts, [texts[i] for i in group], [languages[i] for i in group],
+                     [deadlines[i] for i in group] if deadlines else None,
+                     size=max(len(texts[i]) for i in group))
+        for group in groups))
+    results = [None] * len(texts)
+    for group, outcome in zip(groups, outcomes):
+        for i, result in zip(group, outcome):
+            results[i] = result
+    return results
+
+# Eşzamanlı tekil istekler birleştirilerek toplu analiz edilir
+# (varsayılan 2 ms, TEXT2EMOTION_COALESCE_WINDOW_MS=0 ile kapalı)
+batcher = MicroBatcher.from_env(execute_analysis)
+
+def server_busy(e: ExecutorSaturated) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Sunucu meşgul, lütfen daha sonra tekrar deneyin",
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+async def run_analysis(texts: List[str], languages: List[Optional[str]],
+                       deadlines: Optional[List[Optional[float]]] = None) -> List:
+    """Metinleri analiz et, kuyruk doluysa 503 döndür
+    
+    Tek metinlik çağrılar birleştirici açıksa diğer isteklerle aynı gruba girer.
+    """
+    try:
+        if batcher is not None and len(texts) == 1:
+            return [await batcher.submit(texts[0], languages[0], deadlines[0] if deadlines else None)]
+        return await execute_analysis(texts, languages, deadlines)
+    except ExecutorSaturated as e:
+        raise server_busy(e)
+
+def is_long_document(text: str, deadline: Optional[float]) -> bool:
+    """Parçalanıp paralel skorlanacak metin mi (süre sınırlı metinler parçalanmaz)"""
+    return (deadline is None and executor.process_workers > 0
+            and len(text) >= long_document.LONG_DOCUMENT_CHARS)
+
+async def analyze_document(text: str, language: Optional[str]):
+    """Uzun metni long_document.analyze_document ile analiz et
+    
+    Plan ve birleştirme yürütücünün thread havuzunda, parça grupları
+    process havuzunda paralel çalışır. Sonuç tek parça analizle aynıdır;
+    hata, toplu analizdeki gibi sonuç yerine döner.
+    """
+    try:
+        return await executor.run(functools.partial(
+            long_document.analyze_document, text, language,
+            workers=executor.process_workers, run=executor.run_many))
+    except ExecutorSaturated as e:
+        raise server_busy(e)
+    except Exception as e:
+        return e
+
+def request_deadline(request: TextRequest) -> Optional[float]:
+    """İsteğin süre sınırı (time.monotonic() anı), istek başlarken hesaplanır"""
+    deadline_ms = DEADLINE_MS if request.deadline_ms is None else request.deadline_ms
+    return deadline_after(deadline_ms / 1000)
+
+async def cache_call(fn, *args):
+    """Önbellek çağrısı; bloklayan arka uçta (SQLite) olay döngüsünü tutmaz"""
+    if cache.backend.blocking:
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args))
+    return fn(*args)
+
+async def analyze_cached(texts: List[str], languages: List[Optional[str]],
+                         deadlines: Optional[List[Optional[float]]] = None) -> List:
+    """Önbellekte olmayan metinleri analiz et, sonuçları sırayla döndür
+    
+    Sonuçlar skorlandıkları sürümle ('result_version') önbelleğe yazılır:
+    process işçisi sözlük değişikliğini bu süreçten geç görebilir.
+    Kısmi (süresi dolmuş) ve sürümü belirsiz sonuçlar önbelleğe yazılmaz.
+    """
+    results = [None] * len(texts)
+    missing = []
+    # Analizör ve sözlük sürümü; sözlük yeniden yüklenince eski girdiler kullanılmaz
+    version = result_version()
+    found = await cache_call(cache.get_many, texts, languages, version) if cache else results
+    if cache:
+        hits = sum(cached is not None for cached in found)
+        metrics.CACHE_HITS.inc(amount=hits)
+        metrics.CACHE_MISSES.inc(amount=len(found) - hits)
+    for i, cached in enumerate(found):
+        if cached is None:
+            missing.append(i)
+        else:
+            results[i] = cached
+    
+    if missing:
+        # Uzun belgeler ayrı ayrı parçalanıp paralel skorlanır, kalanlar tek işte
+        documents = [i for i in missing if is_long_document(texts[i], deadlines[i] if deadlines else None)]
+        document_set = set(documents)
+        rest = [i for i in missing if i not in document_set]
+        jobs = [analyze_document(texts[i], languages[i]) for i in documents]
+        if rest:
+            jobs.append(run_analysis([texts[i] for i in rest], [languages[i] for i in rest],
+                                     [deadlines[i] for i in rest] if deadlines else None))
+        outcomes = await asyncio.gather(*jobs)
+        analyses = dict(zip(documents, outcomes))
+        if rest:
+            analyses.update(zip(rest, outcomes[-1]))
+        stored = []
+        for i in missing:
+            analysis = analyses[i]
+            if not isinstance(analysis, Exception):
+                partial = analysis.get('partial', False)
+                coverage = analysis.get('token_coverage', 1.0)
+                scored_version = analysis.get('result_version')
+                analysis = {field: analysis[field] for field in CACHED_FIELDS}
+                if partial:
+                    analysis.update(partial=True, token_coverage=coverage)
+                elif cache and scored_version is not None:
+                    stored.append((languages[i], texts[i], scored_version, analysis))
+            results[i] = analysis
+        if stored:
+            await cache_call(cache.set_many, stored)
+    
+    return results
 
 @app.post("/analyze", response_model=EmotionResponse)
+@instrumented("/analyze")
 async def analyze_emotion(request: TextRequest):
     """Metin duygu analizi"""
-    import time
-    
-    start_time = time.time()
+    start_time = time.perf_counter()
+    deadline = request_deadline(request)
     
     if not request.text.strip():
         raise HTTPException(status_code=400, detail="Metin boş olamaz")
     
-    # Dil tespiti
-    if request.language == "auto" or request.language is None:
-        is_turkish = detect_language(request.text)
-        detected_lang = "tr" if is_turkish else "en"
-    else:
-        detected_lang = request.language
-        is_turkish = detected_lang == "tr"
+    # Dil tespiti ve analiz yürütücüde yapılır
+    analysis = (await analyze_cached([request.text], [request.language], [deadline]))[0]
     
     try:
-        if is_turkish:
-            analysis = turkish_analyzer.analyze_with_details(request.text)
-            emotions = analysis['emotions']
-            dominant_emotion = analysis['dominant_emotion']
-            dominant_score = analysis['dominant_score']
-        else:
-            analysis = analyze_emotion_with_details(request.text)
-            emotions = analysis['emotions']
-            dominant_emotion = analysis['dominant_emotion']
-            dominant_score = analysis['dominant_score']
+        if isinstance(analysis, Exception):
+            raise analysis
         
-        processing_time = time.time() - start_time
+        serialize_start = time.perf_counter()
+        processing_time = serialize_start - start_time
         
-        return EmotionResponse(
+        response = EmotionResponse(
             text=request.text,
-            detected_language=detected_lang,
-            emotions=emotions,
-            dominant_emotion=dominant_emotion,
-            dominant_score=dominant_score,
+            detected_language=analysis['detected_language'],
+            language_confidence=analysis['language_confidence'],
+            emotions=analysis['emotions'],
+            dominant_emotion=analysis['dominant_emotion'],
+            dominant_score=analysis['dominant_score'],
+            partial=analysis.get('partial', False),
+            token_coverage=analysis.get('token_coverage', 1.0),
             processing_time=processing_time
         )
+        metrics.BATCH_STAGE_SECONDS.observe(time.perf_counter() - serialize_start,
+                                            'serialization', analysis['detected_language'])
+        return response
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analiz hatası: {str(e)}")
 
+@app.post("/analyze/batch", response_model=BatchEmotionResponse)
+@instrumented("/analyze/batch")
+async def analyze_emotion_batch(request: BatchTextRequest):
+    """Toplu metin duygu analizi - her öğe için ayrı dil tespiti ve hata"""
+    start_time = time.perf_counter()
+    deadlines = [request_deadline(item) for item in request.items]
+    
+    if len(request.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"En fazla {MAX_BATCH_ITEMS} öğe gönderilebilir"
+        )
+    total_bytes = sum(len(item.text.encode("utf-8")) for item in request.items)
+    if total_bytes > MAX_BATCH_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Toplam metin boyutu {MAX_BATCH_BYTES} baytı aşamaz"
+        )
+    
+    results = [BatchItemResponse(index=i) for i in range(len(request.items))]
+    
+    # Boş metinler analizöre gönderilmez
+    valid = []
+    for i, item in enumerate(request.items):
+        if item.text.strip():
+            valid.append(i)
+        else:
+            results[i].error = "Metin boş olamaz"
+    
+    texts = [request.items[i].text for i in valid]
+    languages = [request.items[i].language for i in valid]
+    analyses = await analyze_cached(texts, languages, [deadlines[i] for i in valid]) if texts else []
+    
+    serialize_start = time.perf_counter()
+    processing_time = serialize_start - start_time
+    # Öğe başına süre, toplu işlem süresinin payıdır
+    item_time = processing_time / len(valid) if valid else 0.0
+    
+    for i, text, analysis in zip(valid, texts, analyses):
+        if isinstance(analysis, Exception):
+            results[i].error = f"Analiz hatası: {str(analysis)}"
+            continue
+        results[i].result = EmotionResponse(
+            text=text,
+            detected_language=analysis['detected_language'],
+            language_confidence=analysis['language_confidence'],
+            emotions=analysis['emotions'],
+            dominant_emotion=analysis['dominant_emotion'],
+            dominant_score=analysis['dominant_score'],
+            partial=analysis.get('partial', False),
+            token_coverage=analysis.get('token_coverage', 1.0),
+            processing_time=item_time
+        )
+    
+    response = BatchEmotionResponse(results=results, processing_time=processing_time)
+    metrics.BATCH_STAGE_SECONDS.observe(time.perf_counter() - serialize_start, 'serialization', 'batch')
+    return response
+
+class RollingAggregate:
+    """Son window mesajın ortalama duygu skorları ve baskın duygu dağılımı
+
+    Toplamlar her mesajda güncellenir; pencereden çıkan mesaj düşülür.
+    """
+    
+    def __init__(self, window: int):
+        self.window = max(window, 1)
+        self.messages = 0
+        self._recent = deque()
+        self._sums: Dict[str, float] = {}
+        self._dominant: Dict[str, int] = {}
+    
+    def add(self, analysis: Dict) -> None:
+        self.messages += 1
+        self._recent.append(analysis)
+        self._update(analysis, 1)
+        if len(self._recent) > self.window:
+            self._update(self._recent.popleft(), -1)
+    
+    def _update(self, analysis: Dict, sign: int) -> None:
+        for emotion, score in analysis['emotions'].items():
+            self._sums[emotion] = self._sums.get(emotion, 0.0) + sign * score
+        dominant = analysis['dominant_emotion']
+        self._dominant[dominant] = self._dominant.get(dominant, 0) + sign
+    
+    def snapshot(self) -> Dict:
+        count = len(self._recent)
+        emotions = {emotion: round(total / count, 6) if count else 0.0
+                    for emotion, total in self._sums.items()}
+        return {
+            'messages': self.messages,
+            'window': count,
+            'emotions': emotions,
+            'dominant_emotion': max(emotions, key=emotions.get) if emotions else None,
+            'dominant_counts': {emotion: n for emotion, n in self._dominant.items() if n},
+        }
+
+def parse_stream_message(message: str, language: Optional[str]) -> Dict:
+    """Akış mesajı: {"text": ..., "language": ..., "id": ...} JSON nesnesi ya da düz metin"""
+    if not message.lstrip().startswith("{"):
+        return {"text": message, "language": language, "id": None}
+    try:
+        data = json.loads(message)
+    except ValueError:
+        raise ValueError("Geçersiz JSON")
+    if not isinstance(data.get("text"), str):
+        raise ValueError("'text' alanı gerekli")
+    return {"text": data["text"], "language": data.get("language") or language, "id": data.get("id")}
+
+async def analyze_stream_batch(texts: List[str], languages: List[Optional[str]]) -> List:
+    """analyze_cached; yürütücü doluysa hata yerine Retry-After kadar bekleyip tekrar dener"""
+    while True:
+        try:
+            return await analyze_cached(texts, languages)
+        except HTTPException as e:
+            if e.status_code != 503:
+                raise
+            await asyncio.sleep(float(e.headers["Retry-After"]))
+
+@app.websocket("/ws/stream")
+async def stream_emotions(websocket: WebSocket, language: Optional[str] = None, window: int = STREAM_WINDOW):
+    """Tek bağlantı üzerinden mesaj akışı skorlama
+    
+    Her mesaj için sırayla {"index", "id", "result" | "error", "aggregate"}
+    gönderilir. Okunan mesajlar sınırlı bir kuyruğa alınır; kuyruk dolunca
+    sokettan okuma durur ve istemci TCP üzerinden yavaşlatılır (geri basınç).
+    Kuyrukta biriken mesajlar tek bir analiz çağrısında işlenir. İkili
+    çerçeveler hata yanıtı alır. İstemci ayrıldığında bekleyen mesajlar
+    analiz edilmez ve yanıt gönderilmez.
+    """
+    global stream_connections
+    await websocket.accept()
+    stream_connections += 1
+    pending: asyncio.Queue = asyncio.Queue(STREAM_QUEUE_SIZE)
+    aggregate = RollingAggregate(window)
+    disconnected = False
+    
+    async def receive():
+        nonlocal disconnected
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                # İkili çerçeve bytes olarak kuyruğa girer, sırası gelince hata yanıtı alır
+                text = message.get("text")
+                await pending.put(text if text is not None else message["bytes"])
+        except Exception as e:
+            logger.error(f"/ws/stream okuma hatası: {e!r}")
+        # İptal edildiğinde (bağlantı kapanırken) okuyan kalmaz, işaret konmaz
+        disconnected = True
+        await pending.put(None)
+    
+    receiver = asyncio.create_task(receive())
+    index = 0
+    try:
+        while True:
+            batch = [await pending.get()]
+            while len(batch) < MAX_BATCH_ITEMS and not pending.empty():
+                batch.append(pending.get_nowait())
+            if batch[-1] is None:
+                # Ayrılan istemciye yanıt gönderilemez
+                break
+            
+            replies = []
+            texts, languages, slots = [], [], []
+            for message in batch:
+                reply = {"index": index, "id": None}
+                index += 1
+                try:
+                    if isinstance(message, bytes):
+                        raise ValueError("İkili mesajlar desteklenmez, metin ya da JSON gönderin")
+                    item = parse_stream_message(message, language)
+                    reply["id"] = item["id"]
+                    if not item["text"].strip():
+                        raise ValueError("Metin boş olamaz")
+                    texts.append(item["text"])
+                    languages.append(item["language"])
+                    slots.append(reply)
+                except ValueError as e:
+                    reply["error"] = str(e)
+                    metrics.REQUESTS.inc("/ws/stream", "400")
+                replies.append(reply)
+            
+            analyses = await analyze_stream_batch(texts, languages) if texts else []
+            for reply, analysis in zip(slots, analyses):
+                if isinstance(analysis, Exception):
+                    reply["error"] = f"Analiz hatası: {str(analysis)}"
+                    metrics.REQUESTS.inc("/ws/stream", "500")
+                else:
+                    reply["result"] = analysis
+                    metrics.REQUESTS.inc("/ws/stream", "200")
+            
+            if disconnected:
+                break
+            try:
+                for reply in replies:
+                    if "result" in reply:
+                        aggregate.add(reply["result"])
+                    reply["aggregate"] = aggregate.snapshot()
+                    await websocket.send_json(reply)
+            except (WebSocketDisconnect, RuntimeError):
+                # İstemci analiz sürerken ayrıldı (uvicorn kapalı sokete gönderimde RuntimeError verir)
+                break
+    finally:
+        receiver.cancel()
+        stream_connections -= 1
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metin biçiminde metrikler"""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Önbellek isabet/ıska sayaçları ve boyutu"""
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
 @app.get("/languages")
 async def get_supported_languages():
     """Desteklenen diller"""
@@ -105,4 +592,21 @@ async def get_supported_languages():
     }
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Text2Emotion API sunucusu")
+    parser.add_argument("--host", default=os.environ.get("TEXT2EMOTION_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("TEXT2EMOTION_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("TEXT2EMOTION_WORKERS", "1")),
+                        help="İşçi süreç sayısı (1'den büyükse pre-fork modu)")
+    args = parser.parse_args()
+    
+    if args.workers > 1:
+        from prefork import serve
+        # İşçiler zaten ayrı süreçler. Her işçinin kendi process havuzu,
+        # ana sürecin paylaşılan (gc.freeze) sayfalarını kullanmayan ve
+        # sözlüğü baştan yükleyen workers x process_workers ek süreç olurdu
+        executor.process_workers = 0
+        serve(app, host=args.host, port=args.port, workers=args.workers)
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Tekrarlanabilir performans ölçümleri (benchmark)
+
+Sabit tohumlu sentetik Türkçe/İngilizce derlemler (kısa, orta, uzun
+metinler) üzerinde metin hazırlama, analiz, dil tespiti ve toplu analiz
+yolları ölçülür; API, FastAPI uygulamasına süreç içinde doğrudan ASGI
+çağrılarıyla (ağ ve httpx olmadan) istek gönderilerek ölçülür. Sonuçlar
+JSON olarak yazılır ve bir temel (baseline) dosyasıyla karşılaştırılır;
+eşikten yavaş bir ölçüm varsa çıkış kodu 1 olur.
+
+    python benchmark.py -o sonuclar.json
+    python benchmark.py --quick --only detect_language
+    python benchmark.py --baseline yerel.json --update-baseline
+    python benchmark.py --baseline yerel.json
+
+Depodaki benchmarks/baseline.json tek bir referans makinede (bkz.
+'meta') ölçülmüştür ve yalnızca kaba bir karşılaştırma sağlar; süreler
+makineye bağlı olduğundan regresyon denetimi için temel, ölçümün
+yapılacağı makinede --update-baseline ile üretilmelidir. Temel farklı
+bir makinede ölçülmüşse karşılaştırma bir uyarı yazar.
+
+NLTK verisi gerektiren ölçümler veri yoksa atlanır ve 'skipped' altında
+nedeniyle raporlanır.
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import io
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Bump whenever the result layout changes
+FORMAT_VERSION = 1
+
+# Metin boyu (kelime) ve derlem başına metin sayısı
+SIZES = {
+    "short": (8, 2000),
+    "medium": (40, 500),
+    "long": (400, 50),
+}
+
+# Varsayılan yavaşlama eşiği: %20
+DEFAULT_THRESHOLD = 0.20
+
+_TURKISH_FILLER = (
+    "ve bir bu çok da ama için ile gibi daha ben sen o biz onlar şey gün zaman "
+    "bugün yarın dün ev iş okul yol arkadaş anne baba çocuk kitap film yemek "
+    "geldi gitti oldu yaptı dedi biliyorum istiyorum gidiyorum var yok değil "
+    "güzel büyük küçük yeni eski sonra önce şimdi hep hiç artık bile sadece"
+).split()
+
+_ENGLISH_FILLER = (
+    "the a and to of in is it that was for on are with as i you he she they we "
+    "be at this have from or one had by word but not what all were when your can "
+    "day time today tomorrow home work school road friend mother father child book "
+    "movie food went came got made said know want going there no very really just"
+).split()
+
+_ENGLISH_EMOTION_WORDS = (
+    "happy joy love glad delight wonderful great pleasure cheerful smile "
+    "angry furious annoyed hate rage mad irritated outraged hostile bitter "
+    "surprised amazed astonished shocked unexpected stunned wow startled "
+    "sad unhappy cry grief sorrow lonely depressed miserable tears heartbroken "
+    "afraid scared fear terrified nervous worried anxious panic frightened dread"
+).split()
+
+
+def synthetic_corpus(language: str, size: str, count: Optional[int] = None, seed: int = 16) -> List[str]:
+    """Sabit tohumlu sentetik derlem
+
+    Kelimeler Zipf benzeri ağırlıklarla dolgu kelimelerinden, her beş
+    kelimeden biri duygu sözlüğünden seçilir; 'mixed' yarı Türkçe yarı
+    İngilizce metinlerdir.
+    """
+    words, default_count = SIZES[size]
+    count = default_count if count is None else count
+    rng = random.Random(f"{seed}-{language}-{size}")
+
+    if language == "mixed":
+        return [synthetic_corpus("tr" if i % 2 == 0 else "en", size, 1, seed + i)[0] for i in range(count)]
+    if language == "tr":
+        from Text2Emotion import get_turkish_analyzer
+
+        filler = _TURKISH_FILLER
+        emotion_words = sorted({word for group in get_turkish_analyzer().emotion_words.values() for word in group})
+    elif language == "en":
+        filler, emotion_words = _ENGLISH_FILLER, _ENGLISH_EMOTION_WORDS
+    else:
+        raise ValueError(f"Bilinmeyen dil: {language}")
+
+    weights = [1.0 / rank for rank in range(1, len(filler) + 1)]
+    texts = []
+    for _ in range(count):
+        tokens = [rng.choice(emotion_words) if rng.random() < 0.2 else rng.choices(filler, weights)[0]
+                  for _ in range(words)]
+        tokens[0] = tokens[0].capitalize()
+        texts.append(" ".join(tokens) + rng.choice([".", "!", "?", "..."]))
+    return texts
+
+
+class Benchmark(NamedTuple):
+    """Tek bir ölçüm: setup() derlemi hazırlar ve ölçülecek çağrıyı döndürür"""
+    name: str
+    setup: Callable[[], Tuple[Callable[[], Any], int]]  # (çağrı, çağrı başına öğe)
+    unit: str = "text"
+
+
+def measure(func: Callable[[], Any], repeat: int = 5, min_time: float = 0.05) -> Dict[str, float]:
+    """func'ı bir kez ısıtıp repeat tur ölçer; kısa çağrılar min_time dolana kadar tekrarlanır"""
+    func()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "max_s": max(timings),
+        "rounds": repeat,
+        "calls_per_round": number,
+    }
+
+
+def _over(corpus: Sequence[str], func: Callable[[str], Any]) -> Tuple[Callable[[], Any], int]:
+    return (lambda: [func(text) for text in corpus]), len(corpus)
+
+
+async def asgi_request(app, method: str, path: str, payload: Any = None) -> Tuple[int, bytes]:
+    """ASGI uygulamasına ağ olmadan tek bir HTTP isteği gönder"""
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"benchmark"), (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = 0
+    chunks = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+def _api_requests(path: str, payloads: Sequence[Any], concurrency: int) -> Callable[[], None]:
+    """payloads'ı en fazla concurrency eşzamanlı istekle gönderen çağrı
+
+    Önbellek yalnızca çağrı süresince kapatılır, sonra eski haline döner.
+    """
+    import api_server
+
+    async def send_all():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(payload):
+            async with semaphore:
+                status, body = await asgi_request(api_server.app, "POST", path, payload)
+            if status != 200:
+                raise RuntimeError(f"{path} {status}: {body[:200]!r}")
+
+        await asyncio.gather(*(one(payload) for payload in payloads))
+
+    def run_uncached():
+        cache = api_server.cache
+        api_server.cache = None
+        try:
+            asyncio.run(send_all())
+        finally:
+            api_server.cache = cache
+
+    return run_uncached
+
+
+def default_benchmarks(quick: bool = False, api_concurrency: int = 8) -> List[Benchmark]:
+    """Depodaki ölçümlerin tamamı"""
+    import Text2Emotion
+    import language_detector
+
+    def corpus(language, size):
+        count = SIZES[size][1]
+        return synthetic_corpus(language, size, max(count // 10, 1) if quick else count)
+
+    benchmarks = []
+    for size in SIZES:
+        benchmarks += [
+            Benchmark(f"clean_text/en/{size}",
+                      lambda size=size: _over(corpus("en", size), Text2Emotion.clean_text.__wrapped__)),
+            Benchmark(f"clean_text/tr/{size}",
+                      lambda size=size: _over(corpus("tr", size), Text2Emotion.get_turkish_analyzer().clean_text)),
+            Benchmark(f"remove_stopwords/en/{size}",
+                      lambda size=size: _over([Text2Emotion.clean_text(text) for text in corpus("en", size)],
+                                              Text2Emotion.remove_stopwords.__wrapped__)),
+            Benchmark(f"analyze_emotion/tr/{size}",
+                      lambda size=size: _over(corpus("tr", size), Text2Emotion.get_turkish_analyzer().analyze_emotion)),
+            Benchmark(f"analyze_emotion/en/{size}",
+                      lambda size=size: _over(corpus("en", size), Text2Emotion.detect_emotion)),
+            Benchmark(f"detect_language/mixed/{size}",
+                      lambda size=size: _over(corpus("mixed", size), Text2Emotion.detect_language)),
+        ]
+
+    english_error = []
+
+    def english_ready():
+        # Karışık derlemler İngilizce kaynakları gerektirir; yoksa LookupError ile atlanır
+        if english_error:
+            raise english_error[0]
+        try:
+            Text2Emotion.warmup()
+        except LookupError as e:
+            english_error.append(e)
+            raise
+
+    def batch(language, vectorized):
+        if language != "tr":
+            english_ready()
+        texts = corpus(language, "medium")
+        return (lambda: Text2Emotion.analyze_batch(texts, vectorized=vectorized)), len(texts)
+
+    def detect_batch():
+        texts = corpus("mixed", "medium")
+        return (lambda: language_detector.detect_batch(texts)), len(texts)
+
+    def api_single(language):
+        if language != "tr":
+            english_ready()
+        texts = corpus(language, "short")
+        return _api_requests("/analyze", [{"text": text} for text in texts], api_concurrency), len(texts)
+
+    def api_batch(language):
+        if language != "tr":
+            english_ready()
+        texts = corpus(language, "short")
+        payloads = [{"items": [{"text": text} for text in texts[i:i + 100]]} for i in range(0, len(texts), 100)]
+        return _api_requests("/analyze/batch", payloads, api_concurrency), len(texts)
+
+    benchmarks.append(Benchmark("detect_batch/mixed/medium", detect_batch))
+    for language in ("tr", "mixed"):
+        benchmarks += [
+            Benchmark(f"analyze_batch/{language}/medium", lambda language=language: batch(language, False)),
+            Benchmark(f"analyze_batch_vectorized/{language}/medium", lambda language=language: batch(language, True)),
+            Benchmark(f"api/analyze/{language}/short", lambda language=language: api_single(language), "request"),
+            Benchmark(f"api/analyze_batch/{language}/short", lambda language=language: api_batch(language)),
+        ]
+    return benchmarks
+
+
+def _reason(error: BaseException) -> str:
+    """Tek satırlık, renk kodsuz hata özeti"""
+    message = re.sub(r"\x1b\[[0-9;]*m|\*+", " ", str(error))
+    return f"{type(error).__name__}: {' '.join(message.split())[:200]}"
+
+
+def run(benchmarks: Sequence[Benchmark], repeat: int = 5, min_time: float = 0.05,
+        log: Optional[io.TextIOBase] = None) -> Dict[str, Any]:
+    """Ölçümleri çalıştır, JSON'a yazılabilir sonuç sözlüğü döndür"""
+    from Text2Emotion import ANALYZER_VERSION, ENGLISH_ENGINE
+
+    results = {}
+    skipped = {}
+    for benchmark in benchmarks:
+        try:
+            func, items = benchmark.setup()
+            timing = measure(func, repeat, min_time)
+        except LookupError as e:
+            # NLTK verisi eksik
+            skipped[benchmark.name] = _reason(e)
+            if log:
+                print(f"{benchmark.name:<42} atlandı ({skipped[benchmark.name][:60]})", file=log)
+            continue
+        timing["items"] = items
+        timing["unit"] = benchmark.unit
+        timing["items_per_s"] = items / timing["median_s"] if timing["median_s"] else 0.0
+        results[benchmark.name] = timing
+        if log:
+            print(f"{benchmark.name:<42} {timing['median_s'] * 1e3:10.3f} ms  "
+                  f"{timing['items_per_s']:12.1f} {benchmark.unit}/s", file=log)
+
+    return {
+        "format": FORMAT_VERSION,
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "analyzer_version": ANALYZER_VERSION,
+            "english_engine": ENGLISH_ENGINE,
+            "repeat": repeat,
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """Her ortak ölçüm için medyan süre oranı; oran 1 + threshold'u aşarsa regresyon"""
+    rows = []
+    for name, result in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None or not reference.get("median_s"):
+            continue
+        ratio = result["median_s"] / reference["median_s"]
+        rows.append({
+            "name": name,
+            "baseline_s": reference["median_s"],
+            "current_s": result["median_s"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return rows
+
+
+def machine_mismatch(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Temelin farklı bir ortamda ölçüldüğünü gösteren meta alanları"""
+    fields = ("platform", "cpu_count", "python")
+    return [field for field in fields
+            if baseline.get("meta", {}).get(field) != current["meta"].get(field)]
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != FORMAT_VERSION:
+        raise ValueError(f"{path} format {FORMAT_VERSION} benchmark sonucu değil")
+    return data
+
+
+def save(path: str, data: Dict[str, Any]) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(temporary, path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Text2Emotion performans ölçümleri")
+    parser.add_argument("-o", "--output", help="Sonuç JSON dosyası (verilmezse stdout)")
+    parser.add_argument("--only", action="append", default=[],
+                        help="Yalnızca adı bu kalıba uyan ölçümler (ör. 'analyze_emotion/*'), tekrarlanabilir")
+    parser.add_argument("--quick", action="store_true", help="Derlemleri 10'da birine küçült")
+    parser.add_argument("--repeat", type=int, default=5, help="Ölçüm turu sayısı")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Tur başına en az süre (saniye)")
+    parser.add_argument("--api-concurrency", type=int, default=8, help="API ölçümlerinde eşzamanlı istek")
+    parser.add_argument("--baseline", help="Karşılaştırılacak temel sonuç dosyası")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Regresyon eşiği (0.2 = medyan süre %%20'den fazla artarsa)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Karşılaştırmadan sonra sonuçları --baseline dosyasına yaz")
+    args = parser.parse_args(argv)
+    if args.update_baseline and not args.baseline:
+        parser.error("--update-baseline için --baseline gerekli")
+
+    benchmarks = default_benchmarks(args.quick, args.api_concurrency)
+    if args.only:
+        benchmarks = [b for b in benchmarks if any(fnmatch.fnmatch(b.name, pattern) for pattern in args.only)]
+
+    data = run(benchmarks, args.repeat, args.min_time, log=sys.stderr)
+    if args.output:
+        save(args.output, data)
+    else:
+        json.dump(data, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write("\n")
+
+    status = 0
+    if args.baseline and os.path.exists(args.baseline):
+        try:
+            baseline = load(args.baseline)
+        except ValueError as e:
+            print(f"Hata: {e}", file=sys.stderr)
+            return 1
+        rows = compare(data, baseline, args.threshold)
+        mismatch = machine_mismatch(data, baseline)
+        if mismatch:
+            print(f"Uyarı: temel farklı bir ortamda ölçülmüş ({', '.join(mismatch)}); "
+                  f"oranlar makine farkını da içerir, --update-baseline ile yerel bir temel üretin",
+                  file=sys.stderr)
+        for row in rows:
+            flag = "  REGRESYON" if row["regression"] else ""
+            print(f"{row['name']:<42} {row['baseline_s'] * 1e3:10.3f} -> {row['current_s'] * 1e3:10.3f} ms "
+                  f"(x{row['ratio']:.2f}){flag}", file=sys.stderr)
+        regressions = [row for row in rows if row["regression"]]
+        if regressions:
+            print(f"{len(regressions)} ölçüm eşiği (%{args.threshold * 100:.0f}) aştı", file=sys.stderr)
+            status = 1
+    elif args.baseline and not args.update_baseline:
+        print(f"Temel dosya bulunamadı: {args.baseline} (önce --update-baseline ile üretin)", file=sys.stderr)
+        return 1
+
+    if args.update_baseline:
+        save(args.baseline, data)
+        print(f"Temel güncellendi: {args.baseline}", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
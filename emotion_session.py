@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Artımlı (incremental) duygu skorlama oturumları
+
+Büyüyen bir sohbet kaydını ya da uzun bir belgeyi her yeni parçadan sonra
+baştan skorlamak toplam uzunlukla orantılı iş yapar. EmotionSession
+eklenen her parçayı bir kez kelimelere ayırır, kelimelerin duygu
+katkılarını duygu başına tutulan sayaçlara ekler ve skorları bu
+sayaçlardan hesaplar: append() yalnızca parçanın uzunluğu kadar, scores()
+duygu sayısı kadar iş yapar.
+
+window=N verilirse skorlar son N kelime üzerinden hesaplanır; pencereden
+çıkan kelimenin katkısı sayaçlardan düşülür. Kelime, Türkçede tokenize()
+çıktısı (stopwords'ten sonra), İngilizcede noktalamadan arındırılmış
+metnin kelimeleridir.
+
+Parçalar kelime sınırında birleşir: pencere yoksa Türkçe skorlar
+analyze_emotion(' '.join(parçalar)) ile aynıdır. İngilizcede hızlı motor
+kullanılır; "not happy" gibi olumsuzlama ve URL kuralları parça içinde
+uygulanır, iki parçaya bölünmüş bir ifade birleştirilmez.
+
+    session = EmotionSession('tr', window=200)
+    for message in chat:
+        scores = session.append(message)
+"""
+
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import language_detector
+
+# Türkçede kelime katkısı: (duygu sırası, puan) çiftleri
+_Contribution = Tuple[Tuple[int, float], ...]
+
+
+class EmotionSession:
+    """Parça parça beslenen metin için güncel duygu skorları
+
+    language 'tr', 'en' ya da 'auto'/None olabilir; 'auto' boş olmayan ilk
+    parçadan language_detector ile belirlenir. analyzer ve engine
+    verilmezse Text2Emotion'daki paylaşılan örnekler kullanılır.
+    """
+
+    def __init__(self, language: Optional[str] = 'tr', window: Optional[int] = None,
+                 analyzer=None, engine=None):
+        if language not in ('tr', 'en', 'auto', None):
+            raise ValueError(f"Desteklenmeyen dil: {language}")
+        if window is not None and window < 1:
+            raise ValueError("window en az 1 olmalı")
+        self.language = None if language in ('auto', None) else language
+        self.window = window
+        self._analyzer = analyzer
+        self._engine = engine
+        self.reset()
+
+    def reset(self) -> None:
+        """Birikmiş metni unut, dili koru"""
+        self._counts: List[float] = []
+        self._words: Deque = deque()
+        self._word_count = 0
+        self.chunks = 0
+
+    def __len__(self) -> int:
+        """Skora katılan kelime sayısı (pencere varsa en fazla window)"""
+        return self._word_count
+
+    @property
+    def emotions(self) -> Tuple[str, ...]:
+        if self.language == 'tr':
+            return self.analyzer.lexicon_index.emotions
+        from english_emotion_engine import EMOTIONS
+        return EMOTIONS
+
+    @property
+    def analyzer(self):
+        if self._analyzer is None:
+            from Text2Emotion import get_turkish_analyzer
+            self._analyzer = get_turkish_analyzer()
+        return self._analyzer
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from Text2Emotion import get_english_engine
+            self._engine = get_english_engine()
+        return self._engine
+
+    def _turkish_contributions(self, chunk: str) -> List[_Contribution]:
+        index = self.analyzer.lexicon_index
+        bits = tuple(enumerate(index.bits))
+        contributions = []
+        for word in self.analyzer.tokenize(chunk):
+            exact, partial = index.match(word)
+            if not (exact or partial):
+                contributions.append(())
+                continue
+            # TurkishLexiconIndex.count ile aynı puanlar: tam 1, kısmi 0.5
+            contributions.append(tuple((i, 1.0 if exact & bit else 0.5)
+                                       for i, bit in bits if (exact | partial) & bit))
+        return contributions
+
+    def _english_contributions(self, chunk: str) -> List[_Contribution]:
+        # Aynı duygu bir kelimede birden çok kez eşleşebilir (kısaltma açılımları)
+        return [tuple((emotion, 1) for emotion in ids) for ids in self.engine.word_emotion_ids(chunk)]
+
+    def append(self, chunk: str) -> Dict[str, float]:
+        """Parçayı ekle ve güncel skorları döndür"""
+        if not chunk or not chunk.strip():
+            return self.scores()
+        if self.language is None:
+            self.language = language_detector.detect(chunk).language
+        if not self._counts:
+            self._counts = [0.0 if self.language == 'tr' else 0] * len(self.emotions)
+
+        if self.language == 'tr':
+            contributions = self._turkish_contributions(chunk)
+        else:
+            contributions = self._english_contributions(chunk)
+        if self.window is not None and len(contributions) > self.window:
+            # Pencereye hiç girmeyecek kelimeler sayılmaz
+            self._expire(len(self._words))
+            contributions = contributions[-self.window:]
+
+        counts = self._counts
+        for contribution in contributions:
+            for i, weight in contribution:
+                counts[i] += weight
+        self._words.extend(contributions)
+        self._word_count += len(contributions)
+        self.chunks += 1
+
+        if self.window is not None and self._word_count > self.window:
+            self._expire(self._word_count - self.window)
+        return self.scores()
+
+    def extend(self, chunks: Iterable[str]) -> Dict[str, float]:
+        """Parçaları sırayla ekle"""
+        for chunk in chunks:
+            self.append(chunk)
+        return self.scores()
+
+    def _expire(self, count: int) -> None:
+        """En eski count kelimenin katkısını düş"""
+        counts, words = self._counts, self._words
+        for _ in range(count):
+            for i, weight in words.popleft():
+                counts[i] -= weight
+        self._word_count -= count
+
+    def scores(self) -> Dict[str, float]:
+        """Güncel skorlar; analiz fonksiyonlarıyla aynı biçimde"""
+        if self.language is None:
+            return {'Happy': 0.0, 'Sad': 0.0, 'Angry': 0.0, 'Fear': 0.0, 'Surprise': 0.0}
+        emotions = self.emotions
+        counts = self._counts or [0] * len(emotions)
+        if self.language == 'en':
+            return self.engine.normalize(counts)
+        # TurkishEmotionAnalyzer.analyze_emotion ile aynı normalizasyon
+        total_words = self._word_count or 1
+        return {emotion: min(count / total_words * 3, 1.0) for emotion, count in zip(emotions, counts)}
+
+    def details(self) -> Dict:
+        """Skorlar, baskın duygu, dil ve pencere bilgisi"""
+        emotions = self.scores()
+        dominant_emotion = max(emotions, key=emotions.get)
+        return {
+            'emotions': emotions,
+            'dominant_emotion': dominant_emotion,
+            'dominant_score': emotions[dominant_emotion],
+            'detected_language': self.language,
+            'words': self._word_count,
+            'chunks': self.chunks,
+            'window': self.window,
+        }
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Fast English emotion scoring engine
+
+Reproduces the Text2Emotion English pipeline (clean_text, NLTK stopword
+removal, then text2emotion.get_emotion) without calling into the
+text2emotion package per text. The word-emotion lexicon, negation and
+shortcut tables are read once from the installed text2emotion source,
+the text is tokenized once, and every per-token step (contraction
+splitting, stopwords, shortcut expansion, lemmatization and lexicon
+lookup) is memoized per distinct token.
+
+Tolerance: for text that went through clean_text (the only way the
+project calls text2emotion) the engine applies the same rules in the same
+order, so scores are expected to be identical. It is only tested to
+agree within 0.01 per emotion, because NLTK's Treebank tokenizer is
+re-implemented here for its contraction rules rather than called.
+"""
+
+import ast
+import functools
+import importlib.util
+import re
+import warnings
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Union
+
+from lexicon_store import MappedLexicon
+from time_budget import expired, text_chunks
+
+EMOTIONS = ("Happy", "Angry", "Surprise", "Sad", "Fear")
+
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+# text2emotion's string level rules, applied only when they can match
+_STRING_RULES_RE = re.compile(r'http|www|not\s')
+_URL_RE = re.compile(r'http\S+|www.\S+')
+_AI_NOT_RE = re.compile(r'ai\snot')
+_WO_NOT_RE = re.compile(r'wo\snot')
+_NOT_PHRASE_RE = re.compile(r'not\s\w+')
+
+# Words joined to the next one by the string rules ("not happy", "wo not",
+# "www x"): a text cut right after one of them does not score as it would whole
+JOINED_RE = re.compile(r'(?:not|ai|wo|www)\W*$', re.IGNORECASE)
+
+# NLTK Treebank contraction rules (NLTKWordTokenizer.CONTRACTIONS2/3)
+_CONTRACTIONS = [
+    re.compile(r"(?i)\b(can)(?#X)(not)\b"),
+    re.compile(r"(?i)\b(d)(?#X)('ye)\b"),
+    re.compile(r"(?i)\b(gim)(?#X)(me)\b"),
+    re.compile(r"(?i)\b(gon)(?#X)(na)\b"),
+    re.compile(r"(?i)\b(got)(?#X)(ta)\b"),
+    re.compile(r"(?i)\b(lem)(?#X)(me)\b"),
+    re.compile(r"(?i)\b(more)(?#X)('n)\b"),
+    re.compile(r"(?i)\b(wan)(?#X)(na)(?=\s)"),
+    re.compile(r"(?i) ('t)(?#X)(is)\b"),
+    re.compile(r"(?i) ('t)(?#X)(was)\b"),
+]
+
+
+def load_text2emotion_tables() -> Dict[str, object]:
+    """Read the lexicon, negation and shortcut tables from text2emotion's source
+
+    The tables are literals inside text2emotion.get_emotion, so they are
+    parsed with ast instead of importing the package (whose import
+    triggers NLTK downloads).
+    """
+    spec = importlib.util.find_spec("text2emotion")
+    if spec is None or spec.origin is None:
+        raise ImportError("text2emotion is not installed")
+    with open(spec.origin, encoding="utf-8") as source, warnings.catch_warnings():
+        # The package has regexes with invalid escapes; not our concern here
+        warnings.simplefilter("ignore")
+        tree = ast.parse(source.read())
+
+    wanted = {"df": "lexicon", "d": "negations", "shortcuts": "shortcuts"}
+    tables = {}
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id in wanted):
+            tables[wanted[node.targets[0].id]] = ast.literal_eval(node.value)
+
+    missing = set(wanted.values()) - set(tables)
+    if missing:
+        raise ValueError(f"text2emotion tables not found: {sorted(missing)}")
+
+    # get_emotion uses list.index() and skips index 0, so only the first
+    # occurrence of a word counts and the very first word never does
+    words = tables["lexicon"]["Word"]
+    labels = tables["lexicon"]["Emotion"]
+    lexicon = {}
+    for index, word in enumerate(words):
+        if index and word not in lexicon and word != words[0]:
+            lexicon[word] = labels[index]
+    tables["lexicon"] = lexicon
+    return tables
+
+
+def word_tokenize_fast(text: str) -> List[str]:
+    """NLTK word_tokenize for text made only of word characters and spaces"""
+    text = " " + text + " "
+    for regexp in _CONTRACTIONS:
+        text = regexp.sub(r" \1 \2 ", text)
+    return text.split()
+
+
+class EnglishEmotionEngine:
+    """English emotion scorer built on an in-memory text2emotion lexicon"""
+
+    def __init__(self, lexicon: Union[Dict[str, str], MappedLexicon], english_stopwords: Iterable[str],
+                 all_stopwords: Iterable[str], lemmatize: Callable[[str, str], str],
+                 negations: Optional[Dict[str, str]] = None,
+                 shortcuts: Optional[Dict[str, str]] = None,
+                 token_cache_size: int = 65536):
+        self.emotion_index: Dict[str, int] = {emotion: i for i, emotion in enumerate(EMOTIONS)}
+        if isinstance(lexicon, MappedLexicon):
+            # Compiled lexicon file: looked up in the shared mapping, not copied
+            self.lexicon = lexicon.emotion_ids(EMOTIONS)
+        else:
+            self.lexicon = {word: self.emotion_index[emotion]
+                            for word, emotion in lexicon.items()}
+        self.english_stopwords: FrozenSet[str] = frozenset(english_stopwords)
+        self.all_stopwords: FrozenSet[str] = frozenset(all_stopwords)
+        self.negations = dict(negations or {})
+        self.shortcuts = dict(shortcuts or {})
+        self._lemmatize = lemmatize
+        self.token_cache_size = token_cache_size
+
+        cache = functools.lru_cache(maxsize=token_cache_size)
+        self._raw_token_emotions = cache(self._raw_token_emotions_uncached)
+        self._token_emotions = cache(self._token_emotions_uncached)
+
+    @classmethod
+    def from_nltk(cls, english_stopwords: Optional[Iterable[str]] = None,
+                  **kwargs) -> "EnglishEmotionEngine":
+        """Build the engine from text2emotion's tables and NLTK corpora"""
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
+
+        tables = load_text2emotion_tables()
+        if english_stopwords is None:
+            english_stopwords = stopwords.words('english')
+        options = dict(
+            lexicon=tables["lexicon"],
+            english_stopwords=english_stopwords,
+            all_stopwords=stopwords.words(),
+            lemmatize=WordNetLemmatizer().lemmatize,
+            negations=tables["negations"],
+            shortcuts=tables["shortcuts"],
+        )
+        options.update(kwargs)
+        return cls(**options)
+
+    def with_lexicon(self, lexicon: Union[Dict[str, str], MappedLexicon]) -> "EnglishEmotionEngine":
+        """A new engine sharing this one's stopwords, lemmatizer and rule tables
+
+        Used to swap in a reloaded lexicon without touching NLTK; the new
+        engine starts with empty token caches.
+        """
+        return type(self)(lexicon, self.english_stopwords, self.all_stopwords, self._lemmatize,
+                          negations=self.negations, shortcuts=self.shortcuts,
+                          token_cache_size=self.token_cache_size)
+
+    def _token_emotions_uncached(self, token: str) -> Tuple[int, ...]:
+        """Emotion ids for one token of text2emotion's input
+
+        Covers shortcut expansion, digit removal, tokenization, stopword
+        and short-word removal, lemmatization and lexicon lookup.
+        """
+        found = []
+        for part in self.shortcuts.get(token, token).split():
+            if part.isdigit():
+                continue
+            if _PUNCTUATION_RE.search(part):
+                from nltk.tokenize import NLTKWordTokenizer
+                tokens = NLTKWordTokenizer().tokenize(part)
+            else:
+                tokens = word_tokenize_fast(part)
+            for word in tokens:
+                if len(word) <= 2 or word in self.all_stopwords:
+                    continue
+                lemma = self._lemmatize(self._lemmatize(word, 'v'), 'n')
+                emotion = self.lexicon.get(lemma)
+                if emotion is not None:
+                    found.append(emotion)
+        return tuple(found)
+
+    def _raw_token_emotions_uncached(self, token: str) -> Tuple[int, ...]:
+        """Emotion ids for one token of the cleaned input text"""
+        found = ()
+        for word in word_tokenize_fast(token):
+            if word not in self.english_stopwords:
+                found += self._token_emotions(word)
+        return found
+
+    def _apply_string_rules(self, text: str,
+                            phrases: Optional[Sequence[str]] = None) -> Tuple[str, List[str]]:
+        """text2emotion's URL, contraction and negation rewrites
+        
+        Like text2emotion, every phrase found is replaced throughout the
+        text. phrases, when given, replaces the phrases found in text.
+        Returns the text and the negation phrases that were rewritten, in
+        order of first occurrence.
+        """
+        text = _URL_RE.sub('', text)
+        text = _AI_NOT_RE.sub("am not", text)
+        text = _WO_NOT_RE.sub("will not", text)
+        rewritten = []
+        for phrase in _NOT_PHRASE_RE.findall(text) if phrases is None else phrases:
+            replacement = self.negations.get(phrase)
+            if replacement is not None:
+                text = text.replace(phrase, replacement)
+                if phrase not in rewritten:
+                    rewritten.append(phrase)
+        return text.lower(), rewritten
+
+    def clean(self, text: str) -> str:
+        """The form of text the engine scores: lowercased, no punctuation, single spaces
+
+        emotion_ids(clean(text)) == emotion_ids(text), so texts with the
+        same clean form have the same scores.
+        """
+        return ' '.join(_PUNCTUATION_RE.sub('', text.lower()).split())
+
+    def emotion_ids(self, text: str) -> List[int]:
+        """Lexicon emotion id for every matched token of text, in order"""
+        return self._emotion_ids(text)[0]
+
+    def _emotion_ids(self, text: str,
+                     phrases: Optional[Sequence[str]] = None) -> Tuple[List[int], Optional[List[str]]]:
+        """emotion_ids and the negation phrases rewritten (see _apply_string_rules)
+        
+        The phrases are None when text has no "not " (nor URL) for the
+        whole-string rules to act on.
+        """
+        cleaned = _PUNCTUATION_RE.sub('', text.lower())
+        words = cleaned.split()
+
+        ids = []
+        if not _STRING_RULES_RE.search(cleaned):
+            # No "not " in the text, so none of phrases can occur in it either
+            raw_token_emotions = self._raw_token_emotions
+            for word in words:
+                ids.extend(raw_token_emotions(word))
+            return ids, None
+
+        # Rare inputs where text2emotion's whole-string rules can match
+        kept = [token for word in words for token in word_tokenize_fast(word)
+                if token not in self.english_stopwords]
+        processed_text = ' '.join(kept).lower()
+        processed_text, rewritten = self._apply_string_rules(processed_text, phrases)
+        for token in processed_text.split():
+            ids.extend(self._token_emotions(token))
+        return ids, rewritten
+
+    def word_emotion_ids(self, text: str) -> List[Tuple[int, ...]]:
+        """emotion_ids grouped per word of the cleaned text
+
+        One entry per whitespace separated word (per rewritten token when
+        the whole-string rules apply), so callers can window over words.
+        """
+        cleaned = _PUNCTUATION_RE.sub('', text.lower())
+        if not _STRING_RULES_RE.search(cleaned):
+            return [self._raw_token_emotions(word) for word in cleaned.split()]
+
+        kept = [token for word in cleaned.split() for token in word_tokenize_fast(word)
+                if token not in self.english_stopwords]
+        processed_text = ' '.join(kept).lower()
+        return [self._token_emotions(token) for token in self._apply_string_rules(processed_text)[0].split()]
+
+    def count(self, text: str) -> List[int]:
+        """Matched word count per emotion, in EMOTIONS order"""
+        return self.count_negations(text)[0]
+
+    def count_negations(self, text: str,
+                        phrases: Optional[Sequence[str]] = None) -> Tuple[List[int], Optional[List[str]]]:
+        """count() and the negation phrases rewritten in text (None if none can occur)
+        
+        With phrases, those phrases are rewritten instead of the ones found
+        in text: the counts of a part of a longer text, as if scored within
+        it, when phrases are the ones rewritten in the longer text.
+        """
+        counts = [0] * len(EMOTIONS)
+        ids, rewritten = self._emotion_ids(text, phrases)
+        for emotion in ids:
+            counts[emotion] += 1
+        return counts, rewritten
+
+    @staticmethod
+    def normalize(counts: List[int]) -> Dict[str, float]:
+        """text2emotion's normalization: share of matches, rounded to 2 places"""
+        total = sum(counts)
+        if total == 0:
+            return {emotion: 0 for emotion in EMOTIONS}
+        return {emotion: round(count / total, 2) for emotion, count in zip(EMOTIONS, counts)}
+
+    def score(self, text: str) -> Dict[str, float]:
+        """Emotion scores for text, same shape as text2emotion.get_emotion"""
+        return self.normalize(self.count(text))
+
+    def score_until(self, text: str, deadline: float) -> Tuple[Dict[str, float], float]:
+        """score() over the prefix of text processed before deadline
+
+        The text is counted in word-aligned chunks (see time_budget) that
+        never end between a JOINED_RE word and the next one, and the
+        deadline is checked after each one. Returns the scores and the
+        share of the text that was processed, 1.0 when it was processed
+        whole. A whole text is also scored as score() does: chunks are
+        counted again with every negation phrase found in the text, as
+        text2emotion rewrites a phrase throughout it.
+        """
+        chunks = []
+        end = 0
+        for chunk, end in text_chunks(text, joined=JOINED_RE):
+            chunks.append((chunk, *self.count_negations(chunk)))
+            if expired(deadline):
+                break
+        coverage = round(end / len(text), 4) if text else 1.0
+
+        phrases = []
+        if coverage == 1.0:
+            for _, _, rewritten in chunks:
+                phrases.extend(phrase for phrase in rewritten or () if phrase not in phrases)
+        counts = [0] * len(EMOTIONS)
+        for chunk, chunk_counts, rewritten in chunks:
+            if coverage == 1.0 and rewritten is not None and rewritten != phrases:
+                chunk_counts = self.count_negations(chunk, phrases)[0]
+            for i, count in enumerate(chunk_counts):
+                counts[i] += count
+        return self.normalize(counts), coverage
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Character n-gram language identification for Turkish / English routing
+
+Each language has a profile of character 1-3 gram log-probabilities
+learned from a small embedded corpus (Turkish also in its ASCII-folded
+form, since much Turkish is typed without diacritics). A word's evidence
+is the sum of log P(gram | tr) - log P(gram | en) over the grams of the
+padded word, divided by three since every character is counted by three
+overlapping gram orders. Word scores are memoized per whitespace token,
+so scoring a text is one split plus one dict lookup per word. A text's
+log-likelihood ratio is the sum over its words and the confidence is the
+naive-Bayes posterior of the chosen language under equal priors.
+
+Long texts stop early once the ratio is decisive (EARLY_EXIT_LLR), and
+detect_batch() scores many short texts with one NumPy bincount; long
+texts in a batch are scanned one by one with the same early exit, so a
+text gets the same result whether it is detected alone or in a batch.
+"""
+
+import math
+import re
+from itertools import chain
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Languages are scored as a ratio, tr against en
+LANGUAGES = ('tr', 'en')
+
+# Stop scanning a long text once |log-likelihood ratio| reaches this
+EARLY_EXIT_LLR = 20.0
+
+# Words scored between early-exit checks
+CHUNK_WORDS = 32
+
+# Add-k smoothing for unseen grams
+SMOOTHING = 0.5
+
+# Bound on memoized word scores
+WORD_CACHE_SIZE = 100000
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+_TURKISH_CORPUS = """
+bugün çok mutluyum çünkü sonunda tatile çıkıyoruz ve hava harika görünüyor
+dün akşam arkadaşlarımla buluştuk birlikte yemek yedik ve uzun uzun sohbet ettik
+bu haberi duyunca çok üzüldüm gözlerimden yaşlar aktı ne yapacağımı bilemedim
+sınav sonuçlarını beklerken çok heyecanlıydım ama biraz da korkuyordum
+trafikte iki saat bekledik ve herkes çok sinirlendi kimse sabredemedi
+annem bana sürpriz bir hediye aldı gerçekten şaşırdım ve çok sevindim
+karanlıkta yalnız kalmaktan korkarım bu yüzden ışıkları hep açık bırakırım
+ben sen o biz siz onlar bu şu bir iki üç dört beş altı yedi sekiz dokuz on
+ve ile ama fakat çünkü için gibi kadar daha en çok az hiç her şey bazı
+değil var yok evet hayır belki neden nasıl nerede ne zaman kim hangi
+merhaba günaydın iyi akşamlar teşekkür ederim lütfen özür dilerim hoşça kal
+seni seviyorum seni özledim kendimi yalnız hissediyorum endişeliyim
+bu film gerçekten berbattı hiç beğenmedim zamanımı boşa harcadım
+yeni işimde mutluyum çalışma arkadaşlarım çok yardımsever ve nazik
+yarın sabah erkenden kalkıp okula gideceğim sonra kütüphanede ders çalışacağım
+şehirde yaşamak bazen yorucu oluyor ama köyde hayat daha sakin ve güzel
+kardeşim üniversiteyi kazandı bütün aile onunla gurur duyuyor
+hastaneden gelen haber hepimizi korkuttu doktor ne diyecek diye bekledik
+öğretmenimiz bize ödev verdi ama kimse yapmak istemedi
+bilgisayarım bozuldu bütün dosyalarım gitti çok öfkeliyim
+harika bir gün geçirdik denize girdik güneşlendik ve dondurma yedik
+çocuklar bahçede oynuyor kuşlar ötüyor her yer yemyeşil
+üzgünüm ama bu akşam gelemeyeceğim çok işim var
+tamam olur peki aynen süper sağol eyvallah yok artık
+mutlu mutluluk sevinç neşe keyif huzur sevgi aşk umut gurur
+üzgün üzüntü keder acı hüzün yalnızlık pişmanlık hayal kırıklığı
+kızgın öfke sinir nefret kıskançlık hırs kavga bağırmak
+korku endişe kaygı panik dehşet tedirgin ürkek telaş
+şaşkın şaşırmak hayret inanılmaz beklenmedik şok vay canına
+olmak yapmak etmek gelmek gitmek görmek bilmek istemek vermek almak
+oluyor yapıyorum geliyor gidiyoruz görüyorsunuz biliyorlar istiyorum
+oldu yaptım geldi gittik gördünüz bildiler istedim verdim aldık
+olacak yapacağız gelecek gideceksiniz görecekler bilmiyorum istemiyor
+evde okulda işte yolda sokakta şehirde ülkede dünyada
+evden okuldan işten yoldan sokaktan şehirden ülkeden dünyadan
+evim arabam kitabım annem babam kardeşim arkadaşım sevgilim
+güzel kötü büyük küçük yeni eski uzun kısa sıcak soğuk hızlı yavaş
+"""
+
+_ENGLISH_CORPUS = """
+today i am very happy because we are finally going on holiday and the weather looks great
+last night i met my friends we had dinner together and talked for a long time
+when i heard the news i was so sad that i cried and did not know what to do
+i was excited while waiting for the exam results but also a little scared
+we waited in traffic for two hours and everyone got really angry
+my mother bought me a surprise gift i was truly amazed and so glad
+i am afraid of being alone in the dark so i always leave the lights on
+i you he she it we they this that one two three four five six seven eight nine ten
+and with but because for like as more most much less never every thing some
+not there is are was were yes no maybe why how where when who which what
+hello good morning good evening thank you please sorry goodbye see you
+i love you i miss you i feel lonely i am worried about it
+this movie was really terrible i did not like it at all and wasted my time
+i am happy at my new job my colleagues are very helpful and kind
+tomorrow morning i will get up early go to school and then study in the library
+living in the city can be tiring sometimes but life in the country is calm and beautiful
+my brother got into university and the whole family is proud of him
+the news from the hospital frightened all of us we waited for the doctor
+our teacher gave us homework but nobody wanted to do it
+my computer broke down and all my files are gone i am furious
+we had a wonderful day we swam in the sea enjoyed the sun and ate ice cream
+the children are playing in the garden the birds are singing everything is green
+i am sorry but i cannot come tonight i have a lot of work to do
+ok okay yeah sure fine cool great thanks lol omg
+happy happiness joy delight pleasure peace love hope pride fun
+sad sadness sorrow pain grief loneliness regret disappointment
+angry anger rage hate hatred jealousy annoyed fight shouting
+fear worry anxiety panic terror nervous scared frightened
+surprised surprise amazing unbelievable unexpected shock wow
+be do make come go see know want give take get say think feel
+being doing making coming going seeing knowing wanting giving taking
+did made came went saw knew wanted gave took got said thought felt
+will would should could might must shall can have has had been
+at home at school at work on the road in the street in the city in the world
+my house my car my book my mother my father my sister my friend
+good bad big small new old long short hot cold fast slow beautiful
+the of to in that it for on with as his her their our your from by
+"""
+
+
+def _fold(text: str) -> str:
+    """Turkish text without diacritics, as it is often typed"""
+    return text.translate(str.maketrans('çğıöşü', 'cgiosu'))
+
+
+def _grams(word: str) -> List[str]:
+    """Character 1-3 grams of a word padded with spaces at both ends"""
+    padded = f" {word} "
+    return ([c for c in word]
+            + [padded[i:i + 2] for i in range(len(padded) - 1)]
+            + [padded[i:i + 3] for i in range(len(padded) - 2)])
+
+
+def _profile(corpus: Iterable[str]) -> Dict[int, Dict[str, int]]:
+    """Gram counts per gram length"""
+    counts: Dict[int, Dict[str, int]] = {1: {}, 2: {}, 3: {}}
+    for word in corpus:
+        for gram in _grams(word):
+            table = counts[len(gram)]
+            table[gram] = table.get(gram, 0) + 1
+    return counts
+
+
+class Detection(NamedTuple):
+    """Detected language code and the posterior probability of it"""
+    language: str
+    confidence: float
+
+
+class LanguageDetector:
+    """Turkish / English identifier over character n-gram log-probabilities"""
+
+    def __init__(self, turkish_words: Iterable[str], english_words: Iterable[str],
+                 early_exit_llr: float = EARLY_EXIT_LLR, cache_size: int = WORD_CACHE_SIZE):
+        turkish = _profile(turkish_words)
+        english = _profile(english_words)
+        # Precomputed log P(gram | tr) - log P(gram | en), add-k smoothed per gram length
+        self.weights: Dict[str, float] = {}
+        for n in (1, 2, 3):
+            vocabulary = turkish[n].keys() | english[n].keys()
+            size = len(vocabulary) + 1
+            tr_total = sum(turkish[n].values()) + SMOOTHING * size
+            en_total = sum(english[n].values()) + SMOOTHING * size
+            for gram in vocabulary:
+                self.weights[gram] = (math.log((turkish[n].get(gram, 0) + SMOOTHING) / tr_total)
+                                      - math.log((english[n].get(gram, 0) + SMOOTHING) / en_total)) / 3
+        self.early_exit_llr = early_exit_llr
+        self.cache_size = cache_size
+        self._word_scores: Dict[str, float] = {}
+
+    @classmethod
+    def default(cls) -> "LanguageDetector":
+        """Detector trained on the embedded corpora"""
+        turkish = _TURKISH_CORPUS.split()
+        return cls(turkish + _fold(_TURKISH_CORPUS).split(), _ENGLISH_CORPUS.split() * 2)
+
+    def word_score(self, token: str) -> float:
+        """Log-likelihood ratio of Turkish over English for one lowercased token
+
+        Punctuation and digits in the token are ignored; the memo is keyed
+        by the raw token so texts never need a regex pass of their own.
+        """
+        score = self._word_scores.get(token)
+        if score is None:
+            weights = self.weights
+            score = sum(weights.get(gram, 0.0)
+                        for word in _WORD_RE.findall(token) for gram in _grams(word))
+            if len(self._word_scores) >= self.cache_size:
+                self._word_scores.clear()
+            self._word_scores[token] = score
+        return score
+
+    def log_likelihood_ratio(self, text: str) -> float:
+        """Summed evidence for Turkish (positive) over English (negative)
+
+        Texts longer than CHUNK_WORDS words are scanned in chunks and stop
+        as soon as the ratio passes early_exit_llr.
+        """
+        words = text.lower().split()
+        if len(words) <= CHUNK_WORDS:
+            try:
+                return sum(map(self._word_scores.__getitem__, words))
+            except KeyError:
+                return sum(map(self.word_score, words))
+        return self._scan(words)[0]
+
+    def _scan(self, words: Sequence[str]) -> Tuple[float, bool]:
+        """Evidence summed CHUNK_WORDS words at a time until it reaches early_exit_llr
+
+        Returns the sum and whether it stopped early.
+        """
+        score = self.word_score
+        total = 0.0
+        for start in range(0, len(words), CHUNK_WORDS):
+            total += sum(map(score, words[start:start + CHUNK_WORDS]))
+            if abs(total) >= self.early_exit_llr:
+                return total, True
+        return total, False
+
+    @staticmethod
+    def _decide(llr: float) -> Detection:
+        # Ties (no evidence at all) go to English, like the old character check
+        if llr > 0:
+            return Detection('tr', 1.0 / (1.0 + math.exp(-min(llr, 700.0))))
+        return Detection('en', 1.0 / (1.0 + math.exp(max(llr, -700.0))))
+
+    def detect(self, text: str) -> Detection:
+        """Language code and confidence for one text"""
+        return self._decide(self.log_likelihood_ratio(text))
+
+    def detect_prefix(self, prefix: str) -> Optional[Detection]:
+        """detect() of any text that starts with prefix, or None if prefix alone does not decide it
+
+        Only the complete CHUNK_WORDS word blocks of prefix are scanned (a
+        word cut at its end may continue in the text); the result is the
+        text's when the early exit happens within them.
+        """
+        words = prefix.lower().split()
+        if prefix and not prefix[-1].isspace():
+            words = words[:-1]
+        total, decided = self._scan(words[:len(words) - len(words) % CHUNK_WORDS])
+        return self._decide(total) if decided else None
+
+    def is_turkish(self, text: str) -> bool:
+        """detect(text).language == 'tr' without computing the confidence"""
+        return self.log_likelihood_ratio(text) > 0
+
+    def detect_batch(self, texts: Sequence[str]) -> List[Detection]:
+        """detect() for many texts, summing word scores with one bincount
+
+        Texts longer than CHUNK_WORDS words are scanned with early exit,
+        as detect() does, and left out of the bincount.
+        """
+        import numpy as np
+
+        if not texts:
+            return []
+        token_lists = [text.lower().split() for text in texts]
+        long_texts = {i: self._decide(self._scan(words)[0])
+                      for i, words in enumerate(token_lists) if len(words) > CHUNK_WORDS}
+        if long_texts:
+            token_lists = [[] if i in long_texts else words for i, words in enumerate(token_lists)]
+        lengths = np.fromiter(map(len, token_lists), dtype=np.intp, count=len(token_lists))
+        tokens = list(chain.from_iterable(token_lists))
+        cached = self._word_scores.get
+        scores = [cached(token) for token in tokens]
+        if None in scores:
+            scores = list(map(self.word_score, tokens))
+        doc_ids = np.repeat(np.arange(len(token_lists)), lengths)
+        llrs = np.bincount(doc_ids, weights=np.asarray(scores, dtype=np.float64), minlength=len(token_lists))
+        confidences = 1.0 / (1.0 + np.exp(-np.minimum(np.abs(llrs), 700.0)))
+        return [long_texts.get(i) or Detection('tr' if llr > 0 else 'en', confidence)
+                for i, (llr, confidence) in enumerate(zip(llrs.tolist(), confidences.tolist()))]
+
+
+_default_detector: Optional[LanguageDetector] = None
+
+
+def get_detector() -> LanguageDetector:
+    """Shared detector, built on first use"""
+    global _default_detector
+    if _default_detector is None:
+        _default_detector = LanguageDetector.default()
+    return _default_detector
+
+
+def detect(text: str) -> Detection:
+    return get_detector().detect(text)
+
+
+def detect_prefix(prefix: str) -> Optional[Detection]:
+    return get_detector().detect_prefix(prefix)
+
+
+def is_turkish(text: str) -> bool:
+    return get_detector().is_turkish(text)
+
+
+def detect_batch(texts: Sequence[str]) -> List[Detection]:
+    return get_detector().detect_batch(texts)
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Bellek eşlemeli (mmap) paylaşılan sözlük deposu
+
+Duygu sözlüğü bir kez derlenip diske yazılır; süreçler dosyayı salt
+okunur mmap ile açar. Sayfalar işletim sisteminin sayfa önbelleğinden
+gelir, böylece N işçi tek bir fiziksel kopyayı paylaşır ve 100 binlerce
+girdilik sözlükler süreç başına ayrıştırılmadan yüklenir.
+
+Dosya düzeni (little endian):
+
+    MAGIC (8 bayt) | başlık uzunluğu (uint32) | JSON başlık | tablolar
+
+Her tablo sıralı bir string tablosudur: (sayı + 1) adet uint32 ofset,
+sayı kadar duygu bit maskesi ve UTF-8 bayt sırasına göre sıralanmış,
+art arda eklenmiş kelimeler. Aramalar için yanında bir hash kova dizisi
+(crc32, doğrusal yoklama, girdi sırası + 1) bulunur; Python'da ikili
+arama kelime başına onlarca dilim kopyası gerektirir. 'exact' tablosu
+sözlük kelimelerini, 'substrings' tablosu (Türkçe kısmi eşleşme için)
+sözlük kelimelerinin tüm alt dizelerini içerir; bu tablonun maskesinin
+alt bitleri dizeyi içeren kelimelerin duygularını, duygu sayısı kadar
+kaydırılmış üst bitleri dizenin kendisinin tam eşleşme maskesini tutar.
+Böylece bir alt dize için tek arama yeterli olur.
+
+Başlıktaki 'version' alanı sözlüğün sürümüdür (verilmezse içerikten
+üretilen kısa bir özet); sonuç önbelleği anahtarlarına eklenir ve
+çalışan sunucu dosya değişince yeni sürüme geçer (bkz. Text2Emotion.
+reload_lexicons). Dosya her zaman geçici dosyaya yazılıp os.replace ile
+yerine konur, okuyucular hiçbir zaman yarım yazılmış dosya görmez.
+
+    python lexicon_store.py turkish tr.lex
+    python lexicon_store.py english en.lex
+    python lexicon_store.py turkish tr.lex --source sozluk.json --lexicon-version 2024-w48
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+MAGIC = b"T2ELEX01"
+
+# Tablo başına dosyadaki diziler, yazılma sırasıyla
+_PARTS = ("offsets", "masks", "strings", "buckets")
+
+# Gereken bit sayısına göre maske genişliği
+_MASK_TYPES = ((8, "B"), (16, "H"), (32, "I"), (64, "Q"))
+
+
+def _mask_type(bits_needed: int) -> str:
+    for bits, code in _MASK_TYPES:
+        if bits_needed <= bits:
+            return code
+    raise ValueError(f"Maskeler en fazla 64 bit olabilir, {bits_needed} gerekiyor")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _encode_table(entries: Dict[str, int]) -> Tuple[Dict, List[bytes]]:
+    """Girdileri sıralı string tablosu parçalarına çevir"""
+    items = sorted((word.encode("utf-8"), mask) for word, mask in entries.items())
+    mask_code = _mask_type(max((mask for _, mask in items), default=0).bit_length())
+    offsets = [0]
+    for word, _ in items:
+        offsets.append(offsets[-1] + len(word))
+    if offsets[-1] >= 1 << 32:
+        raise ValueError("Sözlük string tablosu 4 GB sınırını aşıyor")
+    # Doluluk oranı en fazla %50 olan, 2'nin kuvveti boyutunda kova dizisi
+    size = 1
+    while size < 2 * len(items):
+        size *= 2
+    buckets = [0] * size
+    for i, (word, _) in enumerate(items):
+        slot = zlib.crc32(word) & (size - 1)
+        while buckets[slot]:
+            slot = (slot + 1) & (size - 1)
+        buckets[slot] = i + 1
+    parts = [
+        struct.pack(f"<{len(offsets)}I", *offsets),
+        struct.pack(f"<{len(items)}{mask_code}", *(mask for _, mask in items)),
+        b"".join(word for word, _ in items),
+        struct.pack(f"<{size}I", *buckets),
+    ]
+    return {"count": len(items), "buckets_size": size, "mask_type": mask_code}, parts
+
+
+def write_lexicon(path: str, emotions: Sequence[str], tables: Dict[str, Dict[str, int]],
+                  version: Optional[str] = None):
+    """Maske tablolarını (tablo adı -> kelime -> maske) derlenmiş dosyaya yaz"""
+    header = {"emotions": list(emotions), "tables": {}}
+    if version is not None:
+        header["version"] = version
+    encoded = {name: _encode_table(entries) for name, entries in tables.items()}
+
+    # Başlık kendi uzunluğuna bağlı ofsetler içerdiği için sabitlenene kadar yeniden hesapla
+    header_length = 0
+    while True:
+        position = _align(len(MAGIC) + 4 + header_length)
+        for name, (info, parts) in encoded.items():
+            locations = {}
+            for key, part in zip(_PARTS, parts):
+                locations[key] = position
+                position = _align(position + len(part))
+            header["tables"][name] = dict(info, **locations)
+        header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+        if len(header_bytes) == header_length:
+            break
+        header_length = len(header_bytes)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes)
+        for name, (_, parts) in encoded.items():
+            locations = header["tables"][name]
+            for key, part in zip(_PARTS, parts):
+                f.write(b"\0" * (locations[key] - f.tell()))
+                f.write(part)
+    # Açık mmap'ler eski dosyayı görmeye devam eder, yeni süreçler yenisini açar
+    os.replace(temporary, path)
+
+
+def compile_lexicon(path: str, emotion_words: Mapping[str, Iterable[str]],
+                    substrings: bool = True, version: Optional[str] = None):
+    """Duygu -> kelime listesi sözlüğünü derle
+
+    substrings=True ise Türkçe analizörün kısmi eşleşmeleri için tüm alt
+    dizeler de tabloya yazılır. version verilmezse içerik özeti kullanılır.
+    """
+    emotions = list(emotion_words)
+    if 2 * len(emotions) > 64:
+        raise ValueError(f"En fazla 32 duygu desteklenir, {len(emotions)} verildi")
+    exact: Dict[str, int] = {}
+    for i, words in enumerate(emotion_words.values()):
+        for word in words:
+            exact[word] = exact.get(word, 0) | (1 << i)
+    if version is None:
+        content = json.dumps([emotions, sorted(exact.items())], ensure_ascii=False)
+        version = hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+
+    tables = {"exact": exact}
+    if substrings:
+        parts: Dict[str, int] = {}
+        for word, mask in exact.items():
+            length = len(word)
+            for start in range(length):
+                for end in range(start + 1, length + 1):
+                    part = word[start:end]
+                    parts[part] = parts.get(part, 0) | mask
+        shift = len(emotions)
+        tables["substrings"] = {part: mask | (exact.get(part, 0) << shift)
+                                for part, mask in parts.items()}
+    write_lexicon(path, emotions, tables, version)
+
+
+class _StringTable:
+    """mmap üzerindeki sıralı string tablosu"""
+
+    def __init__(self, buffer: memoryview, info: Dict):
+        self.count = info["count"]
+        mask_code = info["mask_type"]
+        self._offsets = buffer[info["offsets"]:info["offsets"] + 4 * (self.count + 1)].cast("I")
+        width = struct.calcsize(mask_code)
+        self._masks = buffer[info["masks"]:info["masks"] + width * self.count].cast(mask_code)
+        self._strings = buffer[info["strings"]:info["strings"] + self._offsets[self.count]]
+        size = info["buckets_size"]
+        self._buckets = buffer[info["buckets"]:info["buckets"] + 4 * size].cast("I")
+        self._slot_mask = size - 1
+
+    def _key(self, i: int) -> bytes:
+        return self._strings[self._offsets[i]:self._offsets[i + 1]].tobytes()
+
+    def get(self, key: bytes) -> int:
+        """Anahtarın maskesi, yoksa 0"""
+        offsets, buckets, slot_mask = self._offsets, self._buckets, self._slot_mask
+        slot = zlib.crc32(key) & slot_mask
+        while True:
+            entry = buckets[slot]
+            if not entry:
+                return 0
+            start, end = offsets[entry - 1], offsets[entry]
+            # Uzunluk farklıysa dilim oluşturmadan geç
+            if end - start == len(key) and self._strings[start:end] == key:
+                return self._masks[entry - 1]
+            slot = (slot + 1) & slot_mask
+
+    def __iter__(self) -> Iterator[Tuple[str, int]]:
+        for i in range(self.count):
+            yield self._key(i).decode("utf-8"), self._masks[i]
+
+    def release(self):
+        for view in (self._offsets, self._masks, self._strings, self._buckets):
+            view.release()
+
+
+class _EmotionWordsView(Mapping):
+    """Depodaki kelimeleri duygu -> kelimeler eşlemesi olarak gösterir (kopyalamaz)"""
+
+    def __init__(self, lexicon: "MappedLexicon"):
+        self._lexicon = lexicon
+
+    def __getitem__(self, emotion: str) -> Tuple[str, ...]:
+        bit = 1 << self._lexicon.emotions.index(emotion)
+        return tuple(word for word, mask in self._lexicon.items() if mask & bit)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._lexicon.emotions)
+
+    def __len__(self) -> int:
+        return len(self._lexicon.emotions)
+
+
+class _EmotionIdLookup:
+    """Maskeleri verilen duygu sırasındaki indekse çeviren .get arayüzü"""
+
+    def __init__(self, lexicon: "MappedLexicon", order: Sequence[str]):
+        self._lexicon = lexicon
+        self._ids = {}
+        for i, emotion in enumerate(lexicon.emotions):
+            self._ids[1 << i] = order.index(emotion) if emotion in order else None
+
+    def get(self, word: str, default=None):
+        mask = self._lexicon.exact(word)
+        if not mask:
+            return default
+        # Birden fazla duygusu olan kelimede depodaki ilk duygu kullanılır
+        emotion = self._ids[mask & -mask]
+        return default if emotion is None else emotion
+
+
+def file_signature(stat: os.stat_result) -> Tuple[int, int, int]:
+    """(inode, mtime, boyut): os.replace ile değiştirilen dosyada inode da değişir"""
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class MappedLexicon:
+    """Derlenmiş sözlük dosyasını salt okunur mmap ile açar"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            # Açılan dosyanın kimliği; yoldaki dosya değişti mi diye karşılaştırılır
+            self.signature = file_signature(os.fstat(f.fileno()))
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} derlenmiş bir sözlük dosyası değil")
+        (header_length,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(self._mmap[start:start + header_length].decode("utf-8"))
+
+        self.emotions: Tuple[str, ...] = tuple(header["emotions"])
+        # Sürüm alanı olmayan eski dosyalarda içeriğin CRC'si
+        self.version: str = header.get("version") or f"crc{zlib.crc32(self._mmap):08x}"
+        self._buffer = memoryview(self._mmap)
+        self._tables = {name: _StringTable(self._buffer, info)
+                        for name, info in header["tables"].items()}
+        self._exact_shift = len(self.emotions)
+        self._emotions_mask = (1 << self._exact_shift) - 1
+        self._exact = self._tables["exact"]
+        self._substrings = self._tables.get("substrings")
+
+    @property
+    def has_substrings(self) -> bool:
+        return self._substrings is not None
+
+    def exact(self, word: str) -> int:
+        """Kelimenin duygu maskesi (yoksa 0)"""
+        return self._exact.get(word.encode("utf-8"))
+
+    def substring(self, word: str) -> Tuple[int, int]:
+        """(kelimeyi alt dize olarak içeren sözlük kelimelerinin maskesi,
+        kelimenin tam eşleşme maskesi); kelime hiçbir sözlük kelimesinde
+        geçmiyorsa (0, 0)"""
+        if self._substrings is None:
+            raise ValueError(f"{self.path} alt dize tablosu olmadan derlenmiş")
+        value = self._substrings.get(word.encode("utf-8"))
+        return value & self._emotions_mask, value >> self._exact_shift
+
+    def get(self, word: str, default: Optional[int] = None) -> Optional[int]:
+        return self.exact(word) or default
+
+    def __contains__(self, word: str) -> bool:
+        return bool(self.exact(word))
+
+    def __len__(self) -> int:
+        return self._exact.count
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        """(kelime, maske) çiftleri, bayt sırasıyla"""
+        return iter(self._exact)
+
+    def emotion_words(self) -> Mapping[str, Tuple[str, ...]]:
+        """TurkishEmotionAnalyzer.emotion_words ile aynı biçimde, kopyasız görünüm"""
+        return _EmotionWordsView(self)
+
+    def emotion_ids(self, order: Sequence[str]) -> _EmotionIdLookup:
+        """Kelime -> order içindeki duygu indeksi (EnglishEmotionEngine.lexicon yerine)"""
+        return _EmotionIdLookup(self, order)
+
+    def close(self):
+        for table in self._tables.values():
+            table.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "MappedLexicon":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Text2Emotion sözlüğünü mmap biçimine derle")
+    parser.add_argument("language", choices=["turkish", "english"])
+    parser.add_argument("output", help="Derlenmiş sözlük dosyası")
+    parser.add_argument("--source", help="Duygu -> kelime listesi içeren JSON dosyası "
+                                         "(verilmezse yerleşik sözlük kullanılır)")
+    parser.add_argument("--lexicon-version", help="Sözlük sürümü (verilmezse içerik özeti)")
+    args = parser.parse_args(argv)
+
+    if args.source:
+        with open(args.source, encoding="utf-8") as f:
+            emotion_words = json.load(f)
+    elif args.language == "turkish":
+        from turkish_emotion_analyzer import TurkishEmotionAnalyzer
+        emotion_words = TurkishEmotionAnalyzer().emotion_words
+    else:
+        from english_emotion_engine import EMOTIONS, load_text2emotion_tables
+        lexicon = load_text2emotion_tables()["lexicon"]
+        emotion_words = {emotion: [word for word, label in lexicon.items() if label == emotion]
+                         for emotion in EMOTIONS}
+
+    compile_lexicon(args.output, emotion_words, substrings=args.language == "turkish",
+                    version=args.lexicon_version)
+    with MappedLexicon(args.output) as lexicon:
+        print(f"{args.output}: {len(lexicon)} kelime, sürüm {lexicon.version}, "
+              f"{os.path.getsize(args.output) / 1e6:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,51 +1,273 @@
 #!/usr/bin/env python3
 """
 Logging configuration for Text2Emotion
+
+In the default 'queue' mode the logger only has a QueueHandler: a log
+call freezes the message and puts the record on a bounded in-memory
+queue, and a background QueueListener thread writes it to the console
+and to a daily log file. When the queue is full the record is dropped
+and counted instead of blocking the caller. 'sync' mode attaches the
+handlers directly, as before. Nothing happens at import: the listener
+thread starts, and the log directory and file are created, when the
+first record is logged.
+
+Settings (environment):
+    TEXT2EMOTION_LOG_MODE          'queue' (default) or 'sync'
+    TEXT2EMOTION_LOG_FORMAT        'text' (default) or 'json'
+    TEXT2EMOTION_LOG_DIR           log directory, default 'logs'
+    TEXT2EMOTION_LOG_BACKUPS       daily files to keep, default 7 (0 keeps all)
+    TEXT2EMOTION_LOG_QUEUE_SIZE    queued records before dropping, default 10000
+    TEXT2EMOTION_LOG_SAMPLE_RATE   share of per-request logs written, default 0.01
 """
 
+import atexit
+import glob
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import random
+import threading
+import time
 from datetime import datetime
 
-def setup_logger(name: str = "Text2Emotion"):
-    """Setup logger with file and console handlers"""
-    
-    # Create logs directory if it doesn't exist
-    os.makedirs("logs", exist_ok=True)
-    
-    # Create logger
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
-    # Prevent duplicate handlers
-    if logger.handlers:
-        return logger
-    
-    # Create formatters
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    console_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s'
-    )
-    
-    # File handler
-    file_handler = logging.FileHandler(
-        f"logs/text2emotion_{datetime.now().strftime('%Y%m%d')}.log"
+import metrics
+
+LOG_MODE = os.environ.get("TEXT2EMOTION_LOG_MODE", "queue")
+LOG_FORMAT = os.environ.get("TEXT2EMOTION_LOG_FORMAT", "text")
+LOG_DIR = os.environ.get("TEXT2EMOTION_LOG_DIR", "logs")
+LOG_BACKUPS = int(os.environ.get("TEXT2EMOTION_LOG_BACKUPS", "7"))
+LOG_QUEUE_SIZE = int(os.environ.get("TEXT2EMOTION_LOG_QUEUE_SIZE", "10000"))
+REQUEST_SAMPLE_RATE = float(os.environ.get("TEXT2EMOTION_LOG_SAMPLE_RATE", "0.01"))
+
+DROPPED = metrics.REGISTRY.register(metrics.Counter(
+    "text2emotion_log_dropped_total", "Log queue was full, record dropped"))
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class DailyFileHandler(logging.FileHandler):
+    """Appends to <prefix>_YYYYMMDD.log and switches file when the date changes
+
+    Each process only ever appends and reopens, so pre-forked workers can
+    share the directory without racing over renames. Files beyond the
+    newest `backups` are removed on every switch.
+    """
+
+    def __init__(self, directory: str, prefix: str = "text2emotion", backups: int = LOG_BACKUPS,
+                 encoding: str = "utf-8"):
+        self.directory = directory
+        self.prefix = prefix
+        self.backups = backups
+        self.day = time.strftime("%Y%m%d")
+        super().__init__(self._path(self.day), encoding=encoding, delay=True)
+
+    def _path(self, day: str) -> str:
+        return os.path.join(self.directory, f"{self.prefix}_{day}.log")
+
+    def _open(self):
+        # Opened on the first record, so the directory is only created when used
+        os.makedirs(self.directory, exist_ok=True)
+        return super()._open()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        day = time.strftime("%Y%m%d", time.localtime(record.created))
+        if day == self.day:
+            super().emit(record)
+            return
+        self.day = day
+        self.close()
+        self.baseFilename = os.path.abspath(self._path(day))
+        super().emit(record)
+        self._prune()
+
+    def _prune(self) -> None:
+        if self.backups <= 0:
+            return
+        for path in sorted(glob.glob(self._path("[0-9]" * 8)))[:-self.backups]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any extra= fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: a full queue drops the record and counts it
+
+    Given output handlers, it runs the QueueListener that writes to them,
+    starting its thread with the first record. After stop() records are
+    no longer written.
+    """
+
+    def __init__(self, log_queue: queue.Queue, outputs=()):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.outputs = list(outputs)
+        self.listener = None
+        self._stopped = False
+        self._listener_lock = threading.Lock()
+
+    def _start_listener(self) -> None:
+        with self._listener_lock:
+            if self.listener is None and not self._stopped:
+                self.listener = logging.handlers.QueueListener(self.queue, *self.outputs,
+                                                               respect_handler_level=True)
+                self.listener.start()
+
+    def stop(self) -> None:
+        """Flush queued records and stop the listener thread"""
+        with self._listener_lock:
+            self._stopped = True
+            if self.listener is not None:
+                self.listener.stop()
+                self.listener = None
+
+    def after_fork(self) -> None:
+        """Reset in a forked child: the listener thread does not survive fork
+
+        The child gets its own queue (the parent's may hold a locked mutex)
+        and starts its own listener with its first record.
+        """
+        self.queue = queue.Queue(self.queue.maxsize)
+        self.listener = None
+        self._listener_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener runs in this process, so the record needs no copy or
+        # formatting here; only the arguments are frozen into the message
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.listener is None and self.outputs and not self._stopped:
+            self._start_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            DROPPED.inc()
+
+
+def _formatters(log_format: str):
+    """(file formatter, console formatter)"""
+    if log_format == "json":
+        formatter = JsonFormatter()
+        return formatter, formatter
+    return (
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
+        logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'),
     )
+
+
+def _output_handlers(log_format: str, directory: str):
+    """Console and daily file handlers that do the actual I/O"""
+    file_formatter, console_formatter = _formatters(log_format)
+
+    file_handler = DailyFileHandler(directory)
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(file_formatter)
-    
-    # Console handler
+
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(console_formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
+    return [file_handler, console_handler]
+
+
+_queue_handlers = {}
+
+
+def setup_logger(name: str = "Text2Emotion", mode: str = None, log_format: str = None,
+                 directory: str = None, queue_size: int = None):
+    """Setup logger with file and console handlers
+
+    In 'queue' mode the handlers run on a background listener thread
+    behind a bounded queue; in 'sync' mode they are attached directly.
+    """
+    mode = mode or LOG_MODE
+    log_format = log_format or LOG_FORMAT
+    directory = directory or LOG_DIR
+    queue_size = LOG_QUEUE_SIZE if queue_size is None else queue_size
+
+    # Create logger
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+
+    # Prevent duplicate handlers
+    if logger.handlers:
+        return logger
+
+    handlers = _output_handlers(log_format, directory)
+    if mode == "sync":
+        for handler in handlers:
+            logger.addHandler(handler)
+        return logger
+
+    queue_handler = DroppingQueueHandler(queue.Queue(queue_size), handlers)
+    _queue_handlers[name] = queue_handler
+    logger.addHandler(queue_handler)
     return logger
 
+
+def stop_logging(name: str = "Text2Emotion") -> None:
+    """Flush queued records and stop the listener thread"""
+    queue_handler = _queue_handlers.pop(name, None)
+    if queue_handler is not None:
+        queue_handler.stop()
+
+
+def dropped_records(name: str = "Text2Emotion") -> int:
+    """Records dropped so far because the queue was full"""
+    queue_handler = _queue_handlers.get(name)
+    return queue_handler.dropped if queue_handler else 0
+
+
+def _restart_listeners_after_fork() -> None:
+    for queue_handler in _queue_handlers.values():
+        queue_handler.after_fork()
+
+
+def _stop_all() -> None:
+    for name in list(_queue_handlers):
+        stop_logging(name)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listeners_after_fork)
+atexit.register(_stop_all)
+
 # Global logger instance
 logger = setup_logger()
+
+# Per-request logs; only a REQUEST_SAMPLE_RATE share of them is written
+request_logger = logger.getChild("requests")
+
+
+def log_request(message: str, *args, **fields) -> None:
+    """Sampled per-request log; the sampling decision is made before any record is built
+
+    fields are attached to the record (and appear as JSON keys in 'json' format).
+    """
+    if REQUEST_SAMPLE_RATE > 0 and random.random() < REQUEST_SAMPLE_RATE:
+        request_logger.info(message, *args, extra=fields)
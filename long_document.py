@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Chunked parallel scoring for very long documents
+
+A long document (article, transcript, book chapter) is split on paragraph
+and sentence boundaries into chunks of at most chunk_chars characters,
+the chunks are scored in a process pool and their per-emotion counts are
+merged. Both analyzers score a text from counts summed over its words
+(Turkish: match points over the word count, English: match shares), so
+the merged result is exactly the one-string result; chunks never end
+inside a word, nor between "not" and the word it negates. text2emotion
+replaces a negation phrase ("not happy") it finds anywhere throughout
+the text, so an English chunk that may hold a phrase found only in
+another chunk is scored again with the whole text's phrases.
+
+The language is detected on the first chunk: the detector scans a long
+text in fixed word blocks and stops once its evidence is decisive, so
+when that happens within the first chunk the result is the whole text's.
+Only an inconclusive first chunk makes it scan the whole text.
+"""
+
+import os
+import re
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import language_detector
+import metrics
+from analysis_executor import AnalysisExecutor
+from english_emotion_engine import JOINED_RE
+
+# Texts at least this long are scored in parallel by analyze_document()
+LONG_DOCUMENT_CHARS = int(os.environ.get('TEXT2EMOTION_LONG_DOCUMENT_CHARS', '100000'))
+
+# Upper bound on a chunk; also the resolution of the timeline
+CHUNK_CHARS = int(os.environ.get('TEXT2EMOTION_DOCUMENT_CHUNK_CHARS', '65536'))
+
+# Process pool size for analyze_document()
+WORKERS = int(os.environ.get('TEXT2EMOTION_DOCUMENT_WORKERS', str(os.cpu_count() or 1)))
+
+# Preferred chunk ends, best first: blank line, sentence end, any whitespace
+_BOUNDARIES = (re.compile(r'\n\s*\n'), re.compile(r'[.!?…]+\s'), re.compile(r'\s'))
+
+# run(fn, jobs) -> [fn(*args) for args in jobs], in order; may run the jobs in parallel
+Runner = Callable[[Callable, Sequence[tuple]], List[Any]]
+
+_executor: Optional[AnalysisExecutor] = None
+
+
+class DocumentPlan(NamedTuple):
+    """A document's chunks and language, decided before scoring"""
+    spans: List[Tuple[int, int]]
+    chunks: List[str]
+    language: str
+    confidence: Optional[float]
+
+
+class ChunkCounts(NamedTuple):
+    """Per-emotion counts of one chunk
+
+    words and processed_text are only set for Turkish, whose scores are
+    normalized by the word count; negations only for English (see
+    EnglishEmotionEngine.count_negations). version is the
+    Text2Emotion.result_version() of the process that scored the chunk.
+    """
+    counts: List[float]
+    words: Optional[int]
+    processed_text: Optional[str]
+    negations: Optional[List[str]] = None
+    version: Optional[str] = None
+
+
+def split_document(text: str, chunk_chars: int = CHUNK_CHARS) -> List[Tuple[int, int]]:
+    """(start, end) spans covering text, each at most chunk_chars long
+
+    Each chunk ends at the last paragraph break in its second half, else
+    the last sentence end, else the last whitespace; a word longer than
+    half a chunk is cut.
+    """
+    spans = []
+    start = 0
+    length = len(text)
+    while length - start > chunk_chars:
+        limit = start + chunk_chars
+        end = limit
+        for boundary in _BOUNDARIES:
+            ends = [match.end() for match in boundary.finditer(text, start + chunk_chars // 2, limit)
+                    if not JOINED_RE.search(text, max(start, match.start() - 8), match.start() + 1)]
+            if ends:
+                end = ends[-1]
+                break
+        spans.append((start, end))
+        start = end
+    if start < length or not spans:
+        spans.append((start, length))
+    return spans
+
+
+def detect_document(text: str, first_chunk: str) -> language_detector.Detection:
+    """language_detector.detect(text), reading past first_chunk only if it is inconclusive"""
+    detection = language_detector.detect_prefix(first_chunk)
+    return detection if detection is not None else language_detector.detect(text)
+
+
+def plan_document(text: str, language: Optional[str] = None,
+                  chunk_chars: Optional[int] = None) -> DocumentPlan:
+    """Split text and pick its language ('tr', 'en', or None/'auto' to detect)"""
+    spans = split_document(text, chunk_chars or CHUNK_CHARS)
+    chunks = [text[start:end] for start, end in spans]
+    confidence = None
+    if language is None or language == 'auto':
+        timer = metrics.StageTimer('auto')
+        language, confidence = detect_document(text, chunks[0])
+        timer.lap('language_detection')
+        timer.flush()
+    return DocumentPlan(spans, chunks, language, confidence)
+
+
+def mergeable(language: str) -> bool:
+    """Whether the language's scores can be merged from chunk counts
+
+    The text2emotion English engine scores whole strings only.
+    """
+    import Text2Emotion
+
+    return language == 'tr' or Text2Emotion.ENGLISH_ENGINE == 'fast'
+
+
+def score_chunks(language: str, chunks: Sequence[str],
+                 phrases: Optional[Sequence[str]] = None) -> List[ChunkCounts]:
+    """Counts for each chunk; runs in pool workers (module level, picklable)
+
+    phrases: the English negation phrases to rewrite, by default each
+    chunk's own.
+    """
+    import Text2Emotion
+
+    # Read before the analyzer, like analysis_executor.analyze_texts
+    version = Text2Emotion.result_version()
+    scored = []
+    if language == 'tr':
+        analyzer = Text2Emotion.get_turkish_analyzer()
+        for chunk in chunks:
+            tokens = analyzer.tokenize(chunk)
+            scored.append(ChunkCounts(analyzer.lexicon_index.count(tokens), len(tokens), ' '.join(tokens),
+                                      version=version))
+    else:
+        engine = Text2Emotion.get_english_engine()
+        for chunk in chunks:
+            counts, negations = engine.count_negations(chunk, phrases)
+            scored.append(ChunkCounts(counts, None, None, negations, version))
+    return scored
+
+
+def document_negations(scored: Sequence[ChunkCounts]) -> List[str]:
+    """Negation phrases rewritten in any chunk, in order of first occurrence
+
+    The same as in the whole text: a phrase never spans two chunks.
+    """
+    phrases = []
+    for chunk in scored:
+        for phrase in chunk.negations or ():
+            if phrase not in phrases:
+                phrases.append(phrase)
+    return phrases
+
+
+def _scores(language: str, counts: List[float], words: int) -> Dict[str, float]:
+    import Text2Emotion
+
+    if language == 'tr':
+        return Text2Emotion.get_turkish_analyzer()._normalize(counts, words)
+    return Text2Emotion.get_english_engine().normalize(counts)
+
+
+def merge_chunks(text: str, plan: DocumentPlan, scored: Sequence[ChunkCounts],
+                 timeline: bool = False) -> Dict:
+    """The analyze_batch result for text from its chunks' counts
+
+    Adds 'chunks' (the chunk count), 'result_version' (the chunks'
+    version, None if a lexicon reload came between them) and, with
+    timeline=True, 'timeline': one entry per chunk with its span, scores
+    and dominant emotion.
+    """
+    language = plan.language
+    counts = [sum(values) for values in zip(*(chunk.counts for chunk in scored))]
+    words = sum(chunk.words or 0 for chunk in scored)
+    emotions = _scores(language, counts, words)
+    dominant_emotion = max(emotions, key=emotions.get)
+    result = {
+        'emotions': emotions,
+        'dominant_emotion': dominant_emotion,
+        'dominant_score': emotions[dominant_emotion],
+        'original_text': text,
+    }
+    if language == 'tr':
+        result['processed_text'] = ' '.join(chunk.processed_text for chunk in scored if chunk.processed_text)
+    result['detected_language'] = language
+    result['language_confidence'] = plan.confidence
+    result['chunks'] = len(scored)
+    versions = {chunk.version for chunk in scored}
+    result['result_version'] = versions.pop() if len(versions) == 1 else None
+    metrics.TEXTS.inc(language)
+
+    if timeline:
+        result['timeline'] = []
+        for (start, end), chunk in zip(plan.spans, scored):
+            chunk_emotions = _scores(language, chunk.counts, chunk.words or 0)
+            chunk_dominant = max(chunk_emotions, key=chunk_emotions.get)
+            result['timeline'].append({
+                'start': start,
+                'end': end,
+                'emotions': chunk_emotions,
+                'dominant_emotion': chunk_dominant,
+                'dominant_score': chunk_emotions[chunk_dominant],
+            })
+    return result
+
+
+def analyze_whole(text: str, language: str) -> Dict:
+    """analyze_batch for one text, with its 'result_version'; runs in pool workers"""
+    import Text2Emotion
+
+    version = Text2Emotion.result_version()
+    result = Text2Emotion.analyze_batch([text], language=language)[0]
+    result['result_version'] = version
+    return result
+
+
+def run_here(fn: Callable, jobs: Sequence[tuple]) -> List[Any]:
+    """Runner that calls fn for every job in this process"""
+    return [fn(*args) for args in jobs]
+
+
+def groups(items: Sequence, count: int) -> List[Sequence]:
+    """items cut into at most count contiguous, near-equal slices"""
+    count = max(min(count, len(items)), 1)
+    size, extra = divmod(len(items), count)
+    slices = []
+    start = 0
+    for i in range(count):
+        end = start + size + (i < extra)
+        slices.append(items[start:end])
+        start = end
+    return slices
+
+
+def get_executor(workers: int) -> AnalysisExecutor:
+    """Shared executor whose process pool scores chunks, rebuilt if a different size is asked for"""
+    global _executor
+    if _executor is None or _executor.process_workers != workers:
+        shutdown()
+        _executor = AnalysisExecutor(thread_workers=1, process_workers=workers, long_text_chars=0)
+    return _executor
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def analyze_document(text: str, language: Optional[str] = None, timeline: bool = False,
+                     workers: Optional[int] = None, chunk_chars: Optional[int] = None,
+                     run: Optional[Runner] = None) -> Dict:
+    """Analyze one long text, scoring its chunks in parallel
+
+    Returns the analyze_batch result for the text (see merge_chunks for
+    the added keys). Chunks are scored in at most workers groups through
+    run; a text that is not mergeable() goes to analyze_batch whole,
+    also through run. The API passes its AnalysisExecutor.run_many, so
+    documents share the server's process pool. Without run, texts shorter
+    than LONG_DOCUMENT_CHARS, or workers=1, are scored in this process and
+    longer ones in a shared pool of workers processes.
+    """
+    workers = WORKERS if workers is None else workers
+    plan = plan_document(text, language, chunk_chars)
+    if run is None:
+        if workers <= 1 or len(text) < LONG_DOCUMENT_CHARS or len(plan.chunks) == 1:
+            run = run_here
+        else:
+            run = get_executor(workers).run_many
+    if not mergeable(plan.language):
+        result = run(analyze_whole, [(text, plan.language)])[0]
+        result['language_confidence'] = plan.confidence
+        return result
+
+    timer = metrics.StageTimer(plan.language)
+    jobs = [(plan.language, group) for group in groups(plan.chunks, workers)]
+    scored = [chunk for group in run(score_chunks, jobs) for chunk in group]
+    phrases = document_negations(scored)
+    stale = [i for i, chunk in enumerate(scored) if chunk.negations is not None and chunk.negations != phrases]
+    if stale:
+        jobs = [(plan.language, group, phrases) for group in groups([plan.chunks[i] for i in stale], workers)]
+        for i, chunk in zip(stale, (chunk for group in run(score_chunks, jobs) for chunk in group)):
+            scored[i] = chunk
+    timer.lap('scoring')
+    timer.flush()
+    return merge_chunks(text, plan, scored, timeline)
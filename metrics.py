@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Prometheus metin biçiminde süreç içi metrikler
+
+Harici bağımlılık olmadan sayaçlar, histogramlar ve okuma anında
+hesaplanan göstergeler (gauge) tutulur; render() /metrics uç noktasının
+döndürdüğü metni üretir. Süreler time.perf_counter() (monoton saat) ile
+ölçülür, her gözlem tek bir kilit altında birkaç toplama işlemidir.
+
+Aşama süreleri (batch_stage_duration_seconds) analyze_batch çağrısı
+başına, dil ve aşama için bir kez gözlemlenir: değer metin başına gecikme
+değil, o çağrıdaki tüm metinlerin aşamada geçirdiği toplam süredir. Process havuzundaki işçiler kendi kayıtlarını
+drain() ile boşaltıp sonuçla birlikte döndürür, ana süreç merge() eder.
+"""
+
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Varsayılan histogram sınırları (saniye): 50 µs - 10 s
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Yalnızca artan sayaç"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def total(self) -> float:
+        """Tüm etiket değerlerinin toplamı"""
+        with self._lock:
+            return sum(self._values.values())
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+    def export(self) -> Dict:
+        with self._lock:
+            return {labels: value for labels, value in self._values.items()}
+
+    def merge(self, exported: Dict) -> None:
+        with self._lock:
+            for labels, value in exported.items():
+                self._values[labels] = self._values.get(labels, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """Kümülatif kovalı histogram (Prometheus 'le' etiketi)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Etiketler -> [kova sayıları..., +Inf sayısı, toplam]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[index] += 1
+            row[-1] += value
+
+    def count(self, *labels: str) -> int:
+        row = self._values.get(labels)
+        return sum(row[:-1]) if row else 0
+
+    def sum(self, *labels: str) -> float:
+        row = self._values.get(labels)
+        return row[-1] if row else 0.0
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            rows = sorted((labels, list(row)) for labels, row in self._values.items())
+        for labels, row in rows:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), row):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(row[-1])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+    def export(self) -> Dict:
+        with self._lock:
+            return {labels: list(row) for labels, row in self._values.items()}
+
+    def merge(self, exported: Dict) -> None:
+        with self._lock:
+            for labels, row in exported.items():
+                current = self._values.get(labels)
+                if current is None:
+                    self._values[labels] = list(row)
+                else:
+                    for i, value in enumerate(row):
+                        current[i] += value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge:
+    """Değeri okuma anında bir fonksiyondan alınan gösterge"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, function: Optional[Callable[[], Optional[float]]] = None):
+        self.name = name
+        self.documentation = documentation
+        self.function = function
+
+    def set_function(self, function: Optional[Callable[[], Optional[float]]]) -> None:
+        self.function = function
+
+    def samples(self) -> Iterable[str]:
+        value = self.function() if self.function is not None else None
+        if value is not None:
+            yield f"{self.name} {_number(value)}"
+
+
+class Registry:
+    """Metriklerin kaydı ve metin biçiminde dökümü"""
+
+    def __init__(self):
+        self.metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            samples = list(metric.samples())
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def drain(self) -> Dict[str, Dict]:
+        """Sayaç ve histogramları dışa aktar ve sıfırla (process işçileri için)"""
+        exported = {}
+        for name, metric in self.metrics.items():
+            if hasattr(metric, "export"):
+                exported[name] = metric.export()
+                metric.reset()
+        return exported
+
+    def merge(self, exported: Dict[str, Dict]) -> None:
+        for name, values in exported.items():
+            metric = self.metrics.get(name)
+            if metric is not None:
+                metric.merge(values)
+
+
+REGISTRY = Registry()
+
+BATCH_STAGE_SECONDS = REGISTRY.register(Histogram(
+    "text2emotion_batch_stage_duration_seconds",
+    "Analiz aşamalarının analyze_batch çağrısı başına (çağrıdaki tüm metinler için) toplam süresi",
+    ("stage", "language")))
+TEXTS = REGISTRY.register(Counter(
+    "text2emotion_texts_total", "Analiz edilen metin sayısı", ("language",)))
+ANALYSIS_ERRORS = REGISTRY.register(Counter(
+    "text2emotion_analysis_errors_total", "Hata veren metin sayısı", ("language",)))
+REQUESTS = REGISTRY.register(Counter(
+    "text2emotion_requests_total", "API istek sayısı", ("endpoint", "status")))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "text2emotion_request_duration_seconds", "API istek süresi", ("endpoint",)))
+COALESCED_BATCH_SIZE = REGISTRY.register(Histogram(
+    "text2emotion_coalesced_batch_size", "Birleştirilen /analyze gruplarının metin sayısı",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)))
+REJECTED = REGISTRY.register(Counter(
+    "text2emotion_executor_rejected_total", "Kuyruk dolu olduğu için reddedilen iş sayısı"))
+EXECUTOR_PENDING = REGISTRY.register(Gauge(
+    "text2emotion_executor_pending", "Yürütücüde bekleyen veya çalışan iş sayısı"))
+CACHE_HITS = REGISTRY.register(Counter(
+    "text2emotion_cache_hits_total", "Sonuç önbelleği isabet sayısı"))
+CACHE_MISSES = REGISTRY.register(Counter(
+    "text2emotion_cache_misses_total", "Sonuç önbelleği ıska sayısı"))
+CACHE_HIT_RATIO = REGISTRY.register(Gauge(
+    "text2emotion_cache_hit_ratio", "Sonuç önbelleği isabet oranı"))
+DEDUPLICATED = REGISTRY.register(Counter(
+    "text2emotion_deduplicated_texts_total",
+    "Normalize hali daha önce skorlanmış olduğu için yeniden skorlanmayan metin sayısı",
+    ("language", "source")))
+PARTIAL_RESULTS = REGISTRY.register(Counter(
+    "text2emotion_partial_results_total", "Süre dolduğu için kısmi skorlanan metin sayısı",
+    ("language",)))
+STREAM_CONNECTIONS = REGISTRY.register(Gauge(
+    "text2emotion_stream_connections", "Açık /ws/stream bağlantısı sayısı"))
+
+
+class StageTimer:
+    """Bir dil grubundaki metinlerin aşama sürelerini toplar, flush() ile bir kez gözlemler
+
+        timer.start()
+        tokens = tokenize(text); timer.lap('cleaning')
+        scores = score(tokens); timer.lap('scoring')
+    """
+
+    __slots__ = ("language", "totals", "_last")
+
+    def __init__(self, language: str):
+        self.language = language
+        self.totals: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def start(self) -> None:
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.totals[stage] = self.totals.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def flush(self) -> None:
+        for stage, seconds in self.totals.items():
+            BATCH_STAGE_SECONDS.observe(seconds, stage, self.language)
+        self.totals.clear()
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+def drain() -> Dict[str, Dict]:
+    return REGISTRY.drain()
+
+
+def merge(exported: Dict[str, Dict]) -> None:
+    REGISTRY.merge(exported)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tekil istekleri kısa bir zaman penceresinde toplayıp toplu analiz eden birleştirici
+
+Çok sayıda istemci aynı anda /analyze çağırdığında her metin ayrı bir
+yürütücü işi olur. MicroBatcher ilk metin geldiğinde bir pencere açar;
+pencere dolana (window) ya da max_items metin birikene kadar gelenler
+bekletilir, sonra hepsi tek bir toplu çağrıyla analiz edilir ve her
+istek kendi sonucunu alır. Gecikme maliyeti en fazla window kadardır.
+
+Toplu çağrı hata fırlatırsa (ör. yürütücü dolu) hata o gruptaki tüm
+isteklere iletilir; metin başına hatalar (return_exceptions) yalnızca
+ilgili isteğe döner. Toplu görev iptal edilirse gruptaki istekler de
+iptal edilir.
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+import metrics
+
+# dispatch(metinler, diller, süre sınırları) -> metin başına sonuçlar
+Dispatch = Callable[[List[str], List[Optional[str]], List[Optional[float]]], Awaitable[List[Any]]]
+
+
+class MicroBatcher:
+    """Pencere içinde gelen submit() çağrılarını tek dispatch çağrısında birleştirir"""
+
+    def __init__(self, dispatch: Dispatch, window: float = 0.002, max_items: int = 64):
+        self.dispatch = dispatch
+        self.window = window
+        self.max_items = max(max_items, 1)
+        self._items: List[Tuple[str, Optional[str], Optional[float], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    @classmethod
+    def from_env(cls, dispatch: Dispatch) -> Optional["MicroBatcher"]:
+        """Ayarları ortam değişkenlerinden oku; pencere 0 ise birleştirme kapalıdır (None)"""
+        window_ms = float(os.environ.get("TEXT2EMOTION_COALESCE_WINDOW_MS", "2"))
+        if window_ms <= 0:
+            return None
+        return cls(dispatch, window=window_ms / 1000,
+                   max_items=int(os.environ.get("TEXT2EMOTION_COALESCE_MAX_ITEMS", "64")))
+
+    async def submit(self, text: str, language: Optional[str], deadline: Optional[float] = None) -> Any:
+        """Metni sıradaki gruba ekle ve sonucunu bekle
+
+        deadline mutlak bir an olduğundan pencerede beklenen süre de bütçeden düşer.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._items.append((text, language, deadline, future))
+        if len(self._items) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Biriken grubu gönder"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        items, self._items = self._items, []
+        if items:
+            task = asyncio.ensure_future(self._dispatch(items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, items: List[Tuple[str, Optional[str], Optional[float], asyncio.Future]]) -> None:
+        metrics.COALESCED_BATCH_SIZE.observe(len(items))
+        texts, languages, deadlines, futures = zip(*items)
+        try:
+            results = await self.dispatch(list(texts), list(languages), list(deadlines))
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # Toplu görev iptal edildi (ör. kapanış): gruptaki istekler asılı kalmaz
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+            raise
+        # İptal edilmiş (bağlantısı kopmuş) isteklerin sonucu atılır
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
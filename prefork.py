@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Ön-çatallamalı (pre-fork) çok işçili sunucu modu
+
+Ana süreç dinleme soketini açar, NLTK verilerini, text2emotion sözlüğünü
+ve TurkishEmotionAnalyzer örneğini yükler, ardından işçileri fork eder.
+İşçiler yüklenmiş bellek sayfalarını copy-on-write olarak paylaşır ve
+aynı soketten bağlantı kabul eder. Ölen işçiler yeniden başlatılır;
+başlar başlamaz çöken işçiler (ör. import hatası) giderek artan
+aralıklarla denenir ve MAX_QUICK_EXITS denemeden sonra bırakılır.
+Bekleme sırasında denetim döngüsü uyumaz: diğer işçileri toplamaya ve
+sinyallere yanıt vermeye devam eder.
+"""
+
+import gc
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional
+
+import uvicorn
+
+from logger import logger, stop_logging
+
+# Yeniden başlatmadan önceki bekleme (sn); art arda hızlı çöküşlerde ikiye katlanır
+RESTART_DELAY = 1.0
+MAX_RESTART_DELAY = 60.0
+# Bu süreden kısa yaşayan işçi hızlı çökmüş sayılır (sn)
+QUICK_EXIT_SECONDS = 10.0
+# Art arda bu kadar hızlı çöken işçi yuvası bir daha başlatılmaz
+MAX_QUICK_EXITS = 5
+
+
+def preload_models():
+    """Ağır modelleri çatallamadan önce ana süreçte yükle"""
+    import Text2Emotion
+
+    try:
+        # Türkçe analizör, stopwords, tokenizer ve İngilizce motor (WordNet dahil)
+        Text2Emotion.warmup()
+    except LookupError as e:
+        logger.warning(f"İngilizce kaynaklar yüklenemedi: {e}")
+
+    if Text2Emotion.ENGLISH_ENGINE != 'fast':
+        # text2emotion sözlüğü modülün kod nesnesiyle birlikte yüklenir
+        import text2emotion  # noqa: F401
+
+
+def create_socket(host: str, port: int) -> socket.socket:
+    """İşçilerin paylaşacağı dinleme soketini oluştur"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock: socket.socket, log_level: str):
+    """Çatallanmış işçide uvicorn sunucusunu çalıştır"""
+    # Ana sürecin sinyal işleyicilerini sıfırla, uvicorn kendi işleyicilerini kurar
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    config = uvicorn.Config(app, log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(app, host: str = "0.0.0.0", port: int = 8000, workers: int = 2,
+          log_level: str = "info", sock: Optional[socket.socket] = None):
+    """Modelleri yükle, işçileri fork et ve denetle
+
+    sock verilirse host ve port yerine bu dinleme soketi kullanılır.
+    Tüm işçi yuvaları bırakıldığında çıkış kodu 1'dir.
+    """
+    if not hasattr(os, "fork"):
+        logger.warning("Bu platform fork desteklemiyor, tek işçi ile çalışılıyor")
+        uvicorn.run(app, host=host, port=port, log_level=log_level)
+        return
+
+    if sock is None:
+        sock = create_socket(host, port)
+
+    start_time = time.monotonic()
+    preload_models()
+    # Yüklenen nesneleri GC taramasından çıkar, sayfalar kopyalanmasın
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Modeller {time.monotonic() - start_time:.2f} saniyede yüklendi, "
+                f"{workers} işçi başlatılıyor")
+
+    children: Dict[int, int] = {}
+    started: Dict[int, float] = {}
+    quick_exits: Dict[int, int] = {}
+    # Yeniden başlatılmayı bekleyen yuvalar: yuva -> başlatma anı (monotonic)
+    restart_at: Dict[int, float] = {}
+    stopping = False
+
+    # Sinyaller (SIGCHLD, SIGTERM) bu boruya bir bayt yazar; döngü beklerken
+    # uyumaz, boruyu bir sonraki yeniden başlatma anına kadar dinler
+    wakeup_read, wakeup_write = os.pipe()
+    os.set_blocking(wakeup_read, False)
+    os.set_blocking(wakeup_write, False)
+    previous_wakeup_fd = signal.set_wakeup_fd(wakeup_write)
+
+    def spawn(slot: int):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.set_wakeup_fd(-1)
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                os.close(wakeup_read)
+                os.close(wakeup_write)
+                _run_worker(app, sock, log_level)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except BaseException:
+                code = 1
+                logger.exception(f"İşçi {os.getpid()} hata ile sonlandı")
+            finally:
+                # Kuyruktaki log kayıtları süreç bitmeden yazılır
+                stop_logging()
+                os._exit(code)
+        children[pid] = slot
+        started[slot] = time.monotonic()
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def reap():
+        """Sonlanan işçileri topla, beklenmedik çıkışlarda yeniden başlatmayı zamanla"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            slot = children.pop(pid, None)
+            if slot is None or stopping:
+                continue
+            if time.monotonic() - started[slot] < QUICK_EXIT_SECONDS:
+                quick_exits[slot] = quick_exits.get(slot, 0) + 1
+            else:
+                quick_exits[slot] = 0
+            code = os.waitstatus_to_exitcode(status)
+            if quick_exits[slot] >= MAX_QUICK_EXITS:
+                logger.error(f"İşçi {pid} (çıkış kodu {code}) art arda {quick_exits[slot]} kez "
+                             f"başlar başlamaz sonlandı, yeniden başlatılmıyor")
+                continue
+            delay = min(RESTART_DELAY * 2 ** quick_exits[slot], MAX_RESTART_DELAY)
+            logger.warning(f"İşçi {pid} beklenmedik şekilde sonlandı (çıkış kodu {code}), "
+                           f"{delay:g} saniye sonra yeniden başlatılıyor")
+            restart_at[slot] = time.monotonic() + delay
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    # İşleyici yalnızca uyandırma baytı için kurulur
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+
+    for slot in range(workers):
+        spawn(slot)
+
+    try:
+        while True:
+            reap()
+            if stopping:
+                restart_at.clear()
+            now = time.monotonic()
+            for slot in [slot for slot, due in restart_at.items() if due <= now]:
+                del restart_at[slot]
+                spawn(slot)
+            if not children and not restart_at:
+                break
+            timeout = max(min(restart_at.values()) - now, 0) if restart_at else None
+            select.select([wakeup_read], [], [], timeout)
+            try:
+                while os.read(wakeup_read, 512):
+                    pass
+            except BlockingIOError:
+                pass
+    finally:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.set_wakeup_fd(previous_wakeup_fd)
+        os.close(wakeup_read)
+        os.close(wakeup_write)
+
+    sock.close()
+    sys.exit(0 if stopping else 1)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Analiz sonuçları için önbellek
+
+Anahtar (dil, normalize edilmiş metin, analizör sürümü) üçlüsünden
+üretilir. Varsayılan arka uç süreç içi bir LRU'dur; SQLite arka ucu
+aynı dosyayı kullanan işçiler arasında paylaşılabilir. Her iki arka uç
+da bayt cinsinden boyut sınırı ve TTL uygular.
+"""
+
+import abc
+import hashlib
+import importlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+
+class CacheBackend(abc.ABC):
+    """Önbellek arka ucu arayüzü - değerler JSON metni olarak saklanır
+
+    blocking: get/set disk ya da ağ G/Ç'si yapıyorsa True; API bu
+    durumda çağrıları olay döngüsü dışında, bir iş parçacığında yapar.
+    """
+
+    blocking = False
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abc.abstractmethod
+    def set(self, key: str, value: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def stats(self) -> Dict[str, int]:
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Süreç içi LRU önbellek (bayt sınırlı, TTL destekli)"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: Optional[float] = 3600):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size_bytes = 0
+        self._entries: "OrderedDict[str, tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at)
+            self.size_bytes += size
+            # En eski girdileri sınır altına inene kadar çıkar
+            while self.size_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        value, _ = self._entries.pop(key)
+        self.size_bytes -= len(key) + len(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "size_bytes": self.size_bytes,
+                "max_bytes": self.max_bytes}
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """SQLite dosyası üzerinde, işçiler arasında paylaşılabilen önbellek"""
+
+    blocking = True
+    # Boyut sınırı her bu kadar yazmada bir uygulanır
+    EVICT_EVERY = 100
+
+    def __init__(self, path: str = "cache/results.sqlite3",
+                 max_bytes: int = 256 * 1024 * 1024, ttl: Optional[float] = 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._writes = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Bağlantılar fork sonrası paylaşılamaz, her süreç kendi bağlantısını açar
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False,
+                                         isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at)"
+            )
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT value, expires_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                connection.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            connection.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(key) + len(value), expires_at, now)
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self._evict(connection, now)
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        """Süresi dolanları sil, boyut sınırı aşıldıysa en eski erişilenleri çıkar"""
+        connection.execute("DELETE FROM results WHERE expires_at <= ?", (now,))
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        while total > self.max_bytes:
+            rows = connection.execute(
+                "SELECT key, size FROM results ORDER BY accessed_at LIMIT ?", (self.EVICT_EVERY,)
+            ).fetchall()
+            if not rows:
+                break
+            connection.executemany("DELETE FROM results WHERE key = ?", [(k,) for k, _ in rows])
+            total -= sum(size for _, size in rows)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM results")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+        return {"entries": entries, "size_bytes": size, "max_bytes": self.max_bytes}
+
+
+class ResultCache:
+    """Analiz sonuçlarını (dil, normalize metin, sürüm) anahtarıyla saklar"""
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Skoru değiştirmeyen farkları (büyük/küçük harf, boşluk) sil"""
+        return " ".join(text.lower().split())
+
+    @classmethod
+    def make_key(cls, language: Optional[str], text: str, version: str) -> str:
+        digest = hashlib.blake2b(cls.normalize(text).encode("utf-8"), digest_size=16).hexdigest()
+        return f"{version}:{language or 'auto'}:{digest}"
+
+    def get(self, language: Optional[str], text: str, version: str) -> Optional[Dict]:
+        value = self.backend.get(self.make_key(language, text, version))
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, language: Optional[str], text: str, version: str, result: Dict) -> None:
+        self.backend.set(self.make_key(language, text, version), json.dumps(result))
+
+    def get_many(self, texts: Sequence[str], languages: Sequence[Optional[str]],
+                 version: str) -> List[Optional[Dict]]:
+        """Birden çok metni tek çağrıda ara (bloklayan arka uçta tek iş parçacığı geçişi)"""
+        return [self.get(language, text, version) for text, language in zip(texts, languages)]
+
+    def set_many(self, entries: Sequence[tuple]) -> None:
+        """(dil, metin, sürüm, sonuç) dörtlülerini yaz"""
+        for language, text, version, result in entries:
+            self.set(language, text, version, result)
+
+    @property
+    def hit_rate(self) -> float:
+        """İsabet oranı; arka uca dokunmaz (/metrics her okumada çağırır)"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict:
+        stats = {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+        stats.update(self.backend.stats())
+        return stats
+
+    @classmethod
+    def from_env(cls) -> Optional["ResultCache"]:
+        """Önbelleği ortam değişkenlerinden kur ('none' ise None döner)
+
+        TEXT2EMOTION_CACHE: 'memory', 'sqlite', 'none' ya da özel bir arka uç
+        için 'modul:Sinif' yolu.
+        """
+        kind = os.environ.get("TEXT2EMOTION_CACHE", "memory")
+        max_bytes = int(os.environ.get("TEXT2EMOTION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+        ttl = float(os.environ.get("TEXT2EMOTION_CACHE_TTL", "3600")) or None
+
+        if kind == "none":
+            return None
+        if kind == "memory":
+            backend = MemoryCacheBackend(max_bytes=max_bytes, ttl=ttl)
+        elif kind == "sqlite":
+            path = os.environ.get("TEXT2EMOTION_CACHE_PATH", "cache/results.sqlite3")
+            backend = SQLiteCacheBackend(path=path, max_bytes=max_bytes, ttl=ttl)
+        else:
+            module_name, _, class_name = kind.partition(":")
+            backend = getattr(importlib.import_module(module_name), class_name)()
+        return cls(backend)
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+JSONL, CSV ve düz metin dosyaları için akışlı (streaming) skorlama
+
+Girdi bir dosyadan ya da stdin'den satır satır okunur, kayıtlar küçük
+toplu işler halinde analyze_batch'e verilir ve sonuçlar JSONL olarak
+hemen yazılır; bellek kullanımı dosya boyutundan bağımsızdır. Dosyaya
+yazılırken her toplu işten sonra girdi/çıktı bayt konumları
+'<çıktı>.offset' dosyasına kaydedilir, --resume ile kalınan yerden
+devam edilir. İşlem hızı stderr'e raporlanır.
+
+--workers N ile toplu işler bir process havuzuna dağıtılır; her işçi
+analizörleri bir kez kurar. Sonuçlar varsayılan olarak girdi sırasıyla
+yazılır, --unordered ile biten toplu iş beklemeden yazılır.
+
+    python stream_scoring.py mesajlar.jsonl -o sonuclar.jsonl
+    python stream_scoring.py arsiv.jsonl -o sonuclar.jsonl --workers 8
+    cat mesajlar.txt | python stream_scoring.py - --format txt --language tr
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import IO, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import metrics
+
+# Çıktıya yazılan analiz alanları
+OUTPUT_FIELDS = ("detected_language", "language_confidence", "emotions", "dominant_emotion", "dominant_score")
+
+
+class Record(NamedTuple):
+    """Girdiden okunan tek kayıt"""
+    index: int  # 0'dan başlayan kayıt sırası
+    id: Any  # Girdideki kimlik alanı (yoksa None)
+    text: Optional[str]
+    offset: int  # Kaydın bittiği bayt konumu
+    error: Optional[str] = None
+
+
+class _LineReader:
+    """Binary akıştan satırları çözerek okur ve bayt konumunu izler"""
+
+    def __init__(self, stream: IO[bytes], offset: int = 0):
+        self.stream = stream
+        self.offset = offset
+
+    def __iter__(self) -> Iterator[str]:
+        for line in self.stream:
+            start = self.offset
+            self.offset += len(line)
+            text = line.decode("utf-8", errors="replace")
+            if start == 0 and text.startswith("\ufeff"):
+                text = text[1:]
+            yield text
+
+
+def detect_format(path: str) -> str:
+    """Dosya uzantısından girdi biçimini tahmin et"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if extension in (".csv", ".tsv"):
+        return "csv"
+    return "txt"
+
+
+def read_text(stream: IO[bytes], offset: int = 0, start_index: int = 0) -> Iterator[Record]:
+    """Her boş olmayan satır bir kayıttır"""
+    lines = _LineReader(stream, offset)
+    index = start_index
+    for line in lines:
+        text = line.strip()
+        if text:
+            yield Record(index, None, text, lines.offset)
+            index += 1
+
+
+def read_jsonl(stream: IO[bytes], text_field: str = "text", id_field: str = "id",
+               offset: int = 0, start_index: int = 0) -> Iterator[Record]:
+    """Her satır bir JSON nesnesidir; metin text_field alanından okunur"""
+    lines = _LineReader(stream, offset)
+    index = start_index
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield Record(index, None, None, lines.offset, f"Geçersiz JSON: {e}")
+        else:
+            if not isinstance(item, dict):
+                yield Record(index, None, None, lines.offset, "Kayıt bir JSON nesnesi değil")
+            else:
+                text = item.get(text_field)
+                error = None if isinstance(text, str) else f"'{text_field}' alanı bulunamadı"
+                yield Record(index, item.get(id_field), text if error is None else None,
+                             lines.offset, error)
+        index += 1
+
+
+def read_csv_header(stream: IO[bytes], delimiter: str = ",") -> List[str]:
+    """CSV başlık satırını oku (akış başlığın hemen sonrasında kalır)"""
+    stream.seek(0)
+    lines = _LineReader(stream)
+    header = next(csv.reader(lines, delimiter=delimiter), [])
+    stream.seek(lines.offset)
+    return header
+
+
+def read_csv(stream: IO[bytes], text_field: str = "text", id_field: str = "id",
+             offset: int = 0, start_index: int = 0, header: Optional[List[str]] = None,
+             delimiter: str = ",") -> Iterator[Record]:
+    """Başlıklı CSV; tırnak içindeki çok satırlı alanlar desteklenir"""
+    lines = _LineReader(stream, offset)
+    rows = csv.reader(lines, delimiter=delimiter)
+    if header is None:
+        header = next(rows, [])
+
+    if text_field not in header:
+        raise ValueError(f"CSV başlığında '{text_field}' sütunu yok")
+    text_column = header.index(text_field)
+    id_column = header.index(id_field) if id_field in header else None
+
+    index = start_index
+    for row in rows:
+        if not row:
+            continue
+        record_id = row[id_column] if id_column is not None and id_column < len(row) else None
+        if text_column < len(row):
+            yield Record(index, record_id, row[text_column], lines.offset)
+        else:
+            yield Record(index, record_id, None, lines.offset, "Eksik sütun")
+        index += 1
+
+
+def batched(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    """Kayıtları en fazla size elemanlı listeler halinde grupla"""
+    iterator = iter(records)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def score_batch(records: List[Record], language: Optional[str] = None,
+                vectorized: bool = False) -> List[str]:
+    """Bir toplu işi analiz et, kayıt başına bir JSON satırı döndür"""
+    from Text2Emotion import analyze_batch
+
+    valid = [record for record in records if record.error is None and record.text.strip()]
+    analyses = analyze_batch([record.text for record in valid], language=language,
+                             return_exceptions=True, vectorized=vectorized)
+    results = {record.index: analysis for record, analysis in zip(valid, analyses)}
+
+    lines = []
+    for record in records:
+        output: Dict[str, Any] = {"index": record.index}
+        if record.id is not None:
+            output["id"] = record.id
+        analysis = results.get(record.index)
+        if record.error is not None:
+            output["error"] = record.error
+        elif analysis is None:
+            output["error"] = "Metin boş olamaz"
+        elif isinstance(analysis, Exception):
+            output["error"] = f"Analiz hatası: {analysis}"
+        else:
+            output.update((field, analysis[field]) for field in OUTPUT_FIELDS)
+        lines.append(json.dumps(output, ensure_ascii=False) + "\n")
+    return lines
+
+
+def score_batch_encoded(records: List[Record], language: Optional[str] = None,
+                        vectorized: bool = False) -> bytes:
+    """score_batch çıktısını yazılmaya hazır UTF-8 bayt olarak döndür"""
+    return "".join(score_batch(records, language, vectorized)).encode("utf-8")
+
+
+def _init_worker():
+    """Havuz işçisinde analizörleri ilk toplu işten önce bir kez kur"""
+    import Text2Emotion
+
+    try:
+        Text2Emotion.warmup()
+    except Exception:
+        # İngilizce kaynaklar eksikse hata kayıt başına raporlanır
+        pass
+
+
+def scored_batches(batches: Iterable[List[Record]], language: Optional[str] = None,
+                   vectorized: bool = False, workers: int = 1,
+                   ordered: bool = True) -> Iterator[Tuple[List[Record], bytes]]:
+    """Toplu işleri skorla, (toplu iş, çıktı baytları) çiftlerini üret
+
+    workers > 1 ise toplu işler process havuzunda çalışır; en fazla
+    workers * 4 toplu iş aynı anda bekler, böylece bellek sınırlı kalır.
+    ordered=False ise sonuçlar bitiş sırasıyla üretilir.
+    """
+    if workers <= 1:
+        for batch in batches:
+            yield batch, score_batch_encoded(batch, language, vectorized)
+        return
+
+    from analysis_executor import process_context, with_metrics
+
+    def submit(batch):
+        return pool.submit(with_metrics, score_batch_encoded, batch, language, vectorized)
+
+    def result(future):
+        # İşçinin metrikleri (ör. tekrar sayıları) ana sürece aktarılır
+        data, exported = future.result()
+        metrics.merge(exported)
+        return data
+
+    max_in_flight = workers * 4
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=process_context(),
+                               initializer=_init_worker)
+    try:
+        if ordered:
+            queue = deque()
+            for batch in batches:
+                queue.append((batch, submit(batch)))
+                if len(queue) >= max_in_flight:
+                    batch, future = queue.popleft()
+                    yield batch, result(future)
+            while queue:
+                batch, future = queue.popleft()
+                yield batch, result(future)
+        else:
+            running = {}
+            for batch in batches:
+                running[submit(batch)] = batch
+                if len(running) >= max_in_flight:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield running.pop(future), result(future)
+            for future in list(running):
+                yield running.pop(future), result(future)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class Checkpoint:
+    """Girdi/çıktı bayt konumlarını saklayan devam dosyası"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, int]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, input_offset: int, output_offset: int, records: int):
+        # Yarım yazılmış bir devam dosyası kalmasın diye önce geçici dosyaya yaz
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"input_offset": input_offset, "output_offset": output_offset,
+                       "records": records}, f)
+        os.replace(temporary, self.path)
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class Progress:
+    """İşlem hızını ve tekrar (normalize hali aynı) kayıt oranını belirli aralıklarla stderr'e yazar"""
+
+    def __init__(self, stream: Optional[IO[str]] = None, interval: float = 5.0):
+        self.stream = stream if stream is not None else sys.stderr
+        self.interval = interval
+        self.records = 0
+        self.bytes = 0
+        self.start_time = time.monotonic()
+        self._last_report = self.start_time
+        self._reported_records = -1
+        # Bu çalıştırmadan önce sayılmış tekrarlar (bkz. metrics.DEDUPLICATED)
+        self._deduplicated_start = metrics.DEDUPLICATED.total()
+
+    def update(self, records: int, size: int):
+        self.records += records
+        self.bytes += size
+        now = time.monotonic()
+        if self.interval and now - self._last_report >= self.interval:
+            self._last_report = now
+            self.report(now)
+
+    def finish(self):
+        """Son durumu (henüz raporlanmadıysa) yaz"""
+        if self._reported_records != self.records:
+            self.report()
+
+    def report(self, now: Optional[float] = None):
+        self._reported_records = self.records
+        elapsed = max((now or time.monotonic()) - self.start_time, 1e-9)
+        deduplicated = metrics.DEDUPLICATED.total() - self._deduplicated_start
+        self.stream.write(f"{self.records} kayıt, {self.records / elapsed:.0f} kayıt/sn, "
+                          f"{self.bytes / elapsed / 1e6:.2f} MB/sn, "
+                          f"{deduplicated / max(self.records, 1):.0%} tekrar\n")
+        self.stream.flush()
+
+
+def run(input_path: str = "-", output_path: Optional[str] = None, fmt: str = "auto",
+        text_field: str = "text", id_field: str = "id", language: Optional[str] = None,
+        batch_size: int = 256, resume: bool = False, vectorized: bool = False,
+        progress: Optional[Progress] = None, workers: int = 1, ordered: bool = True) -> int:
+    """Girdiyi akış halinde skorla, yazılan kayıt sayısını döndür"""
+    to_file = output_path not in (None, "-")
+    checkpoint = Checkpoint(output_path + ".offset") if to_file else None
+    if fmt == "auto":
+        fmt = detect_format(input_path) if input_path != "-" else "txt"
+
+    if resume and input_path == "-":
+        raise ValueError("stdin girdisi kaldığı yerden devam ettirilemez")
+    if resume and not to_file:
+        raise ValueError("--resume için bir çıktı dosyası gerekir")
+    if resume and not ordered:
+        raise ValueError("Sırasız çıktı kaldığı yerden devam ettirilemez")
+    state = checkpoint.load() if resume else None
+    if checkpoint is not None:
+        if not resume:
+            checkpoint.remove()
+        if not ordered:
+            # Sırasız çıktıda tek bir girdi konumu tüm yazılanları temsil etmez
+            checkpoint = None
+
+    input_offset = state["input_offset"] if state else 0
+    output_offset = state["output_offset"] if state else 0
+    records = state["records"] if state else 0
+
+    source = sys.stdin.buffer if input_path == "-" else open(input_path, "rb")
+    if to_file:
+        sink = open(output_path, "r+b" if state else "wb")
+        # Son kayıttan sonra yarım kalmış çıktıyı at
+        sink.truncate(output_offset)
+        sink.seek(output_offset)
+    else:
+        sink = sys.stdout.buffer
+
+    try:
+        if fmt == "csv":
+            delimiter = "\t" if input_path.lower().endswith(".tsv") else ","
+            header = read_csv_header(source, delimiter) if input_offset else None
+            if input_offset:
+                source.seek(input_offset)
+            reader = read_csv(source, text_field, id_field, input_offset, records, header, delimiter)
+        else:
+            if input_offset:
+                source.seek(input_offset)
+            if fmt == "jsonl":
+                reader = read_jsonl(source, text_field, id_field, input_offset, records)
+            else:
+                reader = read_text(source, input_offset, records)
+
+        for batch, data in scored_batches(batched(reader, batch_size), language, vectorized,
+                                          workers, ordered):
+            sink.write(data)
+            sink.flush()
+            output_offset += len(data)
+            records += len(batch)
+            if checkpoint is not None:
+                checkpoint.save(batch[-1].offset, output_offset, records)
+            if progress is not None:
+                progress.update(len(batch), max(batch[-1].offset - input_offset, 0))
+            input_offset = max(input_offset, batch[-1].offset)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if sink is not sys.stdout.buffer:
+            sink.close()
+
+    if progress is not None:
+        progress.finish()
+    return records
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Text2Emotion akışlı dosya skorlama")
+    parser.add_argument("input", nargs="?", default="-", help="Girdi dosyası ('-' ise stdin)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL çıktı dosyası ('-' ise stdout)")
+    parser.add_argument("--format", default="auto", choices=["auto", "jsonl", "csv", "txt"])
+    parser.add_argument("--text-field", default="text", help="Metin alanı/sütunu")
+    parser.add_argument("--id-field", default="id", help="Kimlik alanı/sütunu")
+    parser.add_argument("--language", default=None, choices=["auto", "tr", "en"])
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--vectorized", action="store_true", help="NumPy ile toplu skorlama")
+    parser.add_argument("--resume", action="store_true",
+                        help="'<çıktı>.offset' dosyasındaki konumdan devam et")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Process havuzu işçi sayısı (1 ise tek süreç)")
+    parser.add_argument("--unordered", action="store_true",
+                        help="Sonuçları girdi sırasını beklemeden yaz (--resume ile kullanılamaz)")
+    parser.add_argument("--progress-interval", type=float, default=5.0,
+                        help="Hız raporu aralığı (saniye, 0 ise kapalı)")
+    args = parser.parse_args(argv)
+
+    progress = Progress(interval=args.progress_interval) if args.progress_interval > 0 else None
+    try:
+        run(args.input, args.output, args.format, args.text_field, args.id_field,
+            args.language, args.batch_size, args.resume, args.vectorized, progress,
+            args.workers, not args.unordered)
+    except (OSError, ValueError) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+API server tests for Text2Emotion
+"""
+
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import HTTPException
+
+import api_server
+import metrics
+from api_server import BatchTextRequest, TextRequest
+from analysis_executor import AnalysisExecutor, ExecutorSaturated, analyze_texts
+
+
+class TestBatchEndpoint(unittest.TestCase):
+    """Test cases for POST /analyze/batch"""
+    
+    def run_batch(self, items):
+        request = BatchTextRequest(items=[TextRequest(**item) for item in items])
+        return asyncio.run(api_server.analyze_emotion_batch(request))
+    
+    def test_batch_results_in_order(self):
+        """Each item gets its own language and result, in input order"""
+        response = self.run_batch([
+            {"text": "Bugün çok mutluyum!"},
+            {"text": "   "},
+            {"text": "Çok üzgünüm", "language": "tr"},
+        ])
+        
+        self.assertEqual([r.index for r in response.results], [0, 1, 2])
+        self.assertEqual(response.results[0].result.detected_language, "tr")
+        self.assertEqual(response.results[0].result.dominant_emotion, "Happy")
+        self.assertIsNone(response.results[1].result)
+        self.assertEqual(response.results[1].error, "Metin boş olamaz")
+        self.assertEqual(response.results[2].result.text, "Çok üzgünüm")
+    
+    @patch('Text2Emotion.get_english_engine', side_effect=LookupError("stopwords"))
+    def test_per_item_errors(self, mock_get_engine):
+        """A failing item does not fail the whole batch"""
+        response = self.run_batch([
+            {"text": "I am happy", "language": "en"},
+            {"text": "Bugün çok mutluyum!"},
+        ])
+        
+        self.assertIn("Analiz hatası", response.results[0].error)
+        self.assertIsNotNone(response.results[1].result)
+    
+    def test_limits(self):
+        """Item count and total size are bounded"""
+        with patch.object(api_server, 'MAX_BATCH_ITEMS', 2):
+            with self.assertRaises(HTTPException) as ctx:
+                self.run_batch([{"text": "bir"}] * 3)
+            self.assertEqual(ctx.exception.status_code, 413)
+        
+        with patch.object(api_server, 'MAX_BATCH_BYTES', 10):
+            with self.assertRaises(HTTPException) as ctx:
+                self.run_batch([{"text": "çok güzel bir gün"}])
+            self.assertEqual(ctx.exception.status_code, 413)
+
+
+    def test_body_limit_before_parsing(self):
+        """Oversized bodies get 413 before the body is read or validated"""
+        body = json.dumps({"items": [{"text": "çok güzel bir gün"}] * 20}).encode()
+        with patch.object(api_server, 'MAX_BATCH_BODY_BYTES', 100):
+            # Content-Length given: nothing is read
+            status, reads = asyncio.run(post_batch([body], len(body)))
+            self.assertEqual((status, reads), (413, 0))
+            # Chunked: reading stops at the chunk that crosses the limit
+            chunks = [body[i:i + 64] for i in range(0, len(body), 64)]
+            status, reads = asyncio.run(post_batch(chunks))
+            self.assertEqual((status, reads), (413, 2))
+
+        status, _ = asyncio.run(post_batch([body], len(body)))
+        self.assertEqual(status, 200)
+
+
+async def post_batch(chunks, content_length=None):
+    """POST the body chunks to /analyze/batch over ASGI, return (status, chunks read)"""
+    headers = [(b"content-type", b"application/json")]
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode()))
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+             "scheme": "http", "path": "/analyze/batch", "raw_path": b"/analyze/batch",
+             "query_string": b"", "root_path": "", "headers": headers,
+             "client": ("127.0.0.1", 0), "server": ("test", 80)}
+    reads = 0
+    status = None
+
+    async def receive():
+        nonlocal reads
+        if reads == len(chunks):
+            return {"type": "http.disconnect"}
+        reads += 1
+        return {"type": "http.request", "body": chunks[reads - 1], "more_body": reads < len(chunks)}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await api_server.app(scope, receive, send)
+    return status, reads
+
+
+class TestAnalysisExecutor(unittest.TestCase):
+    """Test cases for running analysis off the event loop"""
+    
+    def test_analyze_endpoint(self):
+        """Single text analysis runs through the executor"""
+        response = asyncio.run(api_server.analyze_emotion(TextRequest(text="Bugün çok mutluyum!")))
+        self.assertEqual(response.detected_language, "tr")
+        self.assertEqual(response.dominant_emotion, "Happy")
+    
+    def test_saturated_returns_503(self):
+        """A full queue is reported as 503 with Retry-After"""
+        with patch.object(api_server.executor, 'pending', api_server.executor.max_pending), \
+                patch.object(api_server, 'cache', None):
+            with self.assertRaises(HTTPException) as ctx:
+                asyncio.run(api_server.analyze_emotion(TextRequest(text="Bugün çok mutluyum!")))
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertEqual(ctx.exception.headers["Retry-After"], str(api_server.executor.retry_after))
+    
+    def test_pool_selection(self):
+        """Long texts go to the process pool, short ones to threads"""
+        executor = AnalysisExecutor(thread_workers=1, process_workers=1,
+                                    long_text_chars=50, max_pending=1)
+        try:
+            short = asyncio.run(executor.run(analyze_texts, ["Korkuyorum"], ["tr"], size=10))
+            self.assertEqual(short[0]['dominant_emotion'], 'Fear')
+            self.assertIsNone(executor._processes)
+            
+            long_text = "Bugün çok mutluyum! " * 10
+            result = asyncio.run(executor.run(analyze_texts, [long_text], ["tr"], size=len(long_text)))
+            self.assertEqual(result[0]['dominant_emotion'], 'Happy')
+            self.assertIsNotNone(executor._processes)
+            self.assertEqual(executor.pending, 0)
+            
+            executor.pending = 1
+            with self.assertRaises(ExecutorSaturated):
+                asyncio.run(executor.run(analyze_texts, ["a"], ["tr"]))
+        finally:
+            executor.shutdown()
+
+    def test_short_batch_stays_on_threads(self):
+        """A group of many short texts is not sent to the process pool, long ones are"""
+        executor = AnalysisExecutor(thread_workers=1, process_workers=1, long_text_chars=50)
+        texts = ["Korkuyorum"] * 64
+        try:
+            with patch.object(api_server, 'executor', executor):
+                results = asyncio.run(api_server.execute_analysis(texts, ["tr"] * 64))
+                self.assertEqual(len(results), 64)
+                self.assertIsNone(executor._processes)
+
+                long_text = "Bugün çok mutluyum! " * 10
+                results = asyncio.run(api_server.execute_analysis(
+                    ["Korkuyorum", long_text, "Kederliyim"], ["tr"] * 3))
+                self.assertIsNotNone(executor._processes)
+        finally:
+            executor.shutdown()
+        self.assertEqual([result['dominant_emotion'] for result in results], ['Fear', 'Happy', 'Sad'])
+
+    def test_run_many(self):
+        """Fanned out jobs run in the process pool, in order, with their metrics"""
+        executor = AnalysisExecutor(thread_workers=1, process_workers=2)
+        before = metrics.TEXTS.value('tr')
+        try:
+            results = executor.run_many(analyze_texts, [(["Korkuyorum"], ["tr"]), (["Mutluyum"], ["tr"])])
+            self.assertIsNotNone(executor._processes)
+        finally:
+            executor.shutdown()
+        self.assertEqual([result[0]['dominant_emotion'] for result in results], ['Fear', 'Happy'])
+        self.assertEqual(metrics.TEXTS.value('tr'), before + 2)
+
+        # Without a process pool the jobs run in the calling thread
+        executor = AnalysisExecutor(thread_workers=1, process_workers=0)
+        self.assertEqual(executor.run_many(len, [("ab",), ("abc",)]), [2, 3])
+        executor.shutdown()
+
+
+async def stream_session(messages, query=b"", events=None, leave=None):
+    """Drive /ws/stream over ASGI like a client, return the replies
+
+    The client sends messages (str or bytes frames) and disconnects once
+    every message is answered, or once the leave event is set. Like
+    uvicorn, sending after the disconnect raises.
+    """
+    inbox = [{"type": "websocket.connect"}]
+    inbox += [{"type": "websocket.receive", "bytes" if isinstance(message, bytes) else "text": message}
+              for message in messages]
+    inbox.append({"type": "websocket.disconnect", "code": 1000})
+    inbox.reverse()
+    scope = {"type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "path": "/ws/stream",
+             "raw_path": b"/ws/stream", "query_string": query, "root_path": "", "headers": [],
+             "client": ("127.0.0.1", 0), "server": ("test", 80), "subprotocols": []}
+    replies = []
+    answered = asyncio.Event()
+    closed = False
+    if not messages:
+        answered.set()
+
+    async def receive():
+        nonlocal closed
+        if events is not None:
+            events.append(len(inbox))
+        message = inbox.pop()
+        if message["type"] == "websocket.disconnect":
+            await (leave or answered).wait()
+            closed = True
+        return message
+
+    async def send(message):
+        if closed:
+            raise RuntimeError(f"Unexpected ASGI message '{message['type']}', after sending "
+                               "'websocket.close' or response already completed.")
+        if message["type"] == "websocket.send":
+            replies.append(json.loads(message["text"]))
+            if len(replies) == len(messages):
+                answered.set()
+
+    await api_server.app(scope, receive, send)
+    return replies
+
+
+class TestStreamEndpoint(unittest.TestCase):
+    """Test cases for the /ws/stream WebSocket endpoint"""
+
+    def test_per_message_scores_and_aggregate(self):
+        """Every message gets a reply in order, with a rolling aggregate"""
+        replies = asyncio.run(stream_session([
+            "Bugün çok mutluyum!",
+            json.dumps({"text": "Çok korkuyorum", "language": "tr", "id": "m2"}),
+            "   ",
+            "{bozuk",
+        ], query=b"window=1"))
+
+        self.assertEqual([r["index"] for r in replies], [0, 1, 2, 3])
+        self.assertEqual(replies[0]["result"]["dominant_emotion"], "Happy")
+        self.assertEqual((replies[1]["id"], replies[1]["result"]["dominant_emotion"]), ("m2", "Fear"))
+        self.assertEqual(replies[2]["error"], "Metin boş olamaz")
+        self.assertEqual(replies[3]["error"], "Geçersiz JSON")
+
+        # window=1: the aggregate only holds the latest scored message
+        aggregate = replies[-1]["aggregate"]
+        self.assertEqual((aggregate["messages"], aggregate["window"]), (2, 1))
+        self.assertEqual(aggregate["dominant_emotion"], "Fear")
+        self.assertEqual(aggregate["dominant_counts"], {"Fear": 1})
+        self.assertEqual(api_server.stream_connections, 0)
+
+    def test_disconnect_drops_pending(self):
+        """Messages still queued when the client leaves are not answered, and nothing is sent"""
+        calls = []
+
+        async def analysis(texts, languages):
+            calls.append(texts)
+            return [{"emotions": {"Happy": 1.0}, "dominant_emotion": "Happy"} for _ in texts]
+
+        async def scenario():
+            leave = asyncio.Event()
+            leave.set()
+            return await stream_session(["mutlu"] * 5, leave=leave)
+
+        with patch.object(api_server, 'analyze_cached', side_effect=analysis):
+            replies = asyncio.run(scenario())
+        self.assertEqual((replies, calls), ([], []))
+        self.assertEqual(api_server.stream_connections, 0)
+
+    def test_disconnect_during_analysis(self):
+        """A client that leaves while its batch is analysed gets no send"""
+        leave = None
+
+        async def slow_analysis(texts, languages):
+            leave.set()
+            # The disconnect is read meanwhile
+            await asyncio.sleep(0.01)
+            return [{"emotions": {"Sad": 1.0}, "dominant_emotion": "Sad"} for _ in texts]
+
+        async def scenario():
+            nonlocal leave
+            leave = asyncio.Event()
+            return await stream_session(["üzgünüm"], leave=leave)
+
+        with patch.object(api_server, 'analyze_cached', side_effect=slow_analysis):
+            self.assertEqual(asyncio.run(scenario()), [])
+        self.assertEqual(api_server.stream_connections, 0)
+
+    def test_binary_frame(self):
+        """Binary frames get an error reply in order instead of breaking the reader"""
+        replies = asyncio.run(stream_session(["Bugün çok mutluyum!", b"\x00\x01", "Çok korkuyorum"]))
+        self.assertEqual([r["index"] for r in replies], [0, 1, 2])
+        self.assertIn("İkili", replies[1]["error"])
+        self.assertEqual(replies[2]["result"]["dominant_emotion"], "Fear")
+
+    def test_rolling_aggregate(self):
+        """Means cover the last window messages"""
+        aggregate = api_server.RollingAggregate(2)
+        for happy, sad in ((1.0, 0.0), (0.0, 1.0), (0.5, 0.0)):
+            aggregate.add({"emotions": {"Happy": happy, "Sad": sad},
+                           "dominant_emotion": "Happy" if happy > sad else "Sad"})
+        snapshot = aggregate.snapshot()
+        self.assertEqual(snapshot["emotions"], {"Happy": 0.25, "Sad": 0.5})
+        self.assertEqual(snapshot["dominant_counts"], {"Sad": 1, "Happy": 1})
+
+    def test_backpressure(self):
+        """A full queue stops reading from the socket until analysis catches up"""
+        events = []
+        release = None
+
+        async def slow_analysis(texts, languages):
+            await release.wait()
+            return [{"emotions": {"Happy": 1.0}, "dominant_emotion": "Happy"} for _ in texts]
+
+        async def scenario():
+            nonlocal release
+            release = asyncio.Event()
+            session = asyncio.create_task(stream_session(["mutlu"] * 10, events=events))
+            for _ in range(20):
+                await asyncio.sleep(0)
+            # connect + the message being analysed + one queued + one waiting to be queued
+            reads_while_blocked = len(events)
+            release.set()
+            return reads_while_blocked, await session
+
+        with patch.object(api_server, 'STREAM_QUEUE_SIZE', 1), \
+                patch.object(api_server, 'analyze_cached', side_effect=slow_analysis):
+            reads_while_blocked, replies = asyncio.run(scenario())
+        self.assertLessEqual(reads_while_blocked, 4)
+        self.assertEqual([r["index"] for r in replies], list(range(10)))
+
+    def test_saturation_waits(self):
+        """A saturated executor delays the stream instead of failing messages"""
+        calls = []
+
+        async def flaky(texts, languages):
+            calls.append(texts)
+            if len(calls) == 1:
+                raise HTTPException(status_code=503, detail="meşgul", headers={"Retry-After": "0"})
+            return [{"emotions": {"Sad": 1.0}, "dominant_emotion": "Sad"} for _ in texts]
+
+        with patch.object(api_server, 'analyze_cached', side_effect=flaky):
+            replies = asyncio.run(stream_session(["üzgünüm"]))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(replies[0]["result"]["dominant_emotion"], "Sad")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
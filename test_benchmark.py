@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness tests for Text2Emotion
+"""
+
+import asyncio
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import benchmark
+from benchmark import Benchmark, compare, measure, synthetic_corpus
+
+
+class TestCorpus(unittest.TestCase):
+    """Synthetic corpora are reproducible"""
+
+    def test_deterministic(self):
+        self.assertEqual(synthetic_corpus("tr", "short", 20), synthetic_corpus("tr", "short", 20))
+        self.assertNotEqual(synthetic_corpus("en", "short", 20), synthetic_corpus("en", "short", 20, seed=1))
+
+    def test_sizes(self):
+        texts = synthetic_corpus("en", "medium", 5)
+        self.assertEqual(len(texts), 5)
+        self.assertTrue(all(len(text.split()) == 40 for text in texts))
+        mixed = synthetic_corpus("mixed", "short", 10)
+        self.assertEqual(len(mixed), 10)
+
+    def test_unknown_language(self):
+        with self.assertRaises(ValueError):
+            synthetic_corpus("de", "short")
+
+
+class TestHarness(unittest.TestCase):
+    """Measuring, skipping and comparing against a baseline"""
+
+    def test_measure(self):
+        calls = []
+        timing = measure(lambda: calls.append(1), repeat=3, min_time=0.001)
+        self.assertEqual(timing["rounds"], 3)
+        self.assertLessEqual(timing["min_s"], timing["median_s"])
+        self.assertGreater(len(calls), 3)
+
+    def test_missing_data_is_skipped(self):
+        def missing():
+            raise LookupError("\x1b[93mstopwords\x1b[0m not found\n****")
+
+        data = benchmark.run([Benchmark("ok", lambda: ((lambda: None), 10)), Benchmark("nltk", missing)],
+                             repeat=2, min_time=0)
+        self.assertEqual(data["results"]["ok"]["items"], 10)
+        self.assertEqual(data["skipped"], {"nltk": "LookupError: stopwords not found"})
+
+    def test_compare(self):
+        baseline = {"results": {"a": {"median_s": 1.0}, "b": {"median_s": 1.0}}}
+        current = {"results": {"a": {"median_s": 1.1}, "b": {"median_s": 1.5}, "new": {"median_s": 1.0}}}
+        rows = {row["name"]: row for row in compare(current, baseline, threshold=0.2)}
+        self.assertEqual(sorted(rows), ["a", "b"])
+        self.assertFalse(rows["a"]["regression"])
+        self.assertTrue(rows["b"]["regression"])
+
+    def test_asgi_request(self):
+        import api_server
+
+        status, body = asyncio.run(benchmark.asgi_request(api_server.app, "GET", "/health"))
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["status"], "healthy")
+
+    def test_api_requests_restore_cache(self):
+        """The API benchmark bypasses the result cache only while it runs"""
+        import api_server
+        from result_cache import ResultCache
+
+        cache = ResultCache()
+        original = api_server.cache
+        api_server.cache = cache
+        try:
+            benchmark._api_requests("/analyze", [{"text": "Bugün çok mutluyum!"}] * 3, 2)()
+            self.assertIs(api_server.cache, cache)
+        finally:
+            api_server.cache = original
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+
+    def test_cli_baseline_regression(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            baseline = os.path.join(directory, "baseline.json")
+            argv = ["--quick", "--only", "detect_language/mixed/short", "--repeat", "1", "--min-time", "0"]
+            with redirect_stderr(io.StringIO()):
+                self.assertEqual(benchmark.main(argv + ["-o", output, "--baseline", baseline,
+                                                        "--update-baseline"]), 0)
+                data = benchmark.load(baseline)
+                self.assertEqual(list(data["results"]), ["detect_language/mixed/short"])
+
+                # A baseline far faster than anything possible must fail the run
+                data["results"]["detect_language/mixed/short"]["median_s"] = 1e-12
+                benchmark.save(baseline, data)
+                with redirect_stdout(io.StringIO()):
+                    self.assertEqual(benchmark.main(argv + ["--baseline", baseline]), 1)
+
+    def test_reference_baseline(self):
+        """The committed reference loads, and comparing on another machine is flagged"""
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+        reference = benchmark.load(path)
+        self.assertIn("detect_language/mixed/short", reference["results"])
+
+        current = {"meta": dict(reference["meta"], cpu_count=reference["meta"]["cpu_count"] + 1)}
+        self.assertEqual(benchmark.machine_mismatch(current, reference), ["cpu_count"])
+        self.assertEqual(benchmark.machine_mismatch({"meta": reference["meta"]}, reference), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
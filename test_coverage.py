@@ -14,7 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from Text2Emotion import (
     download_nltk_data, clean_text, remove_stopwords, 
     detect_emotion, analyze_emotion_with_details, 
-    detect_language, interactive_mode
+    detect_language, interactive_mode, analyze_batch
 )
 from turkish_emotion_analyzer import TurkishEmotionAnalyzer
 
@@ -56,6 +56,7 @@ class TestText2Emotion(unittest.TestCase):
         analysis = self.analyzer.analyze_with_details("Çok üzgünüm")
         self.assertIn('emotions', analysis)
     
+    @patch('Text2Emotion.ENGLISH_ENGINE', 'text2emotion')
     @patch('Text2Emotion.te.get_emotion')
     def test_detect_emotion(self, mock_get_emotion):
         """Test emotion detection with mocked text2emotion"""
@@ -68,6 +69,7 @@ class TestText2Emotion(unittest.TestCase):
         self.assertIn('Happy', result)
         self.assertEqual(result['Happy'], 0.8)
     
+    @patch('Text2Emotion.ENGLISH_ENGINE', 'text2emotion')
     def test_analyze_emotion_with_details(self):
         """Test detailed emotion analysis"""
         with patch('Text2Emotion.te.get_emotion') as mock_get_emotion:
@@ -96,6 +98,187 @@ class TestText2Emotion(unittest.TestCase):
         analysis = self.analyzer.analyze_with_details("!@#$%")
         self.assertIn('emotions', analysis)
 
+class TestTurkishLexiconIndex(unittest.TestCase):
+    """Test compiled Turkish lexicon index against the list-scan scoring"""
+    
+    def setUp(self):
+        self.analyzer = TurkishEmotionAnalyzer()
+    
+    def reference_scores(self, text):
+        """Original per-word list scan, kept as the scoring reference"""
+        if not text or not text.strip():
+            return {'Happy': 0.0, 'Sad': 0.0, 'Angry': 0.0, 'Fear': 0.0, 'Surprise': 0.0}
+        words = self.analyzer.remove_stopwords(self.analyzer.clean_text(text)).split()
+        total_words = len(words) if words else 1
+        scores = {}
+        for emotion, emotion_word_list in self.analyzer.emotion_words.items():
+            count = 0
+            for word in words:
+                if word in emotion_word_list:
+                    count += 1
+                else:
+                    for emotion_word in emotion_word_list:
+                        if word in emotion_word or emotion_word in word:
+                            count += 0.5
+                            break
+            scores[emotion] = min(count / total_words * 3, 1.0)
+        return scores
+    
+    def test_scores_match_reference(self):
+        """Index based scores must be identical to the list scan"""
+        texts = [
+            "Bugün çok mutluyum! Harika bir gün geçiriyorum.",
+            "Çok üzgünüm ve ağlıyorum. Hayat çok zor.",
+            "Bu duruma çok kızgınım! Sinirlerim bozuldu.",
+            "Karanlıktan korkuyorum. Çok endişeliyim.",
+            "Bu haber beni çok şaşırttı! İnanılmaz!",
+            "ani aniden kaza kazandık yeniden sel selam",
+            "a e i u ka ler",
+            "!@#$%",
+            "",
+        ]
+        for text in texts:
+            self.assertEqual(self.analyzer.analyze_emotion(text), self.reference_scores(text))
+    
+    def test_rebuild_index(self):
+        """Lexicon edits take effect after rebuild_index"""
+        self.analyzer.emotion_words['Happy'].append('zzyzx')
+        self.analyzer.rebuild_index()
+        self.assertEqual(self.analyzer.analyze_emotion("zzyzx")['Happy'], 1.0)
+        self.assertEqual(self.analyzer.analyze_emotion("zzyzx"), self.reference_scores("zzyzx"))
+
+class TestTurkishNormalizer(unittest.TestCase):
+    """Test the single-pass Turkish normalizer against the regex pipeline"""
+    
+    def setUp(self):
+        self.analyzer = TurkishEmotionAnalyzer()
+    
+    @staticmethod
+    def reference_clean(text):
+        """Original chained replace/regex clean_text"""
+        import re
+        text = text.lower()
+        text = text.replace('ı', 'i').replace('ğ', 'g').replace('ü', 'u')
+        text = text.replace('ş', 's').replace('ö', 'o').replace('ç', 'c')
+        text = re.sub(r'[^\w\s]', ' ', text)
+        return re.sub(r'\s+', ' ', text).strip()
+    
+    def test_matches_reference(self):
+        """clean_text and tokenize must equal the regex pipeline"""
+        import random
+        rng = random.Random(11)
+        alphabet = "abcçdefgğhıijklmnoöprsştuüvyzÇĞIİÖŞÜ09_ \t\n\u00a0\u3000!?.,'-@#éß½²\u0307😀"
+        texts = ["", "   ", "Bugün çok MUTLUYUM!!!", "İstanbul'da\thava  güzel."]
+        texts += [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40))) for _ in range(2000)]
+        texts += [''.join(chr(rng.randint(0, 0x2FFFF)) for _ in range(10)) for _ in range(2000)]
+        
+        for text in texts:
+            expected = self.reference_clean(text)
+            self.assertEqual(self.analyzer.clean_text(text), expected, repr(text))
+            self.assertEqual(self.analyzer.tokenize(text),
+                             self.analyzer.remove_stopwords(expected).split(), repr(text))
+    
+    def test_processed_text_shared(self):
+        """processed_text comes from the same tokens used for scoring"""
+        analysis = self.analyzer.analyze_with_details("Bugün ve çok mutluyum!")
+        self.assertEqual(analysis['processed_text'], ' '.join(self.analyzer.tokenize("Bugün ve çok mutluyum!")))
+        self.assertEqual(self.analyzer.analyze_emotion("Bugün ve çok mutluyum!"), analysis['emotions'])
+
+class TestAnalyzeBatch(unittest.TestCase):
+    """Test batch analysis across both analyzers"""
+    
+    def setUp(self):
+        self.analyzer = TurkishEmotionAnalyzer()
+    
+    @patch('Text2Emotion.get_english_engine')
+    def test_routes_and_keeps_order(self, mock_get_engine):
+        """Results come back in input order with the detected language"""
+        mock_get_emotion = mock_get_engine.return_value.score
+        mock_get_emotion.return_value = {
+            'Happy': 0.0, 'Angry': 0.0, 'Surprise': 0.0, 'Sad': 1.0, 'Fear': 0.0
+        }
+        texts = ["Bugün çok mutluyum!", "I feel sad", "Çok üzgünüm"]
+        
+        results = analyze_batch(texts)
+        
+        self.assertEqual([r['detected_language'] for r in results], ['tr', 'en', 'tr'])
+        self.assertEqual([r['original_text'] for r in results], texts)
+        self.assertEqual(results[1]['dominant_emotion'], 'Sad')
+        self.assertEqual(results[0]['emotions'],
+                         self.analyzer.analyze_with_details(texts[0])['emotions'])
+        self.assertEqual(mock_get_emotion.call_count, 1)
+    
+    def test_explicit_languages(self):
+        """Per-text languages override detection"""
+        results = analyze_batch(["Hello", "Merhaba"], language=['tr', 'tr'])
+        self.assertEqual([r['detected_language'] for r in results], ['tr', 'tr'])
+        
+        with self.assertRaises(ValueError):
+            analyze_batch(["a", "b"], language=['tr'])
+    
+    @patch('Text2Emotion.get_english_engine')
+    def test_return_exceptions(self, mock_get_engine):
+        """Failing texts do not abort the batch when requested"""
+        mock_get_engine.return_value.score.side_effect = RuntimeError("boom")
+        results = analyze_batch(["Merhaba dünya", "Hello"], return_exceptions=True)
+        self.assertEqual(results[0]['detected_language'], 'tr')
+        self.assertIsInstance(results[1], RuntimeError)
+        
+        with self.assertRaises(RuntimeError):
+            analyze_batch(["Hello"])
+
+class TestDeduplication(unittest.TestCase):
+    """Texts with the same normalized form are scored once per batch"""
+    
+    def setUp(self):
+        # Each test starts from an empty cross-batch memo
+        patcher = patch('Text2Emotion._dedup_memo', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_turkish_duplicates(self):
+        """Case, punctuation and diacritics differences share one scoring"""
+        import metrics
+        from Text2Emotion import get_turkish_analyzer
+        
+        texts = ["Bugün çok mutluyum!", "bugun COK mutluyum", "Korkuyorum", "Bugün, çok... mutluyum"]
+        with patch('Text2Emotion.DEDUP', False):
+            expected = analyze_batch(texts, language='tr')
+        
+        analyzer = get_turkish_analyzer()
+        before = metrics.DEDUPLICATED.value('tr', 'batch')
+        with patch.object(analyzer, 'analyze_with_details', wraps=analyzer.analyze_with_details) as scorer:
+            results = analyze_batch(texts, language='tr')
+        self.assertEqual(scorer.call_count, 2)
+        self.assertEqual(results, expected)
+        self.assertIsNot(results[0]['emotions'], results[1]['emotions'])
+        self.assertEqual(metrics.DEDUPLICATED.value('tr', 'batch'), before + 2)
+    
+    def test_memo_across_batches(self):
+        import metrics
+        
+        before = metrics.DEDUPLICATED.value('tr', 'memo')
+        first = analyze_batch(["Çok korkuyorum"], language='tr')[0]
+        second = analyze_batch(["çok KORKUYORUM!!"], language='tr')[0]
+        self.assertEqual(metrics.DEDUPLICATED.value('tr', 'memo'), before + 1)
+        self.assertEqual(second['emotions'], first['emotions'])
+        self.assertEqual(second['original_text'], "çok KORKUYORUM!!")
+        
+        with patch('Text2Emotion.DEDUP_MEMO_SIZE', 0):
+            analyze_batch(["Çok korkuyorum."], language='tr')
+        self.assertEqual(metrics.DEDUPLICATED.value('tr', 'memo'), before + 1)
+    
+    def test_english_duplicates(self):
+        from english_emotion_engine import EnglishEmotionEngine
+        
+        engine = EnglishEmotionEngine({'happy': 'Happy', 'sad': 'Sad'}, {'i', 'am'}, {'i', 'am'},
+                                      lemmatize=lambda word, pos: word, negations={'not happy': 'sad'})
+        texts = ["I am happy!", "i am HAPPY", "I am not happy", "I am happy, not sad."]
+        with patch('Text2Emotion.get_english_engine', return_value=engine), \
+                patch('Text2Emotion.ENGLISH_ENGINE', 'fast'):
+            results = analyze_batch(texts, language='en')
+        self.assertEqual([r['emotions'] for r in results], [engine.score(text) for text in texts])
+
 class TestPerformance(unittest.TestCase):
     """Test performance aspects"""
     
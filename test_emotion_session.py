@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Incremental session tests for Text2Emotion
+"""
+
+import os
+import random
+import sys
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from emotion_session import EmotionSession
+from english_emotion_engine import EnglishEmotionEngine
+from turkish_emotion_analyzer import TurkishEmotionAnalyzer
+
+
+MESSAGES = [
+    "Bugün çok mutluyum, harika bir gün!",
+    "Ama akşam haberleri izleyince korktum.",
+    "Deprem haberi beni çok üzdü, ağladım.",
+    "Sonra arkadaşlarım sürpriz yaptı, şaşırdım!",
+    "Trafikte biri bağırdı, sinirliyim.",
+    "ve bu",
+]
+
+
+class TestTurkishSession(unittest.TestCase):
+    """Incremental scores match rescoring the whole transcript"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.analyzer = TurkishEmotionAnalyzer()
+
+    def test_matches_full_rescoring(self):
+        session = EmotionSession('tr', analyzer=self.analyzer)
+        for i, message in enumerate(MESSAGES):
+            scores = session.append(message)
+            self.assertEqual(scores, self.analyzer.analyze_emotion(' '.join(MESSAGES[:i + 1])))
+        self.assertEqual(session.chunks, len(MESSAGES))
+
+    def test_sliding_window(self):
+        rng = random.Random(19)
+        for window in (1, 3, 7):
+            session = EmotionSession('tr', window=window, analyzer=self.analyzer)
+            tokens = []
+            for _ in range(20):
+                message = rng.choice(MESSAGES)
+                tokens.extend(self.analyzer.tokenize(message))
+                scores = session.append(message)
+                expected = self.analyzer.analyze_emotion("x", tokens[-window:])
+                self.assertEqual(len(session), min(len(tokens), window))
+                for emotion, score in expected.items():
+                    self.assertAlmostEqual(scores[emotion], score, places=9)
+
+    def test_empty_and_reset(self):
+        session = EmotionSession('tr', analyzer=self.analyzer)
+        self.assertEqual(set(session.append("   ").values()), {0.0})
+        session.append("Korkuyorum")
+        self.assertEqual(session.details()['dominant_emotion'], 'Fear')
+        session.reset()
+        self.assertEqual((len(session), session.chunks), (0, 0))
+        self.assertEqual(set(session.scores().values()), {0.0})
+
+    def test_auto_language(self):
+        session = EmotionSession('auto', analyzer=self.analyzer)
+        session.append("Bugün çok mutluyum")
+        self.assertEqual(session.details()['detected_language'], 'tr')
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            EmotionSession('de')
+        with self.assertRaises(ValueError):
+            EmotionSession('tr', window=0)
+
+
+class TestEnglishSession(unittest.TestCase):
+    """English sessions use the fast engine's per-word emotion ids"""
+
+    def setUp(self):
+        stop_words = {'i', 'am', 'very', 'the', 'not', 'you', 'and'}
+        self.engine = EnglishEmotionEngine(
+            lexicon={'happy': 'Happy', 'great': 'Happy', 'sad': 'Sad', 'scare': 'Fear'},
+            english_stopwords=stop_words,
+            all_stopwords=stop_words,
+            lemmatize=lambda word, pos: {'scared': 'scare'}.get(word, word),
+            shortcuts={'gr8': 'great'}
+        )
+
+    def test_matches_full_rescoring(self):
+        messages = ["I am very happy!", "The movie was gr8.", "Now I am sad and scared."]
+        session = EmotionSession('en', engine=self.engine)
+        for i, message in enumerate(messages):
+            self.assertEqual(session.append(message), self.engine.score(' '.join(messages[:i + 1])))
+
+    def test_sliding_window(self):
+        session = EmotionSession('en', window=3, engine=self.engine)
+        session.extend(["happy happy", "sad tree sad"])
+        self.assertEqual(session.scores(), self.engine.score("sad tree sad"))
+        session.append("happy")
+        self.assertEqual(session.scores(), self.engine.score("tree sad happy"))
+        self.assertEqual(len(session), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
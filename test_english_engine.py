@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Fast English engine tests for Text2Emotion
+"""
+
+import random
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from english_emotion_engine import (
+    EnglishEmotionEngine, load_text2emotion_tables, word_tokenize_fast
+)
+
+
+def nltk_data_available():
+    """English comparisons need the NLTK corpora used by text2emotion"""
+    try:
+        import nltk
+        for resource in ('tokenizers/punkt', 'corpora/stopwords', 'corpora/wordnet'):
+            nltk.data.find(resource)
+    except LookupError:
+        return False
+    return True
+
+
+class TestEnglishEmotionEngine(unittest.TestCase):
+    """Test cases for EnglishEmotionEngine with small injected tables"""
+    
+    def setUp(self):
+        stop_words = {'i', 'am', 'very', 'the', 'not', 'you'}
+        self.engine = EnglishEmotionEngine(
+            lexicon={'happy': 'Happy', 'great': 'Happy', 'sad': 'Sad', 'scare': 'Fear'},
+            english_stopwords=stop_words,
+            all_stopwords=stop_words,
+            lemmatize=lambda word, pos: {'scared': 'scare'}.get(word, word),
+            negations={'not happy': 'Sad'},
+            shortcuts={'gr8': 'great', 'u': 'you'}
+        )
+    
+    def test_scores(self):
+        """Scores are match shares rounded to two places"""
+        self.assertEqual(self.engine.score("I am very happy!")['Happy'], 1.0)
+        
+        scores = self.engine.score("Happy, happy and sad.")
+        self.assertEqual(scores['Happy'], 0.67)
+        self.assertEqual(scores['Sad'], 0.33)
+        self.assertEqual(list(scores), ['Happy', 'Angry', 'Surprise', 'Sad', 'Fear'])
+    
+    def test_no_matches(self):
+        """Texts without matches score zero like text2emotion"""
+        self.assertEqual(self.engine.score(""), {'Happy': 0, 'Angry': 0, 'Surprise': 0, 'Sad': 0, 'Fear': 0})
+        self.assertEqual(sum(self.engine.count("the 123 xyz")), 0)
+    
+    def test_pipeline_rules(self):
+        """Shortcuts, lemmatization and URL removal follow text2emotion"""
+        self.assertEqual(self.engine.score("u r gr8")['Happy'], 1.0)
+        self.assertEqual(self.engine.score("I was scared")['Fear'], 1.0)
+        self.assertEqual(sum(self.engine.count("www sad")), 0)
+        self.assertEqual(self.engine.count("http://sad.example.com happy"), [1, 0, 0, 0, 0])
+
+    def test_word_emotion_ids(self):
+        """Per-word ids flatten to emotion_ids"""
+        for text in ("I am very happy, u r gr8 but sad", "not happy www.x.com sad", ""):
+            grouped = self.engine.word_emotion_ids(text)
+            self.assertEqual([i for ids in grouped for i in ids], self.engine.emotion_ids(text))
+        self.assertEqual(self.engine.word_emotion_ids("happy tree sad"), [(0,), (), (3,)])
+
+    def test_word_tokenize_fast(self):
+        """Treebank contraction splits are reproduced"""
+        self.assertEqual(word_tokenize_fast("cannot wanna go"), ['can', 'not', 'wan', 'na', 'go'])
+        self.assertEqual(word_tokenize_fast("gotta gimme"), ['got', 'ta', 'gim', 'me'])
+    
+    def test_load_text2emotion_tables(self):
+        """Tables are read from the installed text2emotion source"""
+        tables = load_text2emotion_tables()
+        self.assertEqual(tables['lexicon']['happy'], 'Happy')
+        self.assertNotIn('night', tables['lexicon'])
+        self.assertEqual(tables['shortcuts']['gr8'], 'great')
+        self.assertEqual(tables['negations']['not sad'], 'Happy')
+    
+    def test_matches_text2emotion_with_stub_corpora(self):
+        """Same rules as text2emotion when both use the same corpora"""
+        import text2emotion as te
+        import Text2Emotion
+        from nltk.tokenize import NLTKWordTokenizer
+        
+        english = ['i', 'am', 'is', 'the', 'a', 'and', 'not', 'no', 'to', 'it', 'you', 'can', 'was']
+        every = english + ['de', 'la', 'und', 've', 'na']
+        
+        class StubStopwords:
+            def words(self, language=None):
+                return list(english if language == 'english' else every)
+        
+        def lemmatize(word, pos='n'):
+            rules = (('ing', 'e'), ('ed', ''), ('s', '')) if pos == 'v' else (('ies', 'y'), ('s', ''))
+            for suffix, replacement in rules:
+                if word.endswith(suffix) and len(word) > len(suffix) + 2:
+                    return word[:-len(suffix)] + replacement
+            return word
+        
+        class StubLemmatizer:
+            def lemmatize(self, word, pos='n'):
+                return lemmatize(word, pos)
+        
+        tables = load_text2emotion_tables()
+        engine = EnglishEmotionEngine(tables['lexicon'], english, every, lemmatize,
+                                      tables['negations'], tables['shortcuts'])
+        vocabulary = (list(tables['lexicon'])[:2000] + english + list(tables['shortcuts'])
+                      + ['http://x.com/happy', 'www.sad.com', 'cannot', 'gonna', 'knot', '2', 'loved'])
+        tokenize = NLTKWordTokenizer().tokenize
+        
+        rng = random.Random(7)
+        with patch.object(te, 'stopwords', StubStopwords()), \
+                patch.object(te, 'word_tokenize', tokenize), \
+                patch.object(te, 'WordNetLemmatizer', StubLemmatizer), \
+                patch.object(Text2Emotion, '_english_tokenizer', tokenize), \
+                patch.object(Text2Emotion, '_english_stop_words', frozenset(english)):
+            Text2Emotion.remove_stopwords.cache_clear()
+            try:
+                for _ in range(300):
+                    words = [rng.choice(vocabulary) for _ in range(rng.randint(0, 10))]
+                    text = ' '.join(w.capitalize() if rng.random() < 0.2 else w for w in words) + '!'
+                    expected = te.get_emotion(Text2Emotion.remove_stopwords(Text2Emotion.clean_text(text)))
+                    self.assertEqual(engine.score(text), expected, msg=text)
+            finally:
+                Text2Emotion.remove_stopwords.cache_clear()
+    
+    def test_regex_tokenizer(self):
+        """The regex tokenizer matches NLTK's word tokenizer on cleaned text"""
+        from nltk.tokenize import NLTKWordTokenizer
+        import Text2Emotion
+        
+        tokenize = NLTKWordTokenizer().tokenize
+        vocabulary = ['cannot', 'gonna', 'gimme', 'wanna', 'lemme', "I'm", "can't", "'tis",
+                      'happy', 'sad', 'Hello,', 'world!', '2', 'd\'ye', 'gotta', 'x_y']
+        rng = random.Random(12)
+        for _ in range(500):
+            text = Text2Emotion.clean_text(' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 12))))
+            self.assertEqual(Text2Emotion.regex_tokenize(text), tokenize(text), msg=text)
+        
+        self.assertEqual(Text2Emotion.regex_tokenize("Hi, you!"), ['Hi', ',', 'you', '!'])
+    
+    def test_tokenizer_loaded_once(self):
+        """Punkt is loaded once, not per remove_stopwords cache miss"""
+        import Text2Emotion
+        
+        class Punkt:
+            def tokenize(self, text):
+                return [text]
+        
+        with patch.object(Text2Emotion, 'TOKENIZER', 'nltk'), \
+                patch.object(Text2Emotion, '_english_tokenizer', None), \
+                patch.object(Text2Emotion, '_english_stop_words', frozenset(['the'])), \
+                patch.object(Text2Emotion, 'download_nltk_data'), \
+                patch.object(Text2Emotion.nltk.data, 'load', return_value=Punkt()) as load:
+            Text2Emotion.remove_stopwords.cache_clear()
+            try:
+                self.assertEqual(Text2Emotion.remove_stopwords("the cat sat"), "cat sat")
+                self.assertEqual(Text2Emotion.remove_stopwords("the dog cannot"), "dog can not")
+            finally:
+                Text2Emotion.remove_stopwords.cache_clear()
+        load.assert_called_once_with('tokenizers/punkt/english.pickle')
+    
+    @unittest.skipUnless(nltk_data_available(), "NLTK corpora not installed")
+    def test_matches_text2emotion(self):
+        """Scores agree with the text2emotion pipeline within 0.01"""
+        import text2emotion as te
+        from Text2Emotion import clean_text, remove_stopwords, get_english_stopwords
+        
+        engine = EnglishEmotionEngine.from_nltk(english_stopwords=get_english_stopwords())
+        texts = [
+            "I am very happy today! The weather is great!",
+            "I'm so angry about what happened yesterday.",
+            "I'm feeling sad and depressed.",
+            "Wow! That's amazing! I can't believe it!",
+            "I'm scared and afraid of what might happen.",
+            "Check http://example.com, it is not bad but gr8 and lovely",
+            "I cannot wait, we're gonna celebrate 2 wins and 10 losses",
+        ]
+        for text in texts:
+            expected = te.get_emotion(remove_stopwords(clean_text(text)))
+            actual = engine.score(text)
+            for emotion in expected:
+                self.assertAlmostEqual(actual[emotion], expected[emotion], delta=0.01, msg=text)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
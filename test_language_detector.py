@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Language detector tests for Text2Emotion
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import language_detector
+from language_detector import LanguageDetector, get_detector
+from Text2Emotion import analyze_batch, detect_language
+
+TURKISH = [
+    "Merhaba dünya", "Bugün çok güzel", "Bugün çok mutluyum!", "Korkuyorum ve endişeliyim.",
+    "cok mutluyum bugun", "Harika bir film izledim", "Sinirlendim artık yeter", "Eve gidiyorum",
+    "Kahve içelim mi", "yarın okula gitmeyeceğim", "Sınavı geçtim", "seni seviyorum",
+]
+
+ENGLISH = [
+    "Hello world", "Today is beautiful", "I am very happy today!", "I am scared and worried.",
+    "This is amazing!", "What a terrible day", "He was furious", "Going home now",
+    "The cat sat on the mat", "I passed the exam", "Bir is a word", "my dog ate my homework",
+]
+
+
+class TestLanguageDetector(unittest.TestCase):
+    """Character n-gram detection"""
+
+    def setUp(self):
+        self.detector = get_detector()
+
+    def test_languages(self):
+        for text in TURKISH:
+            self.assertEqual(self.detector.detect(text).language, 'tr', text)
+            self.assertTrue(detect_language(text), text)
+        for text in ENGLISH:
+            self.assertEqual(self.detector.detect(text).language, 'en', text)
+            self.assertFalse(detect_language(text), text)
+
+    def test_confidence(self):
+        self.assertEqual(self.detector.detect(""), ('en', 0.5))
+        self.assertEqual(self.detector.detect("123 !!!"), ('en', 0.5))
+        short = self.detector.detect("merhaba").confidence
+        longer = self.detector.detect("merhaba, bugün çok mutluyum").confidence
+        self.assertTrue(0.5 < short < longer <= 1.0)
+
+    def test_batch_matches_single(self):
+        texts = TURKISH + ENGLISH + ["", "x"]
+        batch = self.detector.detect_batch(texts)
+        for text, detection in zip(texts, batch):
+            single = self.detector.detect(text)
+            self.assertEqual(detection.language, single.language, text)
+            self.assertAlmostEqual(detection.confidence, single.confidence, places=9)
+        self.assertEqual(self.detector.detect_batch([]), [])
+
+    def test_batch_matches_single_long(self):
+        """Long texts in a batch stop early exactly where detect() does"""
+        english = " ".join(ENGLISH) * 3
+        turkish = " ".join(TURKISH) * 30
+        texts = [english + " " + turkish, turkish + " " + english, " ".join(TURKISH + ENGLISH) * 20, "Merhaba"]
+        # The full-text evidence disagrees with the early decision
+        self.assertEqual(self.detector.detect(texts[0]).language, 'en')
+        self.assertGreater(sum(map(self.detector.word_score, texts[0].lower().split())), 0)
+        self.assertEqual(self.detector.detect_batch(texts), [self.detector.detect(text) for text in texts])
+
+    def test_detect_prefix(self):
+        """A prefix decides only when the whole text would stop within it"""
+        text = " ".join(ENGLISH) * 3 + " " + " ".join(TURKISH) * 30
+        self.assertEqual(self.detector.detect_prefix(text[:500]), self.detector.detect(text))
+        # Fewer than CHUNK_WORDS words, or a cut word, never decide
+        self.assertIsNone(self.detector.detect_prefix("Hello world"))
+        words = text.split()[:language_detector.CHUNK_WORDS]
+        self.assertIsNone(self.detector.detect_prefix(" ".join(words)))
+
+    def test_early_exit(self):
+        """Long texts stop scoring once the evidence is decisive"""
+        detector = LanguageDetector.default()
+        text = " ".join(TURKISH) * 100
+        with patch.object(detector, 'word_score', wraps=detector.word_score) as word_score:
+            self.assertEqual(detector.detect(text).language, 'tr')
+        self.assertLess(word_score.call_count, len(text.split()) // 10)
+
+    def test_word_cache_is_bounded(self):
+        detector = LanguageDetector.default()
+        detector.cache_size = 10
+        detector.detect(" ".join(f"kelime{i}x" for i in range(50)))
+        self.assertLessEqual(len(detector._word_scores), 10)
+
+    def test_analyze_batch_confidence(self):
+        results = analyze_batch(["Bugün çok mutluyum", "Korkuyorum"], language=['auto', 'tr'])
+        self.assertEqual(results[0]['detected_language'], 'tr')
+        self.assertGreater(results[0]['language_confidence'], 0.9)
+        self.assertIsNone(results[1]['language_confidence'])
+
+    def test_module_helpers(self):
+        self.assertEqual(language_detector.detect("Merhaba dünya").language, 'tr')
+        self.assertTrue(language_detector.is_turkish("Merhaba dünya"))
+        self.assertEqual([d.language for d in language_detector.detect_batch(["Hello", "Günaydın"])],
+                         ['en', 'tr'])
+
+
+if __name__ == '__main__':
+    unittest.main()
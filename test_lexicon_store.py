@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped lexicon store tests for Text2Emotion
+"""
+
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from english_emotion_engine import EMOTIONS, EnglishEmotionEngine
+from lexicon_store import MappedLexicon, compile_lexicon
+from turkish_emotion_analyzer import (
+    MappedTurkishLexiconIndex, TurkishEmotionAnalyzer, TurkishLexiconIndex
+)
+
+
+class TestMappedLexicon(unittest.TestCase):
+    """Compiled lexicon files and their lookups"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "lexicon.lex")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_lookups(self):
+        compile_lexicon(self.path, {'Happy': ['mutlu', 'güzel'], 'Sad': ['üzgün', 'güzel']})
+        with MappedLexicon(self.path) as lexicon:
+            self.assertEqual(lexicon.emotions, ('Happy', 'Sad'))
+            self.assertEqual(len(lexicon), 3)
+            self.assertEqual(lexicon.exact('mutlu'), 0b01)
+            self.assertEqual(lexicon.exact('güzel'), 0b11)
+            self.assertEqual(lexicon.exact('mutluyum'), 0)
+            self.assertIn('üzgün', lexicon)
+            # Substrings carry the containing words' emotions and their own exact mask
+            self.assertEqual(lexicon.substring('üz'), (0b11, 0))
+            self.assertEqual(lexicon.substring('mutlu'), (0b01, 0b01))
+            self.assertEqual(lexicon.substring('xyz'), (0, 0))
+            self.assertEqual(dict(lexicon.emotion_words()),
+                             {'Happy': ('güzel', 'mutlu'), 'Sad': ('güzel', 'üzgün')})
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a lexicon file")
+        with self.assertRaises(ValueError):
+            MappedLexicon(self.path)
+
+    def test_turkish_index_matches_in_memory_index(self):
+        """Mapped matches equal TurkishLexiconIndex on a large random lexicon"""
+        rng = random.Random(14)
+        alphabet = "abcçdefgğhıijklmnoöprsştuüvyz"
+        emotion_words = {emotion: [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 9)))
+                                   for _ in range(500)]
+                         for emotion in ('Happy', 'Sad', 'Angry', 'Fear', 'Surprise')}
+        compile_lexicon(self.path, emotion_words)
+
+        expected = TurkishLexiconIndex(emotion_words)
+        with MappedLexicon(self.path) as lexicon:
+            mapped = MappedTurkishLexiconIndex(lexicon)
+            words = [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 12))) for _ in range(3000)]
+            words += [word for words in emotion_words.values() for word in words]
+            for word in words:
+                self.assertEqual(mapped.match(word), expected.match(word), word)
+            self.assertEqual(mapped.count(words[:50]), expected.count(words[:50]))
+            mapped.match.cache_clear()
+
+    def test_turkish_analyzer_from_file(self):
+        """An analyzer on the compiled built-in lexicon scores identically"""
+        analyzer = TurkishEmotionAnalyzer()
+        compile_lexicon(self.path, analyzer.emotion_words)
+        mapped = TurkishEmotionAnalyzer(lexicon_path=self.path)
+
+        self.assertIsInstance(mapped.lexicon_index, MappedTurkishLexiconIndex)
+        for text in ["Bugün çok mutluyum! Harika bir gün.", "Korkuyorum", "Çok sinirliyim ve üzgünüm", ""]:
+            self.assertEqual(mapped.analyze_with_details(text), analyzer.analyze_with_details(text))
+
+        # Replacing emotion_words falls back to the in-memory index
+        mapped.emotion_words = {'Happy': ['mutlu']}
+        mapped.rebuild_index()
+        self.assertIsInstance(mapped.lexicon_index, TurkishLexiconIndex)
+        mapped.lexicon_store.close()
+
+    def test_english_engine_from_file(self):
+        lexicon = {'happy': 'Happy', 'sad': 'Sad', 'scare': 'Fear', 'wow': 'Surprise'}
+        compile_lexicon(self.path, {emotion: [w for w, e in lexicon.items() if e == emotion]
+                                    for emotion in EMOTIONS}, substrings=False)
+        stop_words = {'i', 'am', 'very'}
+        with MappedLexicon(self.path) as mapped:
+            engine = EnglishEmotionEngine(mapped, stop_words, stop_words, lambda word, pos: word)
+            expected = EnglishEmotionEngine(lexicon, stop_words, stop_words, lambda word, pos: word)
+            for text in ["I am very happy", "happy sad wow wow", "nothing", "scare happy"]:
+                self.assertEqual(engine.score(text), expected.score(text))
+            with self.assertRaises(ValueError):
+                mapped.substring('happy')
+
+
+class TestLexiconReload(unittest.TestCase):
+    """Lexicon versions and hot reloading of changed files"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tr.lex")
+        import Text2Emotion
+        self.module = Text2Emotion
+        self.patcher = patch.multiple(Text2Emotion, TURKISH_LEXICON_PATH=self.path, ENGLISH_LEXICON_PATH=None,
+                                      _turkish_analyzer=None, _lexicon_files={})
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.directory.cleanup()
+
+    def compile(self, happy, sad, version=None):
+        compile_lexicon(self.path, {'Happy': happy, 'Sad': sad}, version=version)
+
+    def test_versions(self):
+        self.compile(['mutlu'], ['üzgün'])
+        with MappedLexicon(self.path) as lexicon:
+            content_version = lexicon.version
+        self.compile(['mutlu'], ['üzgün'])
+        with MappedLexicon(self.path) as lexicon:
+            self.assertEqual(lexicon.version, content_version)
+        self.compile(['mutlu', 'neşeli'], ['üzgün'])
+        with MappedLexicon(self.path) as lexicon:
+            self.assertNotEqual(lexicon.version, content_version)
+        self.compile(['mutlu'], ['üzgün'], version="2024-w48")
+        self.assertEqual(self.module.lexicon_version(), "tr:2024-w48,en:builtin")
+
+    def test_reload_swaps_analyzer(self):
+        self.compile(['mutlu'], ['üzgün'], version="v1")
+        old = self.module.get_turkish_analyzer()
+        self.assertEqual(old.analyze_with_details("mutlu")['dominant_emotion'], 'Happy')
+        self.assertFalse(self.module.reload_lexicons())
+
+        self.compile(['neşeli'], ['mutlu'], version="v2")
+        self.assertTrue(self.module.reload_lexicons())
+        new = self.module.get_turkish_analyzer()
+        self.assertIsNot(new, old)
+        self.assertEqual(new.analyze_with_details("mutlu")['dominant_emotion'], 'Sad')
+        # The previous snapshot keeps working for callers that still hold it
+        self.assertEqual(old.analyze_with_details("mutlu")['dominant_emotion'], 'Happy')
+        self.assertTrue(self.module.result_version().endswith("/tr:v2,en:builtin"))
+
+        # An invalid file keeps the current lexicon
+        with open(self.path + ".tmp", "wb") as f:
+            f.write(b"bozuk")
+        os.replace(self.path + ".tmp", self.path)
+        with self.assertLogs("Text2Emotion", "ERROR"):
+            self.assertFalse(self.module.reload_lexicons())
+        self.assertIs(self.module.get_turkish_analyzer(), new)
+
+    def test_check_interval(self):
+        self.compile(['mutlu'], ['üzgün'], version="v1")
+        self.module.get_turkish_analyzer()
+        self.compile(['neşeli'], ['mutlu'], version="v2")
+        with patch.object(self.module, 'LEXICON_RELOAD_INTERVAL', 0):
+            self.assertFalse(self.module.check_lexicons())
+        with patch.object(self.module, 'LEXICON_RELOAD_INTERVAL', 60), \
+                patch.object(self.module, '_next_lexicon_check', 0.0):
+            self.assertTrue(self.module.check_lexicons())
+            # Within the interval the files are not looked at
+            self.compile(['mutlu'], ['üzgün'], version="v3")
+            self.assertFalse(self.module.check_lexicons())
+            self.assertEqual(self.module.lexicon_version(), "tr:v2,en:builtin")
+
+    def test_english_engine_with_lexicon(self):
+        stop_words = {'i', 'am'}
+        engine = EnglishEmotionEngine({'happy': 'Happy'}, stop_words, stop_words, lambda word, pos: word)
+        compile_lexicon(self.path, {'Sad': ['happy']}, substrings=False)
+        with MappedLexicon(self.path) as lexicon:
+            reloaded = engine.with_lexicon(lexicon)
+            self.assertEqual(reloaded.count("i am happy"), [0, 0, 0, 1, 0])
+        self.assertEqual(engine.count("i am happy"), [1, 0, 0, 0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Logging pipeline tests for Text2Emotion
+"""
+
+import json
+import logging
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import logger as logger_module
+from logger import DailyFileHandler, DroppingQueueHandler, setup_logger, stop_logging
+
+
+class TestQueueLogging(unittest.TestCase):
+    """Records reach the files through the background listener"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.name = f"test.{self.id()}"
+
+    def tearDown(self):
+        stop_logging(self.name)
+        for handler in logging.getLogger(self.name).handlers:
+            handler.close()
+        self.directory.cleanup()
+
+    def read_log(self):
+        path = os.path.join(self.directory.name, f"text2emotion_{time.strftime('%Y%m%d')}.log")
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_queue_mode(self):
+        with patch("sys.stderr"):
+            log = setup_logger(self.name, mode="queue", directory=self.directory.name)
+            self.assertEqual([type(h) for h in log.handlers], [DroppingQueueHandler])
+            log.info("merhaba %s", "dünya")
+            stop_logging(self.name)
+        self.assertIn(f"{self.name} - INFO - merhaba dünya", self.read_log())
+
+    def test_lazy_start(self):
+        """No thread, directory or file exists before the first record"""
+        directory = os.path.join(self.directory.name, "logs")
+        with patch("sys.stderr"):
+            threads = threading.active_count()
+            log = setup_logger(self.name, mode="queue", directory=directory)
+            self.assertFalse(os.path.exists(directory))
+            self.assertEqual(threading.active_count(), threads)
+            log.info("ilk kayıt")
+            stop_logging(self.name)
+        self.assertEqual(len(os.listdir(directory)), 1)
+
+    def test_json_format(self):
+        with patch("sys.stderr"):
+            log = setup_logger(self.name, mode="queue", log_format="json", directory=self.directory.name)
+            log.warning("istek", extra={"endpoint": "/analyze", "status": 200})
+            stop_logging(self.name)
+        entry = json.loads(self.read_log().splitlines()[0])
+        self.assertEqual((entry["level"], entry["message"]), ("WARNING", "istek"))
+        self.assertEqual((entry["endpoint"], entry["status"]), ("/analyze", 200))
+
+    def test_sync_mode(self):
+        with patch("sys.stderr"):
+            log = setup_logger(self.name, mode="sync", directory=self.directory.name)
+            self.assertNotIn(DroppingQueueHandler, [type(h) for h in log.handlers])
+            log.info("senkron")
+        self.assertIn("senkron", self.read_log())
+
+    @unittest.skipUnless(hasattr(os, "fork"), "fork gerekli")
+    def test_forked_child_logs(self):
+        with patch("sys.stderr"):
+            log = setup_logger(self.name, mode="queue", directory=self.directory.name)
+            pid = os.fork()
+            if pid == 0:
+                log.info("çocuk süreç")
+                stop_logging(self.name)
+                os._exit(0)
+            os.waitpid(pid, 0)
+        self.assertIn("çocuk süreç", self.read_log())
+
+
+class TestHandlers(unittest.TestCase):
+    """Dropping, rotation and sampling"""
+
+    def test_full_queue_drops(self):
+        handler = DroppingQueueHandler(queue.Queue(1))
+        before = logger_module.DROPPED.value()
+        for i in range(3):
+            handler.emit(logging.LogRecord("t", logging.INFO, __file__, 1, "kayıt %d", (i,), None))
+        self.assertEqual(handler.dropped, 2)
+        self.assertEqual(logger_module.DROPPED.value(), before + 2)
+        self.assertEqual(handler.queue.get_nowait().getMessage(), "kayıt 0")
+
+    def test_daily_rotation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            handler = DailyFileHandler(directory, backups=2)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            day = 24 * 3600
+            for offset in range(4):
+                record = logging.LogRecord("t", logging.INFO, __file__, 1, f"gün {offset}", None, None)
+                record.created = time.time() + (offset + 1) * day
+                handler.emit(record)
+            handler.close()
+
+            files = sorted(os.listdir(directory))
+            self.assertEqual(len(files), 2)
+            with open(os.path.join(directory, files[-1]), encoding="utf-8") as f:
+                self.assertEqual(f.read(), "gün 3\n")
+
+    def test_request_sampling(self):
+        with patch.object(logger_module.request_logger, "info") as info:
+            with patch.object(logger_module, "REQUEST_SAMPLE_RATE", 0.0):
+                logger_module.log_request("istek %s", "/analyze", status=200)
+            info.assert_not_called()
+            with patch.object(logger_module, "REQUEST_SAMPLE_RATE", 1.0):
+                logger_module.log_request("istek %s", "/analyze", status=200)
+            info.assert_called_once_with("istek %s", "/analyze", extra={"status": 200})
+
+
+if __name__ == '__main__':
+    unittest.main()
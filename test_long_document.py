@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Long document tests for Text2Emotion
+"""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import language_detector
+import long_document
+from english_emotion_engine import EnglishEmotionEngine
+from Text2Emotion import analyze_batch
+
+PARAGRAPHS = [
+    "Bugün çok mutluyum, sonunda tatile çıkıyoruz. Hava harika görünüyor!",
+    "Ama dün akşam gelen haber hepimizi korkuttu. Annem çok üzgün, babam kızgın.",
+    "Kardeşim üniversiteyi kazandı. Bütün aile onunla gurur duyuyor, çok sevindik.",
+]
+DOCUMENT = "\n\n".join(PARAGRAPHS * 40)
+
+
+class TestSplitDocument(unittest.TestCase):
+    """Test cases for chunk boundaries"""
+
+    def test_spans_cover_text(self):
+        spans = long_document.split_document(DOCUMENT, 500)
+        self.assertEqual(spans[0][0], 0)
+        self.assertEqual(spans[-1][1], len(DOCUMENT))
+        for (_, end), (start, _) in zip(spans, spans[1:]):
+            self.assertEqual(end, start)
+        self.assertTrue(all(end - start <= 500 for start, end in spans))
+        # Paragraph breaks are preferred
+        self.assertTrue(all(DOCUMENT[:end].endswith("\n\n") for _, end in spans[:-1]))
+        self.assertEqual(long_document.split_document(""), [(0, 0)])
+
+    def test_sentence_and_negation_boundaries(self):
+        text = "I am happy. I am not. sad again " * 3
+        for start, end in long_document.split_document(text, 24)[:-1]:
+            self.assertNotRegex(text[start:end], r"not\W*$")
+            self.assertTrue(text[end - 1].isspace())
+
+
+class TestAnalyzeDocument(unittest.TestCase):
+    """Merged chunk counts equal scoring the whole text at once"""
+
+    def test_turkish_exact(self):
+        expected = analyze_batch([DOCUMENT])[0]
+        result = long_document.analyze_document(DOCUMENT, workers=1, chunk_chars=500)
+        self.assertGreater(result['chunks'], 10)
+        for key, value in expected.items():
+            self.assertEqual(result[key], value, key)
+
+    def test_english_exact(self):
+        engine = EnglishEmotionEngine({'happy': 'Happy', 'sad': 'Sad', 'afraid': 'Fear'}, {'i', 'am'}, {'i', 'am'},
+                                      lemmatize=lambda word, pos: word, negations={'not happy': 'sad'})
+        text = "I am happy. I am not\nhappy at all. I am afraid!\n\n" * 30
+        with patch('Text2Emotion.get_english_engine', return_value=engine):
+            result = long_document.analyze_document(text, language='en', workers=1, chunk_chars=100)
+        self.assertGreater(result['chunks'], 10)
+        self.assertEqual(result['emotions'], engine.score(text))
+        self.assertIsNone(result['language_confidence'])
+
+    def test_english_negation_across_chunks(self):
+        """A negation phrase found in one chunk is rewritten in every chunk, as in the whole text"""
+        engine = EnglishEmotionEngine({'happy': 'Happy', 'sad': 'Sad'}, {'i', 'was', 'she', 'is'},
+                                      {'i', 'was', 'she', 'is'}, lemmatize=lambda word, pos: word,
+                                      negations={'not happy': 'sad'})
+        # "not not" hides the first "not happy" from a chunk's own scan
+        text = "I was not not happy today. " + "Nothing else to say here. " * 3 + "\n\nShe is not happy."
+        with patch('Text2Emotion.get_english_engine', return_value=engine):
+            result = long_document.analyze_document(text, language='en', workers=1, chunk_chars=80)
+        self.assertEqual(result['chunks'], 2)
+        self.assertEqual(result['emotions'], engine.score(text))
+        self.assertEqual(result['emotions']['Sad'], 1.0)
+
+    def test_timeline(self):
+        text = "\n\n".join(["mutluyum " * 50, "korkuyorum " * 50, "kederliyim " * 50])
+        result = long_document.analyze_document(text, language='tr', timeline=True, workers=1, chunk_chars=600)
+        self.assertEqual([entry['dominant_emotion'] for entry in result['timeline']], ['Happy', 'Fear', 'Sad'])
+        self.assertEqual([(entry['start'], entry['end']) for entry in result['timeline']],
+                         long_document.split_document(text, 600))
+
+    def test_parallel(self):
+        with patch.object(long_document, 'LONG_DOCUMENT_CHARS', 1000):
+            try:
+                result = long_document.analyze_document(DOCUMENT, workers=2, chunk_chars=2000)
+            finally:
+                long_document.shutdown()
+        self.assertEqual(result['emotions'], analyze_batch([DOCUMENT])[0]['emotions'])
+
+    def test_detection(self):
+        """First-chunk detection agrees with detecting the whole text"""
+        mixed = "ok evet " * 200 + DOCUMENT
+        for text in (DOCUMENT, mixed, "hello world " * 300):
+            first = long_document.split_document(text, 500)[0]
+            self.assertEqual(long_document.detect_document(text, text[first[0]:first[1]]),
+                             language_detector.detect(text))
+
+
+class TestApiLongDocument(unittest.TestCase):
+    """Long /analyze texts are scored chunk by chunk in the executor"""
+
+    def test_analyze_long_text(self):
+        import api_server
+        from api_server import TextRequest
+
+        with patch.object(long_document, 'LONG_DOCUMENT_CHARS', 1000), \
+                patch.object(long_document, 'CHUNK_CHARS', 500), \
+                patch.object(api_server, 'cache', None), \
+                patch.object(api_server, 'run_analysis', side_effect=AssertionError("not chunked")):
+            response = asyncio.run(api_server.analyze_emotion(TextRequest(text=DOCUMENT)))
+        self.assertEqual(response.emotions, analyze_batch([DOCUMENT])[0]['emotions'])
+        self.assertEqual(response.detected_language, "tr")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Metrics tests for Text2Emotion
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import metrics
+from metrics import Counter, Histogram, Registry, StageTimer
+
+
+class TestMetricTypes(unittest.TestCase):
+    """Text exposition and process merging"""
+
+    def test_counter(self):
+        counter = Counter("c_total", "Sayaç", ("endpoint",))
+        counter.inc("/a")
+        counter.inc("/a", amount=2)
+        self.assertEqual(counter.value("/a"), 3)
+        self.assertEqual(list(counter.samples()), ['c_total{endpoint="/a"} 3'])
+
+    def test_histogram(self):
+        histogram = Histogram("h_seconds", "Süre", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "scoring")
+        self.assertEqual(list(histogram.samples()), [
+            'h_seconds_bucket{stage="scoring",le="0.1"} 2',
+            'h_seconds_bucket{stage="scoring",le="1.0"} 3',
+            'h_seconds_bucket{stage="scoring",le="+Inf"} 4',
+            'h_seconds_sum{stage="scoring"} 3.65',
+            'h_seconds_count{stage="scoring"} 4',
+        ])
+
+    def test_render_and_drain(self):
+        registry = Registry()
+        counter = registry.register(Counter("c_total", "Sayaç"))
+        histogram = registry.register(Histogram("h_seconds", "Süre", buckets=(1.0,)))
+        counter.inc()
+        histogram.observe(0.5)
+        text = registry.render()
+        self.assertIn("# TYPE c_total counter\nc_total 1\n", text)
+        self.assertIn("# TYPE h_seconds histogram\n", text)
+
+        # A worker drains its registry, the parent merges it
+        exported = registry.drain()
+        self.assertEqual(counter.value(), 0)
+        parent = Registry()
+        parent_counter = parent.register(Counter("c_total", "Sayaç"))
+        parent_histogram = parent.register(Histogram("h_seconds", "Süre", buckets=(1.0,)))
+        parent.merge(exported)
+        parent.merge(exported)
+        self.assertEqual(parent_counter.value(), 2)
+        self.assertEqual(parent_histogram.count(), 2)
+
+    def test_stage_timer(self):
+        timer = StageTimer("tr")
+        timer.lap("cleaning")
+        timer.lap("cleaning")
+        self.assertEqual(list(timer.totals), ["cleaning"])
+        before = metrics.BATCH_STAGE_SECONDS.count("cleaning", "tr")
+        timer.flush()
+        self.assertEqual(metrics.BATCH_STAGE_SECONDS.count("cleaning", "tr"), before + 1)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """analyze_batch, the executor and the API record metrics"""
+
+    def test_analyze_batch_stages(self):
+        from Text2Emotion import analyze_batch
+
+        before = {(stage, language): metrics.BATCH_STAGE_SECONDS.count(stage, language)
+                  for stage, language in [("language_detection", "auto"), ("cleaning", "tr"), ("scoring", "tr")]}
+        texts_before = metrics.TEXTS.value("tr")
+        results = analyze_batch(["Bugün çok mutluyum", "Korkuyorum"])
+        self.assertEqual([r['dominant_emotion'] for r in results], ['Happy', 'Fear'])
+        for (stage, language), count in before.items():
+            self.assertEqual(metrics.BATCH_STAGE_SECONDS.count(stage, language), count + 1, stage)
+        self.assertEqual(metrics.TEXTS.value("tr"), texts_before + 2)
+
+    def test_errors_counted(self):
+        from unittest.mock import patch
+        from Text2Emotion import analyze_batch, get_turkish_analyzer
+
+        before = metrics.ANALYSIS_ERRORS.value("tr")
+        # Memoized results of earlier tests would skip the failing scorer
+        with patch.object(get_turkish_analyzer(), 'analyze_with_details', side_effect=ValueError("x")), \
+                patch('Text2Emotion.DEDUP_MEMO_SIZE', 0):
+            results = analyze_batch(["Mutluyum", "Korkuyorum"], language="tr", return_exceptions=True)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertEqual(metrics.ANALYSIS_ERRORS.value("tr"), before + 2)
+
+    def test_process_worker_metrics(self):
+        from analysis_executor import with_metrics, analyze_texts
+
+        before = metrics.TEXTS.value("tr")
+        results, exported = with_metrics(analyze_texts, ["Mutluyum"], ["tr"])
+        self.assertEqual(results[0]['dominant_emotion'], 'Happy')
+        # The worker's registry is drained and travels with the result
+        self.assertEqual(metrics.TEXTS.value("tr"), 0)
+        metrics.merge(exported)
+        self.assertEqual(metrics.TEXTS.value("tr"), before + 1)
+
+    def test_metrics_endpoint(self):
+        import api_server
+        from api_server import TextRequest
+
+        asyncio.run(api_server.analyze_emotion(TextRequest(text="Bugün çok mutluyum!", language="tr")))
+        response = asyncio.run(api_server.get_metrics())
+        body = response.body.decode("utf-8")
+
+        self.assertTrue(response.media_type.startswith("text/plain; version=0.0.4"))
+        self.assertIn('text2emotion_requests_total{endpoint="/analyze",status="200"}', body)
+        self.assertIn('text2emotion_batch_stage_duration_seconds_count{stage="serialization",language="tr"}', body)
+        self.assertIn("text2emotion_executor_pending 0", body)
+        self.assertIn("text2emotion_cache_hit_ratio", body)
+        self.assertIn("# TYPE text2emotion_cache_hits_total counter", body)
+
+    def test_hit_ratio_skips_backend(self):
+        """Scraping the hit ratio does not query the cache backend"""
+        import api_server
+        from result_cache import ResultCache
+
+        cache = ResultCache()
+        cache.hits, cache.misses = 3, 1
+        with patch.object(api_server, 'cache', cache), \
+                patch.object(cache.backend, 'stats', side_effect=AssertionError("backend queried")):
+            body = asyncio.run(api_server.get_metrics()).body.decode("utf-8")
+        self.assertIn("text2emotion_cache_hit_ratio 0.75", body)
+
+
+if __name__ == '__main__':
+    unittest.main()
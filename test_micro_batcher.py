@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Request coalescing tests for Text2Emotion
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import metrics
+from micro_batcher import MicroBatcher
+
+
+class RecordingDispatch:
+    """Dispatch that records every group it receives"""
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+
+    async def __call__(self, texts, languages, deadlines):
+        self.calls.append(list(texts))
+        self.deadlines = list(deadlines)
+        if self.error is not None:
+            raise self.error
+        return [f"{language}:{text}" for text, language in zip(texts, languages)]
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """Concurrent submits are grouped and results fanned back out"""
+
+    def gather(self, batcher, count):
+        async def scenario():
+            return await asyncio.gather(*(batcher.submit(str(i), "tr") for i in range(count)),
+                                        return_exceptions=True)
+        return asyncio.run(scenario())
+
+    def test_window_groups_requests(self):
+        dispatch = RecordingDispatch()
+        before = metrics.COALESCED_BATCH_SIZE.count()
+        results = self.gather(MicroBatcher(dispatch, window=0.01), 10)
+        self.assertEqual(results, [f"tr:{i}" for i in range(10)])
+        self.assertEqual(dispatch.calls, [[str(i) for i in range(10)]])
+        self.assertEqual(metrics.COALESCED_BATCH_SIZE.count(), before + 1)
+
+    def test_max_items_flushes_early(self):
+        dispatch = RecordingDispatch()
+        results = self.gather(MicroBatcher(dispatch, window=0.05, max_items=4), 10)
+        self.assertEqual(len(results), 10)
+        # The last, partial group waits for the window unless it fills up
+        self.assertEqual([len(group) for group in dispatch.calls], [4, 4, 2])
+
+    def test_errors_reach_every_request(self):
+        error = RuntimeError("dolu")
+        results = self.gather(MicroBatcher(RecordingDispatch(error), window=0.001), 3)
+        self.assertEqual(results, [error] * 3)
+
+    def test_cancelled_request(self):
+        dispatch = RecordingDispatch()
+        batcher = MicroBatcher(dispatch, window=0.01)
+
+        async def scenario():
+            waiting = asyncio.ensure_future(batcher.submit("a", "tr"))
+            other = asyncio.ensure_future(batcher.submit("b", "en"))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            return await other
+
+        self.assertEqual(asyncio.run(scenario()), "en:b")
+        self.assertEqual(dispatch.calls, [["a", "b"]])
+
+    def test_cancelled_dispatch(self):
+        """Cancelling the group's dispatch task cancels every waiting request"""
+        started = None
+
+        async def stuck(texts, languages, deadlines):
+            started.set()
+            await asyncio.sleep(3600)
+
+        batcher = MicroBatcher(stuck, window=0.001)
+
+        async def scenario():
+            nonlocal started
+            started = asyncio.Event()
+            waiting = [asyncio.ensure_future(batcher.submit(text, "tr")) for text in "abc"]
+            await started.wait()
+            for task in batcher._tasks:
+                task.cancel()
+            return await asyncio.wait_for(asyncio.gather(*waiting, return_exceptions=True), 1)
+
+        results = asyncio.run(scenario())
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(isinstance(result, asyncio.CancelledError) for result in results))
+
+    def test_deadlines_forwarded(self):
+        dispatch = RecordingDispatch()
+        batcher = MicroBatcher(dispatch, window=0.001)
+
+        async def scenario():
+            return await asyncio.gather(batcher.submit("a", "tr", 12.5), batcher.submit("b", "tr"))
+
+        asyncio.run(scenario())
+        self.assertEqual(dispatch.deadlines, [12.5, None])
+
+    def test_from_env(self):
+        with patch.dict(os.environ, {"TEXT2EMOTION_COALESCE_WINDOW_MS": "0"}):
+            self.assertIsNone(MicroBatcher.from_env(RecordingDispatch()))
+        with patch.dict(os.environ, {"TEXT2EMOTION_COALESCE_WINDOW_MS": "5",
+                                     "TEXT2EMOTION_COALESCE_MAX_ITEMS": "32"}):
+            batcher = MicroBatcher.from_env(RecordingDispatch())
+        self.assertEqual((batcher.window, batcher.max_items), (0.005, 32))
+
+
+class TestApiCoalescing(unittest.TestCase):
+    """Concurrent /analyze calls share one executor job"""
+
+    def test_analyze_requests_coalesced(self):
+        import api_server
+        from analysis_executor import analyze_texts
+        from api_server import TextRequest
+
+        jobs = []
+        original = api_server.execute_analysis
+
+        async def counting(texts, languages, deadlines):
+            jobs.append(len(texts))
+            return await original(texts, languages, deadlines)
+
+        texts = ["Bugün çok mutluyum!", "Çok korkuyorum", "Ağladım, çok kederliyim"]
+
+        async def scenario():
+            return await asyncio.gather(*(api_server.analyze_emotion(TextRequest(text=text, language="tr"))
+                                          for text in texts))
+
+        with patch.object(api_server, 'cache', None), \
+                patch.object(api_server, 'batcher', MicroBatcher(counting, window=0.01)):
+            responses = asyncio.run(scenario())
+        self.assertEqual(jobs, [3])
+        expected = analyze_texts(texts, ["tr"] * 3)
+        self.assertEqual([r.emotions for r in responses], [e['emotions'] for e in expected])
+
+
+if __name__ == '__main__':
+    unittest.main()
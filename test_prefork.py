@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Pre-fork server tests for Text2Emotion
+"""
+
+import logging
+import os
+import signal
+import socket
+import time
+import unittest
+import urllib.request
+from unittest.mock import patch
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import prefork
+
+
+async def pid_app(scope, receive, send):
+    """Minimal ASGI app that answers every request with the worker's pid"""
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            await send({"type": message["type"] + ".complete"})
+            if message["type"] == "lifespan.shutdown":
+                return
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": str(os.getpid()).encode()})
+
+
+def fork_server(sock, workers, log_fd=None):
+    """Run prefork.serve in a child process, return its pid
+
+    With log_fd, the server's and its workers' log records are also
+    written to that file descriptor.
+    """
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            if log_fd is not None:
+                handler = logging.StreamHandler(os.fdopen(log_fd, "w", encoding="utf-8"))
+                logging.getLogger("Text2Emotion").addHandler(handler)
+            with patch.object(prefork, 'preload_models'):
+                prefork.serve(pid_app, workers=workers, log_level="error", sock=sock)
+        except SystemExit as e:
+            code = e.code
+        finally:
+            os._exit(code)
+    return pid
+
+
+def wait_exit(pid, timeout=10.0):
+    """Exit code of the child pid, failing if it does not exit in time"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        done, status = os.waitpid(pid, os.WNOHANG)
+        if done:
+            return os.waitstatus_to_exitcode(status)
+        time.sleep(0.05)
+    os.kill(pid, signal.SIGKILL)
+    os.waitpid(pid, 0)
+    raise AssertionError(f"process {pid} did not exit")
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "fork is required")
+class TestPrefork(unittest.TestCase):
+    """Test cases for the pre-fork supervisor"""
+
+    def test_serves_and_stops(self):
+        """Workers answer on the shared socket and SIGTERM stops all of them"""
+        sock = prefork.create_socket("127.0.0.1", 0)
+        port = sock.getsockname()[1]
+        url = f"http://127.0.0.1:{port}/"
+        server = fork_server(sock, workers=2)
+        sock.close()
+
+        workers = set()
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and len(workers) < 2:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    workers.add(int(response.read()))
+            except OSError:
+                time.sleep(0.05)
+        self.assertTrue(workers, "no worker answered")
+        self.assertNotIn(server, workers)
+
+        os.kill(server, signal.SIGTERM)
+        self.assertEqual(wait_exit(server), 0)
+        # The supervisor reaps its workers before exiting
+        for worker in workers:
+            with self.assertRaises(ProcessLookupError):
+                os.kill(worker, 0)
+        with self.assertRaises(OSError):
+            socket.create_connection(("127.0.0.1", port), timeout=1)
+
+    def test_failing_worker_is_logged_and_given_up(self):
+        """A worker that fails at startup logs its traceback and is not respawned forever"""
+        sock = prefork.create_socket("127.0.0.1", 0)
+        read_end, write_end = os.pipe()
+        with patch.object(prefork, '_run_worker', side_effect=ImportError("bozuk modül")), \
+                patch.object(prefork, 'RESTART_DELAY', 0.01), \
+                patch.object(prefork, 'MAX_QUICK_EXITS', 3):
+            server = fork_server(sock, workers=1, log_fd=write_end)
+        sock.close()
+        os.close(write_end)
+
+        self.assertEqual(wait_exit(server), 1)
+        with os.fdopen(read_end, encoding="utf-8", errors="replace") as pipe:
+            output = pipe.read()
+        self.assertEqual(output.count("ImportError: bozuk modül"), 3)
+        self.assertIn("yeniden başlatılmıyor", output)
+
+    def test_stop_during_backoff(self):
+        """SIGTERM is handled at once while a crashed worker waits to be restarted"""
+        sock = prefork.create_socket("127.0.0.1", 0)
+        read_end, write_end = os.pipe()
+        with patch.object(prefork, '_run_worker', side_effect=ImportError("bozuk modül")), \
+                patch.object(prefork, 'RESTART_DELAY', 30.0):
+            server = fork_server(sock, workers=1, log_fd=write_end)
+        sock.close()
+        os.close(write_end)
+
+        with os.fdopen(read_end, encoding="utf-8", errors="replace") as pipe:
+            try:
+                line = ""
+                while "yeniden başlatılıyor" not in line:
+                    line = pipe.readline()
+                    self.assertTrue(line, "no restart was scheduled")
+                self.assertIn("60 saniye sonra", line)
+            except BaseException:
+                os.kill(server, signal.SIGKILL)
+                raise
+            start = time.monotonic()
+            os.kill(server, signal.SIGTERM)
+            self.assertEqual(wait_exit(server, timeout=5), 0)
+        self.assertLess(time.monotonic() - start, 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Result cache tests for Text2Emotion
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import metrics
+from result_cache import CacheBackend, MemoryCacheBackend, ResultCache, SQLiteCacheBackend
+
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for ResultCache and its backends"""
+    
+    def test_normalized_key(self):
+        """Case and whitespace differences share one entry"""
+        cache = ResultCache()
+        cache.set("tr", "Bugün  çok MUTLUYUM", "1", {"dominant_emotion": "Happy"})
+        
+        self.assertEqual(cache.get("tr", "bugün çok mutluyum", "1"), {"dominant_emotion": "Happy"})
+        self.assertIsNone(cache.get("en", "bugün çok mutluyum", "1"))
+        self.assertIsNone(cache.get("tr", "bugün çok mutluyum", "2"))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertAlmostEqual(cache.stats()["hit_rate"], 1 / 3)
+    
+    def test_memory_backend_bounds(self):
+        """LRU eviction by size and expiry by TTL"""
+        backend = MemoryCacheBackend(max_bytes=20, ttl=None)
+        backend.set("a", "x" * 9)
+        backend.set("b", "x" * 9)
+        backend.get("a")
+        backend.set("c", "x" * 9)
+        
+        self.assertIsNone(backend.get("b"))
+        self.assertIsNotNone(backend.get("a"))
+        self.assertLessEqual(backend.size_bytes, 20)
+        
+        backend = MemoryCacheBackend(ttl=0.01)
+        backend.set("a", "1")
+        time.sleep(0.02)
+        self.assertIsNone(backend.get("a"))
+    
+    def test_sqlite_backend(self):
+        """Entries persist in the shared file and are size bounded"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.sqlite3")
+            backend = SQLiteCacheBackend(path=path, max_bytes=500, ttl=None)
+            backend.EVICT_EVERY = 10
+            backend.set("a", "1")
+            
+            other = SQLiteCacheBackend(path=path)
+            self.assertEqual(other.get("a"), "1")
+            
+            for i in range(100):
+                backend.set(f"key{i}", "x" * 20)
+            self.assertLessEqual(backend.stats()["size_bytes"], 500 + 10 * 25)
+    
+    def test_backend_interface(self):
+        """Backends must implement get, set and clear"""
+        class Partial(CacheBackend):
+            def get(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            Partial()
+
+    def test_from_env(self):
+        """Backends are selected from the environment"""
+        with patch.dict(os.environ, {"TEXT2EMOTION_CACHE": "none"}):
+            self.assertIsNone(ResultCache.from_env())
+        with patch.dict(os.environ, {"TEXT2EMOTION_CACHE": "result_cache:MemoryCacheBackend"}):
+            self.assertIsInstance(ResultCache.from_env().backend, MemoryCacheBackend)
+
+
+class TestApiCache(unittest.TestCase):
+    """Test that /analyze serves repeated texts from the cache"""
+    
+    def test_analyze_uses_cache(self):
+        import api_server
+        from api_server import TextRequest
+        
+        cache = ResultCache()
+        before = (metrics.CACHE_HITS.value(), metrics.CACHE_MISSES.value())
+        with patch.object(api_server, 'cache', cache):
+            first = asyncio.run(api_server.analyze_emotion(TextRequest(text="Bugün çok mutluyum!")))
+            with patch.object(api_server, 'run_analysis') as mock_run:
+                second = asyncio.run(api_server.analyze_emotion(TextRequest(text="bugün çok  mutluyum!")))
+                mock_run.assert_not_called()
+        
+        self.assertEqual(first.emotions, second.emotions)
+        self.assertEqual(second.text, "bugün çok  mutluyum!")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual((metrics.CACHE_HITS.value(), metrics.CACHE_MISSES.value()),
+                         (before[0] + 1, before[1] + 1))
+
+    def test_stale_worker_version(self):
+        """A result is cached under the lexicon version it was scored with, not the API's"""
+        import api_server
+        from api_server import TextRequest
+
+        cache = ResultCache()
+        current = api_server.result_version()
+        text = "Bugün çok korkuyorum!"
+        # A worker that has not seen the lexicon reload yet
+        with patch.object(api_server, 'cache', cache), patch.object(api_server, 'batcher', None), \
+                patch('Text2Emotion.result_version', return_value="stale"):
+            asyncio.run(api_server.analyze_emotion(TextRequest(text=text, language="tr")))
+        self.assertIsNone(cache.get("tr", text, current))
+        self.assertEqual(cache.get("tr", text, "stale")["dominant_emotion"], "Fear")
+
+    def test_blocking_backend_off_loop(self):
+        """SQLite lookups and writes run in a worker thread, not on the event loop"""
+        import api_server
+        from api_server import TextRequest
+
+        threads = []
+
+        class RecordingBackend(SQLiteCacheBackend):
+            def get(self, key):
+                threads.append(threading.current_thread())
+                return super().get(key)
+
+            def set(self, key, value):
+                threads.append(threading.current_thread())
+                super().set(key, value)
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(RecordingBackend(path=os.path.join(directory, "results.sqlite3")))
+            with patch.object(api_server, 'cache', cache):
+                for _ in range(2):
+                    asyncio.run(api_server.analyze_emotion(TextRequest(text="Bugün çok mutluyum!")))
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(threading.main_thread(), threads)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Streaming file scoring tests for Text2Emotion
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import stream_scoring
+from stream_scoring import Checkpoint, Progress, read_csv, read_jsonl, read_text, run
+
+
+class TestReaders(unittest.TestCase):
+    """Record readers track byte offsets for resuming"""
+
+    def test_jsonl(self):
+        data = '{"id": 7, "text": "Mutluyum"}\n\nbozuk\n{"body": "x"}\n'.encode("utf-8")
+        records = list(read_jsonl(io.BytesIO(data)))
+
+        self.assertEqual([r.index for r in records], [0, 1, 2])
+        self.assertEqual((records[0].id, records[0].text), (7, "Mutluyum"))
+        self.assertTrue(records[1].error.startswith("Geçersiz JSON"))
+        self.assertIsNotNone(records[2].error)
+        self.assertEqual(records[-1].offset, len(data))
+
+    def test_csv_multiline_field(self):
+        data = 'id,text\n1,"Çok\nmutluyum"\n2,Korkuyorum\n'.encode("utf-8")
+        records = list(read_csv(io.BytesIO(data)))
+
+        self.assertEqual([(r.id, r.text) for r in records], [("1", "Çok\nmutluyum"), ("2", "Korkuyorum")])
+        # Offset after the multi-line record points at the next row
+        self.assertEqual(data[records[0].offset:], '2,Korkuyorum\n'.encode("utf-8"))
+
+    def test_csv_missing_column(self):
+        with self.assertRaises(ValueError):
+            list(read_csv(io.BytesIO(b"id,body\n1,x\n")))
+
+    def test_text_with_bom(self):
+        records = list(read_text(io.BytesIO("\ufeffMerhaba\n\n  Dünya \n".encode("utf-8"))))
+        self.assertEqual([r.text for r in records], ["Merhaba", "Dünya"])
+
+
+class TestRun(unittest.TestCase):
+    """End-to-end streaming with checkpoints"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.directory.name, "input.jsonl")
+        self.output_path = os.path.join(self.directory.name, "output.jsonl")
+        texts = ["Bugün çok mutluyum", "Korkuyorum", "", "Çok sinirliyim", "Mutlu bir gün"] * 3
+        with open(self.input_path, "w", encoding="utf-8") as f:
+            for i, text in enumerate(texts):
+                f.write(json.dumps({"id": f"m{i}", "text": text}, ensure_ascii=False) + "\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_output(self):
+        with open(self.output_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_scores_file(self):
+        count = run(self.input_path, self.output_path, language="tr", batch_size=4)
+        results = self.read_output()
+
+        self.assertEqual(count, 15)
+        self.assertEqual([r["index"] for r in results], list(range(15)))
+        self.assertEqual(results[1]["id"], "m1")
+        self.assertEqual(results[1]["dominant_emotion"], "Fear")
+        self.assertIn("error", results[2])
+        self.assertEqual(Checkpoint(self.output_path + ".offset").load()["records"], 15)
+
+    def test_resume_after_failure(self):
+        run(self.input_path, self.output_path, language="tr", batch_size=4)
+        expected = self.read_output()
+
+        original = stream_scoring.score_batch
+        calls = []
+
+        def failing(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 3:
+                raise RuntimeError("crash")
+            return original(*args, **kwargs)
+
+        with patch.object(stream_scoring, "score_batch", side_effect=failing):
+            with self.assertRaises(RuntimeError):
+                run(self.input_path, self.output_path, language="tr", batch_size=4)
+        self.assertEqual(len(self.read_output()), 8)
+
+        # A torn line after the checkpoint is discarded on resume
+        with open(self.output_path, "a", encoding="utf-8") as f:
+            f.write('{"index": 8, "emo')
+
+        count = run(self.input_path, self.output_path, language="tr", batch_size=4, resume=True)
+        self.assertEqual(count, 15)
+        self.assertEqual(self.read_output(), expected)
+
+    def test_progress_report(self):
+        stream = io.StringIO()
+        run(self.input_path, self.output_path, language="tr", progress=Progress(stream, interval=0))
+        self.assertIn("15 kayıt", stream.getvalue())
+        self.assertIn("tekrar", stream.getvalue())
+
+    def test_parallel_ordered(self):
+        """A process pool writes the same output in input order"""
+        run(self.input_path, self.output_path, language="tr", batch_size=2)
+        expected = self.read_output()
+
+        count = run(self.input_path, self.output_path, language="tr", batch_size=2, workers=2)
+        self.assertEqual(count, 15)
+        self.assertEqual(self.read_output(), expected)
+
+    def test_parallel_unordered(self):
+        run(self.input_path, self.output_path, language="tr", batch_size=2)
+        expected = self.read_output()
+
+        run(self.input_path, self.output_path, language="tr", batch_size=2, workers=2, ordered=False)
+        self.assertEqual(sorted(self.read_output(), key=lambda r: r["index"]), expected)
+        # Unordered output cannot be resumed, so no checkpoint is kept
+        self.assertIsNone(Checkpoint(self.output_path + ".offset").load())
+        with self.assertRaises(ValueError):
+            run(self.input_path, self.output_path, resume=True, ordered=False)
+
+    def test_resume_requires_output_file(self):
+        with self.assertRaises(ValueError):
+            run(self.input_path, None, resume=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
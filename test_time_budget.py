@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Time budget (deadline) tests for Text2Emotion
+"""
+
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import metrics
+from english_emotion_engine import EnglishEmotionEngine
+from result_cache import ResultCache
+from time_budget import CHUNK_CHARS, deadline_after, expired, text_chunks
+from turkish_emotion_analyzer import TurkishEmotionAnalyzer
+
+# Three chunks: happy, then sad, then fearful words
+LONG_TURKISH = ("mutluyum " * 1000) + ("üzgünüm " * 1000) + ("korkuyorum " * 1000)
+
+
+def past():
+    """A deadline that has already passed"""
+    return time.monotonic() - 1
+
+
+class TestTimeBudget(unittest.TestCase):
+    """Test cases for the deadline helpers"""
+
+    def test_deadline_after(self):
+        self.assertIsNone(deadline_after(None))
+        self.assertIsNone(deadline_after(0))
+        self.assertFalse(expired(None))
+        self.assertFalse(expired(deadline_after(60)))
+        self.assertTrue(expired(past()))
+
+    def test_text_chunks(self):
+        """Chunks cover the text and end on whitespace"""
+        chunks = list(text_chunks(LONG_TURKISH))
+        self.assertEqual(''.join(chunk for chunk, _ in chunks), LONG_TURKISH)
+        self.assertEqual(chunks[-1][1], len(LONG_TURKISH))
+        for chunk, end in chunks[:-1]:
+            self.assertGreaterEqual(len(chunk), CHUNK_CHARS)
+            self.assertTrue(LONG_TURKISH[end].isspace())
+
+        # No whitespace within reach: the word is split at size
+        self.assertEqual([chunk for chunk, _ in text_chunks("a" * 25, size=10)],
+                         ["a" * 10, "a" * 10, "a" * 5])
+        self.assertEqual(list(text_chunks("")), [])
+
+
+class TestTurkishDeadline(unittest.TestCase):
+    """Test cases for TurkishEmotionAnalyzer.analyze_with_details(deadline=...)"""
+
+    def setUp(self):
+        self.analyzer = TurkishEmotionAnalyzer()
+
+    def test_expired_deadline_scores_prefix(self):
+        """Only the first chunk is scored, and exactly as if it were the whole text"""
+        result = self.analyzer.analyze_with_details(LONG_TURKISH, deadline=past())
+        (_, end), = list(text_chunks(LONG_TURKISH))[:1]
+        prefix = self.analyzer.analyze_with_details(LONG_TURKISH[:end])
+
+        self.assertTrue(result['partial'])
+        self.assertEqual(result['token_coverage'], round(end / len(LONG_TURKISH), 4))
+        self.assertEqual(result['emotions'], prefix['emotions'])
+        self.assertEqual(result['dominant_emotion'], 'Happy')
+        self.assertEqual(result['original_text'], LONG_TURKISH)
+
+    def test_complete_within_deadline(self):
+        """A deadline that does not pass gives the unbudgeted result"""
+        result = self.analyzer.analyze_with_details(LONG_TURKISH, deadline=deadline_after(60))
+        full = self.analyzer.analyze_with_details(LONG_TURKISH)
+        self.assertEqual((result['partial'], result['token_coverage']), (False, 1.0))
+        self.assertEqual(result['emotions'], full['emotions'])
+        self.assertEqual(result['processed_text'], full['processed_text'])
+
+        # Short texts fit in the first chunk and are never partial
+        short = self.analyzer.analyze_with_details("Bugün çok mutluyum!", deadline=past())
+        self.assertFalse(short['partial'])
+
+
+class TestEnglishDeadline(unittest.TestCase):
+    """Test cases for EnglishEmotionEngine.score_until"""
+
+    def test_score_until(self):
+        engine = EnglishEmotionEngine({'happy': 'Happy', 'sad': 'Sad'}, set(), set(),
+                                      lemmatize=lambda word, pos: word)
+        text = "happy " * 2000 + "sad " * 2000
+        scores, coverage = engine.score_until(text, past())
+        self.assertEqual((scores['Happy'], scores['Sad']), (1.0, 0.0))
+        self.assertLess(coverage, 1.0)
+        self.assertEqual(engine.score_until(text, deadline_after(60)), (engine.score(text), 1.0))
+
+    def test_negation_across_chunks(self):
+        """A whole text scored in chunks matches score() when "not happy" straddles a chunk end"""
+        engine = EnglishEmotionEngine({'happy': 'Happy', 'sad': 'Sad'}, {'i', 'was'}, {'i', 'was'},
+                                      lemmatize=lambda word, pos: word, negations={'not happy': 'sad'})
+        # The first chunk would end right after "not"
+        text = "plain " * (CHUNK_CHARS // 6) + "not happy today. " + "plain " * 1000
+        self.assertEqual(text.index("not"), CHUNK_CHARS - 2)
+        scores, coverage = engine.score_until(text, deadline_after(60))
+        self.assertEqual((scores, coverage), (engine.score(text), 1.0))
+        self.assertEqual(scores['Sad'], 1.0)
+
+        # "not not" hides the phrase from the first chunk's own scan
+        text = "I was not not happy. " + "plain " * 2000 + "I was not happy. "
+        self.assertEqual(engine.score_until(text, deadline_after(60)), (engine.score(text), 1.0))
+
+
+class TestBatchDeadline(unittest.TestCase):
+    """Test cases for deadlines through analyze_batch and the API"""
+
+    def test_analyze_batch(self):
+        from Text2Emotion import analyze_batch
+
+        before = metrics.PARTIAL_RESULTS.value('tr')
+        results = analyze_batch([LONG_TURKISH, "Korkuyorum"], language='tr',
+                                deadline=[past(), None])
+        self.assertTrue(results[0]['partial'])
+        self.assertNotIn('partial', results[1])
+        self.assertEqual(metrics.PARTIAL_RESULTS.value('tr'), before + 1)
+
+        with self.assertRaises(ValueError):
+            analyze_batch(["a", "b"], language='tr', deadline=[None])
+
+    def test_partial_response_not_cached(self):
+        import api_server
+        from api_server import TextRequest
+
+        cache = ResultCache()
+        with patch.object(api_server, 'cache', cache), patch.object(api_server, 'batcher', None):
+            response = asyncio.run(api_server.analyze_emotion(
+                TextRequest(text=LONG_TURKISH, language="tr", deadline_ms=0.001)))
+            self.assertTrue(response.partial)
+            self.assertLess(response.token_coverage, 1.0)
+            self.assertEqual(cache.stats()["entries"], 0)
+
+            # Server default applies when the request does not set one
+            with patch.object(api_server, 'DEADLINE_MS', 0):
+                response = asyncio.run(api_server.analyze_emotion(
+                    TextRequest(text=LONG_TURKISH, language="tr")))
+            self.assertFalse(response.partial)
+            self.assertEqual(response.token_coverage, 1.0)
+            self.assertEqual(cache.stats()["entries"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
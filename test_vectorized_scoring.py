@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Vectorized scoring tests for Text2Emotion
+"""
+
+import random
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import Text2Emotion
+from english_emotion_engine import EnglishEmotionEngine
+from turkish_emotion_analyzer import TurkishEmotionAnalyzer
+from vectorized_scoring import score_english, score_turkish
+
+
+def make_engine():
+    """Small English engine with injected tables"""
+    stop_words = {'i', 'am', 'very', 'the', 'not', 'you'}
+    return EnglishEmotionEngine(
+        lexicon={'happy': 'Happy', 'great': 'Happy', 'sad': 'Sad', 'scare': 'Fear',
+                 'mad': 'Angry', 'wow': 'Surprise'},
+        english_stopwords=stop_words,
+        all_stopwords=stop_words,
+        lemmatize=lambda word, pos: {'scared': 'scare'}.get(word, word),
+        negations={'not happy': 'Sad'},
+        shortcuts={'gr8': 'great'}
+    )
+
+
+class TestScoreTurkish(unittest.TestCase):
+    """Vectorized Turkish scores must equal analyze_with_details"""
+
+    def setUp(self):
+        self.analyzer = TurkishEmotionAnalyzer()
+
+    def test_matches_scalar_path(self):
+        rng = random.Random(8)
+        words = [word for emotion_words in self.analyzer.emotion_words.values()
+                 for word in emotion_words]
+        words += ['ve', 'bir', 'masa', 'kitap', 'çok', 'bugün', 'Mutluyum!', 'KORKU', '123']
+        texts = ["", "   ", "!!!", "ve bir"]
+        for _ in range(300):
+            texts.append(' '.join(rng.choice(words) for _ in range(rng.randint(1, 15))))
+
+        expected = [self.analyzer.analyze_with_details(text) for text in texts]
+        self.assertEqual(score_turkish(self.analyzer, texts), expected)
+
+    def test_empty_batch(self):
+        self.assertEqual(score_turkish(self.analyzer, []), [])
+
+
+class TestScoreEnglish(unittest.TestCase):
+    """Vectorized English scores must equal the engine's scalar scores"""
+
+    def setUp(self):
+        self.engine = make_engine()
+
+    def expected(self, texts):
+        return [Text2Emotion._emotion_details(self.engine.score(text), text) for text in texts]
+
+    def test_rounding_ties(self):
+        """Tie shares like 1/8 and 1/40 round exactly like Python's round"""
+        texts = [
+            "happy sad sad sad sad sad sad sad",
+            "happy happy happy sad sad sad sad sad",
+            "happy mad wow sad scared happy mad wow",
+            "happy sad mad",
+            "happy " + "sad " * 39,
+            "happy " * 3 + "sad " * 37,
+        ]
+        results = score_english(self.engine, texts)
+        self.assertEqual(results, self.expected(texts))
+        self.assertEqual(results[0]['emotions']['Happy'], round(1 / 8, 2))
+        self.assertEqual(results[1]['emotions']['Happy'], round(3 / 8, 2))
+        self.assertEqual(results[4]['emotions']['Happy'], round(1 / 40, 2))
+
+    def test_no_matches(self):
+        """Texts without matches keep text2emotion's integer zeros"""
+        texts = ["", "the table", "happy"]
+        results = score_english(self.engine, texts)
+        self.assertEqual(results, self.expected(texts))
+        self.assertIs(type(results[0]['emotions']['Happy']), int)
+
+    def test_matches_scalar_path(self):
+        rng = random.Random(8)
+        words = ['happy', 'great', 'sad', 'scared', 'mad', 'wow', 'gr8', 'the', 'table',
+                 'I', 'am', 'not', 'Happy!', 'www.x.com']
+        texts = [' '.join(rng.choice(words) for _ in range(rng.randint(0, 20)))
+                 for _ in range(500)]
+        self.assertEqual(score_english(self.engine, texts), self.expected(texts))
+
+
+class TestAnalyzeBatchVectorized(unittest.TestCase):
+    """analyze_batch(vectorized=True) must equal the scalar batch path"""
+
+    def test_same_results(self):
+        texts = ["Bugün çok mutluyum", "I am happy and sad", "Korkuyorum", "nothing here"]
+        languages = ['tr', 'en', 'tr', 'en']
+        engine = make_engine()
+        with patch.object(Text2Emotion, 'ENGLISH_ENGINE', 'fast'), \
+             patch.object(Text2Emotion, 'get_english_engine', return_value=engine):
+            scalar = Text2Emotion.analyze_batch(texts, language=languages)
+            vectorized = Text2Emotion.analyze_batch(texts, language=languages, vectorized=True)
+        self.assertEqual(vectorized, scalar)
+
+    def test_group_errors(self):
+        """With return_exceptions a failing group yields its exception per text"""
+        error = LookupError("wordnet")
+        with patch.object(Text2Emotion, 'get_english_engine', side_effect=error):
+            results = Text2Emotion.analyze_batch(
+                ["Merhaba dünya", "hello", "world"], language=['tr', 'en', 'en'],
+                return_exceptions=True, vectorized=True
+            )
+        self.assertEqual(results[0]['detected_language'], 'tr')
+        self.assertIs(results[1], error)
+        self.assertIs(results[2], error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Warm-state snapshot and lazy import tests for Text2Emotion
+"""
+
+import os
+import pickle
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import Text2Emotion
+import warm_state
+from english_emotion_engine import load_text2emotion_tables
+from warm_state import WordNetMorphy
+
+
+def make_state():
+    """Small snapshot with WordNet-shaped data, no NLTK corpora needed"""
+    from nltk.corpus.reader.wordnet import WordNetCorpusReader
+
+    substitutions = {pos: list(WordNetCorpusReader.MORPHOLOGICAL_SUBSTITUTIONS[pos])
+                     for pos in warm_state.LEMMATIZED_POS}
+    return {
+        "format": warm_state.FORMAT_VERSION,
+        "tables": load_text2emotion_tables(),
+        "english_stopwords": frozenset(['i', 'am', 'the', 'very', 'not']),
+        "all_stopwords": frozenset(['i', 'am', 'the', 'very', 'not', 'de', 'und']),
+        "wordnet": {
+            "exceptions": {'n': {'mice': ['mouse'], 'geese': ['goose']},
+                           'v': {'was': ['be'], 'ran': ['run']}},
+            "lemmas": {'n': frozenset(['mouse', 'goose', 'dog', 'church', 'glass', 'wolf', 'box', 'man',
+                                       'party', 'happiness', 'love', 'fear']),
+                       'v': frozenset(['be', 'run', 'love', 'hate', 'cry', 'scare', 'hop', 'hope', 'fear'])},
+            "substitutions": substitutions,
+        },
+    }
+
+
+class TestWordNetMorphy(unittest.TestCase):
+    """The snapshot lemmatizer must follow nltk's morphy exactly"""
+
+    def test_matches_nltk_morphy(self):
+        from nltk.corpus.reader.wordnet import WordNetCorpusReader
+
+        data = make_state()["wordnet"]
+        morphy = WordNetMorphy(**data)
+        # nltk's implementation, run against the same data
+        reader = SimpleNamespace(
+            _exception_map=data["exceptions"],
+            MORPHOLOGICAL_SUBSTITUTIONS=WordNetCorpusReader.MORPHOLOGICAL_SUBSTITUTIONS,
+            _lemma_pos_offset_map={}
+        )
+        for pos, lemmas in data["lemmas"].items():
+            for lemma in lemmas:
+                reader._lemma_pos_offset_map.setdefault(lemma, {})[pos] = [0]
+
+        words = ['mice', 'geese', 'dogs', 'churches', 'glasses', 'wolves', 'boxes', 'men', 'parties',
+                 'was', 'ran', 'running', 'loved', 'loves', 'hated', 'cries', 'scared', 'hoping',
+                 'hopped', 'fears', 'happiness', 'xyz', 'ses', 's', '']
+        rng = random.Random(13)
+        suffixes = ['s', 'es', 'ed', 'ing', 'ies', 'ses', 'ves', 'men', '']
+        words += [rng.choice(sorted(data["lemmas"]['n'] | data["lemmas"]['v'])) + rng.choice(suffixes)
+                  for _ in range(300)]
+        for word in words:
+            for pos in warm_state.LEMMATIZED_POS:
+                expected = WordNetCorpusReader._morphy(reader, word, pos)
+                self.assertEqual(morphy.morphy(word, pos), expected, (word, pos))
+                self.assertEqual(morphy.lemmatize(word, pos),
+                                 min(expected, key=len) if expected else word)
+
+
+class TestSnapshot(unittest.TestCase):
+    """Building, loading and using a snapshot"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "state", "warm.pkl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        state = warm_state.build(self.path, make_state())
+        self.assertEqual(warm_state.load(self.path), state)
+
+    def test_rejects_other_formats(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "wb") as f:
+            pickle.dump({"format": warm_state.FORMAT_VERSION + 1}, f)
+        with self.assertRaises(ValueError):
+            warm_state.load(self.path)
+
+    def test_engine_without_nltk_data(self):
+        """Text2Emotion serves English scores from the snapshot alone"""
+        warm_state.build(self.path, make_state())
+        with patch.object(Text2Emotion, 'WARM_STATE_PATH', self.path), \
+                patch.object(Text2Emotion, '_warm_state', None), \
+                patch.object(Text2Emotion, '_english_engine', None), \
+                patch.object(Text2Emotion, '_english_stop_words', None), \
+                patch.object(Text2Emotion, 'download_nltk_data', side_effect=AssertionError("NLTK probed")):
+            Text2Emotion.warmup()
+            scores = Text2Emotion.get_english_engine().score("I am very happy, I love the party!")
+            self.assertEqual(Text2Emotion.get_english_stopwords(), make_state()["english_stopwords"])
+        self.assertEqual(max(scores, key=scores.get), 'Happy')
+
+
+class TestLazyImports(unittest.TestCase):
+    """Importing the project modules must not import text2emotion or nltk"""
+
+    def test_import_is_light(self):
+        code = ("import sys, Text2Emotion, analysis_executor, result_cache; "
+                "print('text2emotion' in sys.modules, 'nltk' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout
+        self.assertEqual(output.split(), ['False', 'False'])
+
+    def test_module_attributes_still_available(self):
+        import nltk
+        self.assertIs(Text2Emotion.nltk, nltk)
+
+
+if __name__ == '__main__':
+    unittest.main()
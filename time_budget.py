@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Süre sınırlı (deadline) analiz için yardımcılar
+
+Deadline, time.monotonic() cinsinden mutlak bir andır; aynı makinedeki
+süreçler aynı saati paylaştığından process havuzuna da olduğu gibi
+aktarılır. Uzun metinler kelime sınırında kesilen CHUNK_CHARS
+karakterlik parçalar halinde işlenir ve süre her parçadan sonra kontrol
+edilir: süre dolduğunda o ana kadar işlenen önek üzerinden skor döner.
+Her metnin en az ilk parçası işlenir, bu yüzden kısa metinler hiçbir
+zaman kısmi olmaz ve süre aşımı en fazla bir parçanın işlenme süresi
+kadardır (Türkçe için birkaç ms).
+"""
+
+import re
+import time
+from typing import Iterator, Optional, Pattern, Tuple
+
+CHUNK_CHARS = 8192
+
+_SPACE_RE = re.compile(r'\s')
+
+
+def deadline_after(seconds: Optional[float]) -> Optional[float]:
+    """Şimdiden seconds sonrası; seconds None ya da 0 ise süre sınırı yok (None)"""
+    if not seconds or seconds <= 0:
+        return None
+    return time.monotonic() + seconds
+
+
+def expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def text_chunks(text: str, size: int = CHUNK_CHARS,
+                joined: Optional[Pattern] = None) -> Iterator[Tuple[str, int]]:
+    """(parça, parçanın bittiği konum) çiftleri
+
+    Parçalar size karakterden sonraki ilk boşlukta biter; size karakter
+    boyunca boşluk yoksa kelime bölünür. joined verilirse önündeki metnin
+    sonu joined ile eşleşen boşluklar (ör. İngilizce "not" ile olumsuzladığı
+    kelime arası) atlanır.
+    """
+    position = 0
+    length = len(text)
+    while position < length:
+        end = position + size
+        if end < length:
+            space = _SPACE_RE.search(text, end, end + size)
+            while space and joined is not None and \
+                    joined.search(text, max(position, space.start() - 8), space.start() + 1):
+                space = _SPACE_RE.search(text, space.end(), end + size)
+            end = space.start() if space else end
+        else:
+            end = length
+        yield text[position:end], end
+        position = end
@@ -3,13 +3,167 @@
 Türkçe Duygu Analizi Modülü
 """
 
-import re
-from typing import Dict, List, Tuple
+import functools
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lexicon_store import MappedLexicon
+from time_budget import expired, text_chunks
+
+
+class _NormalizeTable(dict):
+    """clean_text'in tüm adımlarını tek bir str.translate geçişine indiren tablo
+
+    Türkçe karakterler ASCII karşılıklarına, harf/rakam/alt çizgi/boşluk
+    dışındaki karakterler boşluğa çevrilir. Yeni karakterlerin karşılığı
+    ilk görüldüklerinde hesaplanıp saklanır.
+    """
+
+    def __missing__(self, code: int) -> str:
+        char = chr(code)
+        value = char if char.isalnum() or char == '_' or char.isspace() else ' '
+        self[code] = value
+        return value
+
+
+_NORMALIZE_TABLE = _NormalizeTable(str.maketrans('ığüşöç', 'igusoc'))
+
+
+class _AhoCorasick:
+    """Sözlük kelimelerini tek geçişte bulan Aho-Corasick otomatı"""
+
+    def __init__(self, patterns: Dict[str, int]):
+        # Her düğüm: geçişler, hata bağlantısı ve çıktı maskesi
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [0]
+
+        for pattern, mask in patterns.items():
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(0)
+                node = next_node
+            self._out[node] |= mask
+
+        # Hata bağlantılarını genişlik öncelikli olarak kur
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] |= self._out[self._fail[child]]
+
+    def search(self, text: str) -> int:
+        """Metinde geçen tüm kalıpların maskelerinin birleşimini döndür"""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        found = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            found |= out[node]
+        return found
+
+
+class TurkishLexiconIndex:
+    """Duygu sözlüğünün derlenmiş hali
+
+    Tam eşleşmeler için hash tablosu, "kelime sözlük kelimesinin içinde"
+    kontrolü için alt dize tablosu ve "sözlük kelimesi kelimenin içinde"
+    kontrolü için Aho-Corasick otomatı kullanır. Her duygu bir bit ile
+    temsil edilir, böylece bir kelime tüm duygular için tek seferde eşleşir.
+    """
+
+    def __init__(self, emotion_words: Dict[str, Iterable[str]]):
+        self.emotions: Tuple[str, ...] = tuple(emotion_words)
+        self.bits: Tuple[int, ...] = tuple(1 << i for i in range(len(self.emotions)))
+
+        self._exact: Dict[str, int] = {}
+        self._substrings: Dict[str, int] = {}
+        for bit, words in zip(self.bits, emotion_words.values()):
+            for emotion_word in words:
+                self._exact[emotion_word] = self._exact.get(emotion_word, 0) | bit
+                length = len(emotion_word)
+                for start in range(length):
+                    for end in range(start + 1, length + 1):
+                        part = emotion_word[start:end]
+                        self._substrings[part] = self._substrings.get(part, 0) | bit
+
+        self._automaton = _AhoCorasick(self._exact)
+
+    def match(self, word: str) -> Tuple[int, int]:
+        """Kelime için (tam eşleşme maskesi, kısmi eşleşme maskesi) döndür"""
+        exact = self._exact.get(word, 0)
+        partial = (self._substrings.get(word, 0) | self._automaton.search(word)) & ~exact
+        return exact, partial
+
+    def count(self, words: Iterable[str]) -> List[float]:
+        """Duygu başına eşleşme puanlarını say (tam: 1, kısmi: 0.5)"""
+        counts = [0.0] * len(self.emotions)
+        for word in words:
+            exact, partial = self.match(word)
+            if not (exact or partial):
+                continue
+            for i, bit in enumerate(self.bits):
+                if exact & bit:
+                    counts[i] += 1
+                elif partial & bit:
+                    counts[i] += 0.5  # Kısmi eşleşme için yarım puan
+        return counts
+
+
+class MappedTurkishLexiconIndex(TurkishLexiconIndex):
+    """Derlenmiş, mmap'li sözlük dosyası üzerinde TurkishLexiconIndex
+
+    Tam eşleşmeler ve "kelime sözlük kelimesinin içinde" kontrolü
+    dosyadaki tablolardan okunur. "Sözlük kelimesi kelimenin içinde"
+    kontrolü için kelimenin alt dizeleri tam eşleşme tablosunda aranır.
+    Sonuçlar kelime başına önbelleğe alınır.
+    """
+
+    def __init__(self, lexicon: MappedLexicon, cache_size: int = 65536):
+        if not lexicon.has_substrings:
+            raise ValueError(f"{lexicon.path} alt dize tablosu olmadan derlenmiş")
+        self.lexicon = lexicon
+        self.emotions: Tuple[str, ...] = lexicon.emotions
+        self.bits: Tuple[int, ...] = tuple(1 << i for i in range(len(self.emotions)))
+        self.match = functools.lru_cache(maxsize=cache_size)(self._match)
+
+    def _match(self, word: str) -> Tuple[int, int]:
+        substring = self.lexicon.substring
+        containing, exact = substring(word)
+        contained = 0
+        for start in range(len(word)):
+            for end in range(start + 1, len(word) + 1):
+                in_words, is_word = substring(word[start:end])
+                # Hiçbir sözlük kelimesinde geçmeyen parçanın uzantıları da geçmez
+                if not in_words:
+                    break
+                contained |= is_word
+        partial = (containing | contained) & ~exact
+        return exact, partial
+
 
 class TurkishEmotionAnalyzer:
-    """Türkçe metinler için duygu analizi sınıfı"""
+    """Türkçe metinler için duygu analizi sınıfı
     
-    def __init__(self):
+    lexicon_path ile lexicon_store.py ile derlenmiş bir sözlük dosyası
+    verilirse emotion_words bu dosyanın kopyasız görünümü olur ve dosya
+    süreçler arasında mmap ile paylaşılır.
+    """
+    
+    def __init__(self, lexicon_path: Optional[str] = None):
         # Türkçe duygu kelimeleri
         self.emotion_words = {
             'Happy': [
@@ -81,23 +235,27 @@ class TurkishEmotionAnalyzer:
             'karşısında', 'önünde', 'arkasında', 'arasında', 'ortasında', 'başında',
             'sonunda', 'başında', 'sonunda', 'içinde', 'dışında', 'üstünde', 'altında'
         }
+
+        # Derlenmiş sözlük dosyası yerleşik kelimelerin yerini alır
+        self.lexicon_store = MappedLexicon(lexicon_path) if lexicon_path else None
+        if self.lexicon_store is not None:
+            self.emotion_words = self.lexicon_store.emotion_words()
+        self._store_words = self.emotion_words
+
+        # Sözlüğü bir kez derle
+        self.rebuild_index()
+
+    def rebuild_index(self):
+        """emotion_words değiştirildikten sonra sözlük indeksini yeniden derle"""
+        if self.lexicon_store is not None and self.emotion_words is self._store_words:
+            self.lexicon_index = MappedTurkishLexiconIndex(self.lexicon_store)
+        else:
+            self.lexicon_index = TurkishLexiconIndex(self.emotion_words)
     
     def clean_text(self, text: str) -> str:
         """Metni temizle ve normalize et"""
-        # Küçük harfe çevir
-        text = text.lower()
-        
-        # Türkçe karakterleri normalize et
-        text = text.replace('ı', 'i').replace('ğ', 'g').replace('ü', 'u')
-        text = text.replace('ş', 's').replace('ö', 'o').replace('ç', 'c')
-        
-        # Özel karakterleri temizle (noktalama işaretleri hariç)
-        text = re.sub(r'[^\w\s]', ' ', text)
-        
-        # Fazla boşlukları temizle
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        # Küçük harf, Türkçe karakterler, özel karakterler ve fazla boşluklar tek geçişte
+        return ' '.join(text.lower().translate(_NORMALIZE_TABLE).split())
     
     def remove_stopwords(self, text: str) -> str:
         """Türkçe stopwords'leri kaldır"""
@@ -105,37 +263,32 @@ class TurkishEmotionAnalyzer:
         filtered_words = [word for word in words if word not in self.turkish_stopwords]
         return ' '.join(filtered_words)
     
-    def analyze_emotion(self, text: str) -> Dict[str, float]:
-        """Türkçe metin için duygu analizi yap"""
-        if not text or not text.strip():
-            return {'Happy': 0.0, 'Sad': 0.0, 'Angry': 0.0, 'Fear': 0.0, 'Surprise': 0.0}
-        
-        # Metni temizle
-        cleaned_text = self.clean_text(text)
+    def tokenize(self, text: str) -> List[str]:
+        """Normalize edilmiş, stopwords'ten arındırılmış kelimeler
         
-        # Stopwords'leri kaldır
-        processed_text = self.remove_stopwords(cleaned_text)
+        remove_stopwords(clean_text(text)).split() ile aynı sonucu ara
+        metinler oluşturmadan üretir.
+        """
+        stopwords = self.turkish_stopwords
+        return [word for word in text.lower().translate(_NORMALIZE_TABLE).split()
+                if word not in stopwords]
+    
+    def analyze_emotion(self, text: str, tokens: Optional[List[str]] = None) -> Dict[str, float]:
+        """Türkçe metin için duygu analizi yap
         
-        # Kelimeleri say
-        words = processed_text.split()
-        total_words = len(words) if words else 1
+        tokens verilirse (tokenize çıktısı) metin yeniden işlenmez.
+        """
+        if not text or not text.strip():
+            return {'Happy': 0.0, 'Sad': 0.0, 'Angry': 0.0, 'Fear': 0.0, 'Surprise': 0.0}
         
-        # Her duygu için skor hesapla
+        words = tokens if tokens is not None else self.tokenize(text)
+        return self._normalize(self.lexicon_index.count(words), len(words))
+    
+    def _normalize(self, counts: List[float], total_words: int) -> Dict[str, float]:
+        """Duygu başına eşleşme puanlarından 0-1 arası skorlar"""
+        total_words = total_words or 1
         emotion_scores = {}
-        
-        for emotion, emotion_word_list in self.emotion_words.items():
-            count = 0
-            for word in words:
-                # Kelime eşleşmesini kontrol et
-                if word in emotion_word_list:
-                    count += 1
-                else:
-                    # Alt kelime eşleşmesi kontrol et
-                    for emotion_word in emotion_word_list:
-                        if word in emotion_word or emotion_word in word:
-                            count += 0.5  # Kısmi eşleşme için yarım puan
-                            break
-            
+        for emotion, count in zip(self.lexicon_index.emotions, counts):
             # Skoru normalize et (0-1 arası)
             score = count / total_words
             emotion_scores[emotion] = min(score * 3, 1.0)  # Daha belirgin skorlar için
@@ -152,9 +305,25 @@ class TurkishEmotionAnalyzer:
         
         return dominant_emotion, dominant_score
     
-    def analyze_with_details(self, text: str) -> Dict:
-        """Detaylı duygu analizi"""
-        emotions = self.analyze_emotion(text)
+    def analyze_with_details(self, text: str, tokens: Optional[List[str]] = None,
+                             deadline: Optional[float] = None) -> Dict:
+        """Detaylı duygu analizi
+        
+        tokens verilirse (tokenize çıktısı) metin yeniden işlenmez.
+        deadline (time.monotonic() anı) verilirse metin parçalar halinde
+        işlenir, süre dolunca skorlar o ana kadar işlenen önek üzerinden
+        hesaplanır; sonuca 'partial' ve 'token_coverage' (işlenen kısmın
+        oranı) eklenir (bkz. time_budget).
+        """
+        if deadline is not None and tokens is None:
+            return self._analyze_until(text, deadline)
+        # Kelimeler bir kez çıkarılır, skorlama ve processed_text paylaşır
+        if tokens is None:
+            tokens = self.tokenize(text)
+        emotions = self.analyze_emotion(text, tokens)
+        return self._details(text, emotions, tokens)
+    
+    def _details(self, text: str, emotions: Dict[str, float], tokens: List[str]) -> Dict:
         dominant_emotion, dominant_score = self.get_dominant_emotion(emotions)
         
         return {
@@ -162,8 +331,38 @@ class TurkishEmotionAnalyzer:
             'dominant_emotion': dominant_emotion,
             'dominant_score': dominant_score,
             'original_text': text,
-            'processed_text': self.remove_stopwords(self.clean_text(text))
+            'processed_text': ' '.join(tokens)
         }
+    
+    def _analyze_until(self, text: str, deadline: float) -> Dict:
+        """analyze_with_details, süre dolana kadar işlenen parçalar üzerinden"""
+        index = self.lexicon_index
+        counts = [0.0] * len(index.emotions)
+        tokens: List[str] = []
+        end = 0
+        # Parçalar kelime sınırında kesildiği için tam işlenen metinde sonuç aynıdır
+        for chunk, end in text_chunks(text):
+            chunk_tokens = self.tokenize(chunk)
+            for i, count in enumerate(index.count(chunk_tokens)):
+                counts[i] += count
+            tokens.extend(chunk_tokens)
+            if expired(deadline):
+                break
+        
+        if not text.strip():
+            emotions = self.analyze_emotion(text, tokens)
+        else:
+            emotions = self._normalize(counts, len(tokens))
+        details = self._details(text, emotions, tokens)
+        # Kesilen metinde kalan kelime sayısı bilinmez; işlenen karakter oranıyla tahmin edilir
+        details['partial'] = end < len(text)
+        details['token_coverage'] = round(end / len(text), 4) if text else 1.0
+        return details
+
+    def analyze_batch(self, texts: Iterable[str]) -> List[Dict]:
+        """Birden fazla metni sırasını koruyarak analiz et"""
+        analyze = self.analyze_with_details
+        return [analyze(text) for text in texts]
 
 def print_turkish_analysis(analysis: Dict):
     """Türkçe analiz sonuçlarını yazdır"""
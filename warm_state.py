@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Offline warm-state snapshot for fast startup
+
+A cold process normally imports text2emotion (which probes and may
+download NLTK data), parses its lexicon, reads the stopword corpora and
+loads WordNet on the first lemmatization. build() collects everything the
+fast English engine needs - lexicon tables, stopwords and WordNet's
+morphy data for nouns and verbs - into one pickle at image build time;
+load() restores it in milliseconds without importing NLTK.
+
+    python warm_state.py build warm_state.pkl
+
+Point TEXT2EMOTION_WARM_STATE at the file to use it. Only load snapshots
+you built yourself: they are pickles.
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+from typing import Dict, FrozenSet, List, Optional
+
+# Bump whenever the snapshot layout changes
+FORMAT_VERSION = 1
+
+# Parts of speech the English engine lemmatizes with
+LEMMATIZED_POS = ('n', 'v')
+
+
+class WordNetMorphy:
+    """WordNetLemmatizer.lemmatize over a snapshot of WordNet's morphy data
+
+    Mirrors nltk's WordNetCorpusReader._morphy: exception lists first,
+    then suffix substitutions applied repeatedly until a known lemma of
+    the requested part of speech is found.
+    """
+
+    def __init__(self, exceptions: Dict[str, Dict[str, List[str]]],
+                 lemmas: Dict[str, FrozenSet[str]],
+                 substitutions: Dict[str, List[tuple]]):
+        self.exceptions = exceptions
+        self.lemmas = lemmas
+        self.substitutions = substitutions
+
+    def morphy(self, form: str, pos: str) -> List[str]:
+        """All base forms of form known to WordNet for pos"""
+        known = self.lemmas[pos]
+        substitutions = self.substitutions[pos]
+
+        def apply_rules(forms):
+            return [form[:-len(old)] + new
+                    for form in forms
+                    for old, new in substitutions
+                    if form.endswith(old)]
+
+        def filter_forms(forms):
+            result = []
+            for form in forms:
+                if form in known and form not in result:
+                    result.append(form)
+            return result
+
+        exceptions = self.exceptions[pos]
+        if form in exceptions:
+            return filter_forms([form] + exceptions[form])
+
+        forms = apply_rules([form])
+        results = filter_forms([form] + forms)
+        if results:
+            return results
+
+        while forms:
+            forms = apply_rules(forms)
+            results = filter_forms(forms)
+            if results:
+                return results
+        return []
+
+    def lemmatize(self, word: str, pos: str = 'n') -> str:
+        """Shortest base form, or word itself when WordNet has none"""
+        lemmas = self.morphy(word, pos)
+        return min(lemmas, key=len) if lemmas else word
+
+
+def collect() -> Dict:
+    """Gather the snapshot contents from text2emotion and the NLTK corpora"""
+    from nltk.corpus import stopwords, wordnet
+    from nltk.corpus.reader.wordnet import WordNetCorpusReader
+
+    from english_emotion_engine import load_text2emotion_tables
+
+    wordnet.ensure_loaded()
+    return {
+        "format": FORMAT_VERSION,
+        "tables": load_text2emotion_tables(),
+        "english_stopwords": frozenset(stopwords.words('english')),
+        "all_stopwords": frozenset(stopwords.words()),
+        "wordnet": {
+            "exceptions": {pos: dict(wordnet._exception_map[pos]) for pos in LEMMATIZED_POS},
+            "lemmas": {pos: frozenset(lemma for lemma, offsets in wordnet._lemma_pos_offset_map.items()
+                                      if pos in offsets)
+                       for pos in LEMMATIZED_POS},
+            "substitutions": {pos: list(WordNetCorpusReader.MORPHOLOGICAL_SUBSTITUTIONS[pos])
+                              for pos in LEMMATIZED_POS},
+        },
+    }
+
+
+def build(path: str, state: Optional[Dict] = None) -> Dict:
+    """Write the snapshot to path (atomically) and return it"""
+    if state is None:
+        state = collect()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
+    return state
+
+
+def load(path: str) -> Dict:
+    """Read a snapshot written by build()"""
+    with open(path, "rb") as f:
+        state = pickle.load(f)
+    if not isinstance(state, dict) or state.get("format") != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a format {FORMAT_VERSION} warm-state snapshot; rebuild it")
+    return state
+
+
+def create_engine(state: Dict, **kwargs):
+    """EnglishEmotionEngine built from a snapshot instead of NLTK"""
+    from english_emotion_engine import EnglishEmotionEngine
+
+    tables = state["tables"]
+    morphy = WordNetMorphy(**state["wordnet"])
+    options = dict(
+        lexicon=tables["lexicon"],
+        english_stopwords=state["english_stopwords"],
+        all_stopwords=state["all_stopwords"],
+        lemmatize=morphy.lemmatize,
+        negations=tables["negations"],
+        shortcuts=tables["shortcuts"],
+    )
+    options.update(kwargs)
+    return EnglishEmotionEngine(**options)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the Text2Emotion warm-state snapshot")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Collect NLTK/text2emotion data into a snapshot")
+    build_parser.add_argument("path", nargs="?", default="warm_state.pkl")
+    args = parser.parse_args(argv)
+
+    start_time = time.monotonic()
+    build(args.path)
+    built = time.monotonic()
+    load(args.path)
+    print(f"Wrote {args.path} ({os.path.getsize(args.path) / 1e6:.1f} MB) in "
+          f"{built - start_time:.2f}s; loads in {time.monotonic() - built:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())